@@ -0,0 +1,232 @@
+# Standard libraries
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from pathlib import Path
+
+# Local imports
+from utils import * # Imports BrowserSession, DriverPool, Checkpoint, HttpSession, MockSites, gray_order and entire data sample
+import drewberry_scraper
+import lifeinsure_scraper
+
+ENGINES = ["drewberry-browser", "drewberry-http", "lifeinsure-browser", "lifeinsure-capture"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper throughput against the local mock sites.")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES, help="scraper engines to benchmark")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4], help="concurrency settings to run each engine with")
+    parser.add_argument("--combos", type=int, default=40, help="number of combos scraped per run")
+    parser.add_argument("--latency", type=float, default=0.3, help="mock quote API latency in seconds (how long loaders show)")
+    parser.add_argument("--lean", action="store_true", help="run the browser engines with the lean-browsing profile")
+    parser.add_argument("--page-weight", nargs="*", metavar="URL", default=None,
+                        help="instead, compare bytes transferred and time-to-interactive of these pages (default: the mock pages) with and without the lean profile")
+    parser.add_argument("--output", type=Path, default=None, help="optional JSON file to write the results to")
+    args = parser.parse_args()
+
+    if args.page_weight is not None:
+        with MockSites(latency=args.latency) as sites:
+            urls = args.page_weight or [sites.drewberry_url(30, "Male", "Non-smoker"), sites.lifeinsure_url()]
+            results = measure_page_weight(urls)
+        if args.output:
+            args.output.write_text(json.dumps(results, indent=2))
+            print(f"📁 Results saved to {args.output}")
+        return
+
+    results = []
+    print(f"{'engine':<20}{'workers':>8}{'combos':>8}{'combos/min':>12}{'p50 (s)':>10}{'p95 (s)':>10}{'peak RSS (MB)':>15}")
+    with MockSites(latency=args.latency) as sites:
+        for engine, workers in product(args.engines, args.workers):
+            result = run_benchmark(sites, engine, workers, args.combos, lean=args.lean)
+            results.append(result)
+            print(f"{engine:<20}{workers:>8}{result['combos']:>8}{result['combos_per_min']:>12.1f}"
+                  f"{result['p50']:>10.2f}{result['p95']:>10.2f}{result['peak_rss_mb']:>15.0f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"📁 Results saved to {args.output}")
+
+
+def run_benchmark(sites, engine, workers, n_combos, lean=False):
+    """Scrapes n_combos from the mock sites with one engine/concurrency setting and measures it.
+
+    Args:
+        lean (bool): Browser engines only, use the lean-browsing profile.
+
+    Returns:
+        result (dict): Engine settings, combos scraped, combos/min, p50/p95 per-combo latency (s) and peak RSS (MB).
+    """
+    with tempfile.TemporaryDirectory() as tmp, TimedCheckpoint(Path(tmp) / "bench.db") as checkpoint, RssSampler() as rss:
+        start = time.perf_counter()
+        checkpoint.start = start
+        if engine.startswith("drewberry"):
+            # Spreading the combos round-robin over enough risk profiles (one mock URL each) to keep every worker busy
+            pairs = list(product(coverage_amounts, term_lengths))
+            profiles = list(product(ages, genders, nicotine_status))[:max(workers, -(-n_combos // len(pairs)))]
+            tasks = {}
+            for i in range(min(n_combos, len(pairs) * len(profiles))):
+                (coverage, term), (age, gender, nic) = pairs[i // len(profiles)], profiles[i % len(profiles)]
+                tasks.setdefault(sites.drewberry_url(age, gender, nic), []).append((coverage, term, str(age), gender, nic))
+            tasks = list(tasks.items())
+            if engine == "drewberry-http":
+                session = HttpSession(maxsize=workers)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(lambda task: drewberry_scraper.scrape_combos_http(session, task[0], task[1], checkpoint), tasks))
+            else:
+                with DriverPool(workers=workers, max_per_site=workers, lean=lean) as pool:
+                    pool.map(
+                        lambda driver, task: drewberry_scraper.scrape_combos(driver, task[0], task[1], checkpoint),
+                        tasks,
+                        url_of=lambda task: task[0],
+                    )
+        else:
+            # Splitting the Gray-ordered combos into one contiguous chunk per worker (each keeps its own page session)
+            terms = [f"{term} Year Term" for term in term_lengths]
+            grid = (coverage_amounts, terms, ages, genders, ["Current user", "Never Used"])
+            combos = gray_order(product(*grid), *grid)[:n_combos]
+            size = -(-len(combos) // workers)
+            chunks = [combos[i:i + size] for i in range(0, len(combos), size)]
+            capture = engine == "lifeinsure-capture" # Quotes read from the network log instead of the rendered rows
+            with DriverPool(workers=workers, max_per_site=workers, lean=lean, network_log=capture) as pool:
+                pool.map(
+                    lambda driver, chunk: lifeinsure_scraper.scrape_combos(driver, sites.lifeinsure_url(), chunk, checkpoint, capture=capture),
+                    chunks,
+                    url_of=lambda chunk: sites.lifeinsure_url(),
+                )
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(checkpoint.latencies) or [float("nan")]
+    return {
+        "engine": engine,
+        "workers": workers,
+        "combos": len(checkpoint.latencies),
+        "combos_per_min": len(checkpoint.latencies) / elapsed * 60,
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "peak_rss_mb": rss.peak / 2**20,
+    }
+
+
+def measure_page_weight(urls, repeats=3):
+    """Loads each page cold (cache cleared) with and without the lean-browsing profile, averaging its page_metrics.
+
+    Returns:
+        results (list): One dict per (url, profile) with mean KB transferred, requests, and interactive/load times (ms).
+    """
+    results = []
+    print(f"{'profile':<10}{'KB':>10}{'requests':>10}{'interactive (ms)':>18}{'load (ms)':>12}  url")
+    for lean in (False, True):
+        with BrowserSession(lean=lean) as browser:
+            driver = browser.driver
+            for url in urls:
+                samples = []
+                for _ in range(repeats):
+                    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                    driver.get(url)
+                    wait_for_idle(driver)
+                    samples.append(page_metrics(driver))
+                mean = lambda key: statistics.mean(sample[key] or 0 for sample in samples)
+                result = {
+                    "url": url,
+                    "profile": "lean" if lean else "default",
+                    "kb": mean("bytes") / 1024,
+                    "requests": mean("requests"),
+                    "interactive_ms": mean("interactive_ms"),
+                    "loaded_ms": mean("loaded_ms"),
+                }
+                results.append(result)
+                print(f"{result['profile']:<10}{result['kb']:>10.1f}{result['requests']:>10.1f}"
+                      f"{result['interactive_ms']:>18.0f}{result['loaded_ms']:>12.0f}  {url}")
+    return results
+
+
+class TimedCheckpoint(Checkpoint):
+    """Checkpoint which also times each combo, as the gap between consecutive records made by the same worker thread.
+
+    A worker's first combo is timed from the start of the run, so it includes browser launch and page setup.
+    """
+
+    def __init__(self, path):
+        super().__init__(path, fresh=True)
+        self.start = time.perf_counter()
+        self.latencies = []
+        self._last = threading.local()
+
+    def record(self, combo, quotes):
+        super().record(combo, quotes)
+        now = time.perf_counter()
+        self.latencies.append(now - getattr(self._last, "time", self.start))
+        self._last.time = now
+
+
+class RssSampler:
+    """Background sampler of the peak resident memory of this process plus its children (Chrome and chromedriver)."""
+
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss(os.getpid()))
+            self._stop.wait(self.interval)
+
+
+def process_tree_rss(pid):
+    """Returns the summed resident memory (bytes) of a process and all of its descendants.
+
+    Reads /proc on Linux; elsewhere falls back to this process's own peak RSS.
+    """
+    proc = Path("/proc")
+    if not proc.exists():
+        try:
+            import resource # Unix only
+        except ImportError:
+            return 0 # Windows: not measured
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024 # Bytes on macOS, KiB elsewhere
+
+    # Mapping each process to its parent, then summing RSS over pid's subtree
+    parents = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+            parents[int(stat.parent.name)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue # Process exited while scanning
+    tree, frontier = {pid}, [pid]
+    while frontier:
+        parent = frontier.pop()
+        children = [child for child, ppid in parents.items() if ppid == parent and child not in tree]
+        tree.update(children)
+        frontier.extend(children)
+
+    total = 0
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for member in tree:
+        try:
+            total += int((proc / str(member) / "statm").read_text().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 # Standard libraries
-import csv
-import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import product
 from pathlib import Path
+from urllib.parse import urljoin
 
 # Third-party libraries
 from selenium.webdriver.common.by import By
@@ -12,189 +14,332 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Local imports
-from utils import * # Imports init_driver, edit_page_context, select_dropdown, select_checkbox, text_input, ensure_page_ready and entire data sample
+from utils import * # Imports edit_page_context, select_dropdown, select_checkbox, text_input, ensure_page_ready, DriverPool, Checkpoint, HttpSession, RetryScheduler, AdaptiveSampler, WorkQueue, UrlCache, refresh_quotes, tracing helpers and entire data sample
 
-def main():
+# Browserless engine (EXPERIMENTAL, UNVERIFIED): quote API assumed to be behind the "Edit Quotes" form of each
+# /my/get-quote/<hash> page. Only the two request fields are the form's real input names, the endpoint and the response
+# fields below are guesses which have never been checked against the live site (nor extract_quotes against its output).
+# Record a real session with --record to check them, and use the browser engine for any data that matters.
+QUOTE_API = "/my/api/get-quote/{quote_id}"   # Receives the cover/term update and returns the refreshed quotes
+QUOTES_FIELD = "quotes"                      # List of quotes in the response payload
+PRICE_FIELD = "monthlyPremium"               # Monthly premium (in pounds) of each quote
+PROVIDER_FIELD = "providerName"              # Insurer of each quote
+PRODUCT_FIELD = "productName"                # Product name of each quote
+COVER_TYPE_FIELD = "coverType"               # Product type of each quote ...
+LIFE_ONLY_COVER_TYPE = "life-only"           # ... matching the page's "Life Insurance Only" filter
+
+# Collects every visible quote card (price, provider logo and product name) and parses the price to pence in the page itself
+QUOTE_CARDS_SCRIPT = """
+const toMinor = (text) => {
+    const [whole, fraction = ""] = text.replace(/[^0-9.]/g, "").split(".");
+    return whole || fraction ? parseInt(whole || "0", 10) * 100 + parseInt((fraction + "00").slice(0, 2), 10) : null;
+};
+return Array.from(document.querySelectorAll("span[class*='QuoteCardContent_Price']"))
+    .filter((price) => price.getClientRects().length > 0) // Visible cards only, as WebElement.text would read them
+    .map((price) => {
+        const card = price.closest("[class*='QuoteCard_']") || price.parentElement;
+        const logo = card.querySelector("img[alt]");
+        const product = card.querySelector("[class*='QuoteCardContent_Product'], [class*='QuoteCardContent_Title']");
+        return {
+            provider: logo ? logo.alt.trim() : null,
+            product: product ? product.innerText.trim() : null,
+            premium_minor: toMinor(price.innerText),
+        };
+    })
+    .filter((quote) => quote.premium_minor !== null);
+"""
+
+def main(workers=1, max_per_site=MAX_PER_SITE, fresh=False, engine="browser", base_url=None, retry_failed=False, lean=False,
+         adaptive=False, target_error=TARGET_ERROR, batch_size=BATCH_SIZE, trace=True, worker=None,
+         url_max_age=URL_MAX_AGE_DAYS, check_urls=True, refresh=False, record_dir=None):
+    """Collects the risk-profile URLs (if needed), then scrapes every coverage/term combo for each of them.
+
+    Args:
+        workers (int): Number of headless Chrome instances (or HTTP threads) scraping URLs in parallel.
+        max_per_site (int): Maximum number of those instances allowed on the Drewberry site at once.
+        fresh (bool): If True, discards the checkpoint from a previous run instead of resuming it.
+        engine (str): "browser" to drive Chrome, or "http" to call the quote API directly (URLs must already be collected).
+            The http engine is experimental: its endpoint and response schema are unverified (see QUOTE_API), so it
+            scrapes into a checkpoint and CSV of its own ('UK_quotes_http.*'), which browser runs never read.
+        base_url (str): HTTP engine only, sends requests to this host instead (e.g. a local ReplayServer).
+        record_dir (str | Path): HTTP engine only, saves every response there as a fixture a ReplayServer can serve.
+        retry_failed (bool): If True, combos marked as permanently failing by a previous run are scraped again.
+        lean (bool): If True, browsers use the lean-browsing profile (no images, fonts or trackers, eager page loads).
+        adaptive (bool): If True, only scrapes the combos an AdaptiveSampler picks (a seed grid, then the most uncertain
+            combos), stopping once the surrogate predicts its freshly scraped batches within target_error.
+        target_error (float): Adaptive stopping threshold: RMSE of ln(premium) between each new batch's predictions
+            and its scraped premiums, which two batches in a row (utils.adaptive.CONFIRM_ROUNDS) must come within.
+        batch_size (int): Combos scraped per adaptive round.
+        trace (bool): If True, appends a span per combo (phase timings and outcome) to 'UK_quotes.trace.jsonl'.
+        worker (str): If set, runs as this worker of the checkpoint's shared work queue (see utils.work_queue): claims
+            one URL's combos at a time until the queue is drained, and leaves exporting to a normal run.
+        url_max_age (float): Days after which a cached risk-profile URL is recollected.
+        check_urls (bool): If True, cached URLs get a quick liveness check, and dead ones are recollected.
+        refresh (bool): If True, updates the stored quotes by re-scraping sentinel combos and then only the regions
+            of the grid where their prices changed, recording the changes as a new snapshot version (see utils.recrawl).
+    """
     # Initial quote form which asks for risk information: age, gender, and nicotine status (quotes are on page after) 
     quote_form = "https://www.drewberryinsurance.co.uk/life-insurance/life-insurance-quote"
     
-    driver = init_driver() # Initialising driver
-    
     # Path of CSV w/URLs and their data
     u_file_name = "drewberry_urls.csv"
     urls_csv = Path(__file__).resolve().parent.parent.parent / "data" / "raw" / u_file_name
-    expected_rows = len(ages) * len(genders) * len(nicotine_status) + 1  # +1 for header
+    url_cache = UrlCache(urls_csv, max_age_days=url_max_age)
+    risk_profiles = list(product(ages, genders, nicotine_status))
     
-    # Check if file exists or if number of rows matches number of expected combinations
-    if not urls_csv.exists() or sum(1 for _ in open(urls_csv, "r")) != expected_rows:
-        print("▶️  Collecting URLs...")
-        with driver:
-            url_results = extract_risk_info(driver, quote_form, ages, genders, nicotine_status)
-        driver = init_driver() # Initialising driver again (because it closed)
-        
-        # Saving to CSV
-        with open(urls_csv, "w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(["Age", "Gender", "Nicotine Use", "URL"])  # CSV header
-            writer.writerows(url_results)    
-        print(f"📁 URLs saved to '{u_file_name}', in {urls_csv}")
-    else:
-        print("↪️  URL collection already complete - skipping collection.")
+    # Browsers are launched on first use and kept warm across URL collection, scraping and retries
+    with DriverPool(workers=workers, max_per_site=max_per_site, lean=lean) as pool:
+        # Only profiles whose URL is missing, expired or dead are collected (e.g. just a newly added age's)
+        stale = url_cache.stale(risk_profiles, check=check_urls, base_url=base_url)
+        if stale:
+            print(f"▶️  Collecting {len(stale)} of {len(risk_profiles)} URLs...")
+            url_cache.update(extract_risk_info(pool, quote_form, stale))
+            # Keeping the warm browsers for scraping, only clearing the form's cookies and storage
+            for session in pool.sessions:
+                session.reset()
+            print(f"📁 URLs saved to '{u_file_name}', in {urls_csv}")
+        else:
+            print("↪️  Every URL is cached and alive - skipping collection.")
     
     
-    # Opening CSV with our URLs and their associated risk info.
-    with open(urls_csv, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
+        # Cached URLs and their associated risk info.
+        rows = url_cache.rows(risk_profiles)
     
-        results = []
-        failed = []
-        with driver:
-            for row in reader:
-                # Calling the scrape_combos function to get the current iteration's results and failed combos
-                current_results, current_failed = scrape_combos(driver, row["URL"], coverage_amounts, term_lengths, row["Age"], row["Gender"], row["Nicotine Use"])
-                
-                # Appending the current iteration's results and failed combos to the existing lists
-                results.extend(current_results)
-                failed.extend(current_failed)
+        # Until its schema is verified, the http engine's quotes (and failures) are kept apart from the browser's
+        file_name = "UK_quotes_http.csv" if engine == "http" else "UK_quotes.csv"
+        # Explicitly stating file path (../data/raw/{file_name} is done relative to console's current directory)
+        output_path = Path(__file__).resolve().parent.parent.parent / "data" / "raw" / file_name
+    
+        # Per-combo spans, summarised with `python src/01_scrape/utils/tracing.py data/raw/UK_quotes.trace.jsonl`
+        configure_tracing(output_path.with_suffix(".trace.jsonl") if trace else None, site="drewberry")
+    
+        # Every completed combo is committed to the checkpoint straight away, so an interrupted run resumes where it stopped
+        with Checkpoint(output_path.with_suffix(".checkpoint.db"), fresh=fresh, currency="GBP") as checkpoint:
+            if retry_failed:
+                checkpoint.clear_failures()
+            # Risk profile (age, gender, nic) → its URL and row values, so combos take the CSV's exact field values
+            profiles = {combo_key(("", "", row["Age"], row["Gender"], row["Nicotine Use"]))[2:]: row for row in rows}
         
-            # Retry a maximum of 5 times until success
-            for i in range(1, 6):
-                if not failed:
-                    break
-                print(f"🔁 Retrying failed combos... ({i})")
-                new_failed = []
-                for combo in failed:
-                    # Run the scraping function with specific inputs
-                    retry_results, retry_failed = scrape_combos(driver, combo[5], [combo[0]], [combo[1]], combo[2], combo[3], combo[4])
-                    results.extend(retry_results)
-                    new_failed.extend(retry_failed)
-                failed = new_failed # Retry remaining ones next round
-
-    file_name = "UK_quotes.csv"
-    # Explicitly stating file path (../data/raw/{file_name} is done relative to console's current directory)
-    output_path = Path(__file__).resolve().parent.parent.parent / "data" / "raw" / file_name
-    # Saving to csv, encoding="utf-8" needed for reading and writing "£"
-    with open(output_path, mode="w", newline="", encoding="utf-8") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Coverage Amount", "Term Length", "Age", "Gender", "Is_Smoker", "Premium"])
-        writer.writerows(results)
+            def group_by_url(combos):
+                # Pairs each URL with its combos (in coverage/term order), skipping profiles whose URL wasn't collected
+                tasks = {}
+                for combo in combos:
+                    row = profiles.get(combo_key(combo)[2:])
+                    if row is not None:
+                        tasks.setdefault(row["URL"], []).append((combo[0], combo[1], row["Age"], row["Gender"], row["Nicotine Use"]))
+                return list(tasks.items())
+        
+            if engine == "http":
+                # Browserless engine: one pooled HTTP session shared by a thread per worker
+                print("⚠️  The http engine is experimental: its quote API endpoint and schema haven't been verified against the site, "
+                      "so its quotes go to UK_quotes_http.csv, apart from the browser's")
+                session = HttpSession(base_url=base_url, maxsize=workers, record_dir=record_dir)
+                pool.close() # Browser from the URL collection isn't needed any more
+        
+            def scrape_tasks(tasks, store=checkpoint):
+                # Returns each (url, combos) task's list of (combo, kind, message) failures, or the exception it raised
+                if engine == "http":
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(scrape_combos_http, session, url, combos, store) for url, combos in tasks]
+                        return [future.exception() or future.result() for future in futures]
+                # Each worker takes the next URL from the shared queue and scrapes all of its remaining combos (browsers stay warm between rounds)
+                return pool.map(
+                    lambda driver, task: scrape_combos(driver, task[0], task[1], store),
+                    tasks,
+                    url_of=lambda task: task[0],
+                )
+        
+            def scrape_with_retries(tasks, store=checkpoint):
+                # Failed combos are grouped by URL, so each retry round loads every affected quote page only once
+                scheduler = RetryScheduler(max_rounds=5, checkpoint=store) # Retry a maximum of 5 rounds
+                schedule_failures(scheduler, tasks, scrape_tasks(tasks, store), store)
+                for _, groups in scheduler.rounds():
+                    retry_tasks = list(groups.items())
+                    schedule_failures(scheduler, retry_tasks, scrape_tasks(retry_tasks, store), store)
+                if scheduler.permanent:
+                    print(f"⛔ {len(scheduler.permanent)} combos marked as permanently failing: {dict(scheduler.summary())}")
+        
+            # Data sample grid, limited to the risk profiles with a collected URL
+            grid = [combo for combo in product(coverage_amounts, term_lengths, ages, genders, nicotine_status) if combo_key(combo)[2:] in profiles]
+            if worker:
+                # Any number of workers (processes, or machines sharing the checkpoint) claim one URL's combos at a time
+                with WorkQueue(checkpoint.path) as work_queue:
+                    added = work_queue.seed(group_by_url(grid), checkpoint)
+                    print(f"👷 Worker {worker}: {added} combos added to the queue, {work_queue.unfinished()} left to scrape")
+                    for url, combos in work_queue.batches(worker, size=len(coverage_amounts) * len(term_lengths)):
+                        # Combos stored since they were queued (e.g. by a normal run) are just marked as done
+                        todo = checkpoint.remaining(combos)
+                        failed_combos = task_failures(todo, scrape_tasks([(url, todo)])[0], checkpoint) if todo else []
+                        work_queue.settle(worker, combos, failed_combos, checkpoint)
+                print(f"👷 Worker {worker}: queue drained, run the scraper without --worker to export the quotes")
+            elif refresh:
+                # Fresh quotes go to a scratch checkpoint first, and only changed combos replace the stored ones
+                refresh_quotes(checkpoint, (coverage_amounts, term_lengths, ages, genders, nicotine_status),
+                               lambda combos, store: scrape_with_retries(group_by_url(combos), store),
+                               output_path.with_suffix(".refresh.db"))
+            elif adaptive:
+                # Each round's combos are picked from everything scraped so far (including by earlier, resumed runs)
+                sampler = AdaptiveSampler((coverage_amounts, term_lengths, ages, genders, nicotine_status), batch_size=batch_size, target_error=target_error)
+                while batch := sampler.next_batch(checkpoint.combo_premiums(), checkpoint.remaining(grid)):
+                    scrape_with_retries(group_by_url(batch))
+            else:
+                # Pairing each URL with the combos (from the data sample grid) not already in the checkpoint
+                tasks = group_by_url(checkpoint.remaining(grid))
+                print(f"↪️  {sum(len(combos) for _, combos in tasks)} combos left to scrape across {len(tasks)} URLs.")
+                scrape_with_retries(tasks)
+            
+            if worker:
+                # Other workers may still be writing to the checkpoint, so exporting is left to a normal run
+                configure_tracing(None)
+                return
+
+            # Saving to csv, encoding="utf-8" needed for reading and writing "£"
+            checkpoint.export_csv(output_path, encoding="utf-8")
+            # Typed copy (integer fields, premiums in pence) for zero-parse loads downstream
+            if engine != "http":
+                checkpoint.export_parquet(output_path.parent / "quotes", site="drewberry")
+        configure_tracing(None)
     print(f"📁 All done — exported to '{file_name}', in {output_path}")
 
 
-def extract_risk_info(driver, quote_form, ages, genders, nicotine_status):
-    """Inputs risk info into form and extracts the associated URL for each risk combo.
+def schedule_failures(scheduler, tasks, outcomes, checkpoint):
+    """Hands every failed combo of a scraping pass to the retry scheduler, grouped by URL.
 
     Args:
+        scheduler (RetryScheduler): Scheduler collecting the combos to retry.
+        tasks (list): (url, combos) tasks which were scraped.
+        outcomes (list): Each task's list of (combo, kind, message) failures, or the exception which stopped it.
+        checkpoint (Checkpoint): Used to find which combos of a crashed task are still unfinished.
+    """
+    for (url, combos), outcome in zip(tasks, outcomes):
+        for combo, kind, message in task_failures(combos, outcome, checkpoint):
+            scheduler.fail(combo, url, kind, message)
+
+
+def task_failures(combos, outcome, checkpoint):
+    """Returns a scraped (url, combos) task's (combo, kind, message) failures, given its outcome from scrape_tasks."""
+    if isinstance(outcome, Exception):
+        # Whole URL failed (e.g. its page didn't load or the worker's browser crashed), so all of its unfinished combos are retried
+        kind = classify_failure(outcome)
+        return [(combo, kind, str(outcome)) for combo in checkpoint.remaining(combos)]
+    return outcome
+
+
+def extract_risk_info(pool, quote_form, profiles):
+    """Inputs risk info into form and extracts the associated URL for each risk profile, spread across the pool's browsers.
+
+    Args:
+        pool (DriverPool): Browsers to collect the URLs with.
         quote_form (str): URL of quote form.
-        var_name (list): takes in lists for (age, gender, and nicotine_status), for which to form combos.
+        profiles (list): (age, gender, nicotine_status) risk profiles to collect URLs for.
 
     Returns:
-        url_results: list of tuples containing URLs and their associated risk info.
+        url_results: list of tuples containing URLs and their associated risk info (failed profiles are left out).
     """
+    outcomes = pool.map(lambda driver, profile: collect_url(driver, quote_form, *profile), profiles, url_of=lambda _: quote_form)
     url_results = []
+    for (age, gender, nic), outcome in zip(profiles, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"❌ Error Collecting Url for: Age {age}, {gender}, {nic}: {outcome}")
+        else:
+            url_results.append((age, gender, nic, outcome))
+            print(f"✅ Collected Url for: Age {age}, {gender}, {nic}")
+    return url_results
 
 
-        
-    for age in ages:
-        for gender in genders:
-            for nic in nicotine_status:
-                try:
-                    # Calculating birth year corresponding to given age (using 1st of Jan as baseline)
-                    birth_year = str(datetime.now().year - age)
-                    
-                    # Go to the form page for every new combo
-                    driver.get(quote_form)
-                    
-                    # Clicking 'Deny' button for cookies
-                    try:
-                        driver.find_element(By.XPATH, "//span[text()='Deny']").click()
-                    except:
-                        pass  # If cookie popup doesn't appear (likely won't after first time)
-                    
-                    # We select Level cover (for simplicity and to enable fair comparison w/ US data)
-                    select_checkbox(driver, xpath=f"//input[@type='radio' and @value='Level']")
-                    # Selecting smoker/non-smoker
-                    select_checkbox(driver, xpath=f"//input[@type='radio' and @value='{nic}']")
-                    
-                    # Occupation field is both a text and dropdown field
-                    input_field = driver.find_element(By.ID, "react-select-Occupation__c-input")
-                    # Click the dropdown to activate it
-                    input_field.click()
-                    # Selection no occupation, again for fair comparison with US, where this isn't present
-                    input_field.send_keys("Other - Occupation not listed")
-                    # Finally press "enter" to submit into field
-                    input_field.send_keys(Keys.ENTER)
-
-                    # 1st pf Jan as base, then we vary year
-                    text_input(driver, field_name="dateDD", value="01")
-                    text_input(driver, field_name="dateMM", value="01")
-                    text_input(driver, field_name="dateYYYY", value=birth_year)
-                    
-                    # Inputting placeholder data
-                    text_input(driver, field_name="FirstName", value="John")
-                    text_input(driver, field_name="LastName", value="Doe")
-                    driver.find_element(By.CSS_SELECTOR, '[data-test="TS_INPUT_FORM_PHONE"]').send_keys("07386411071") # Temporary UK phone number
-                    text_input(driver, field_name="email", value="placeholder@nowhere.org")
-                    
-                    # Selecting gender
-                    select_checkbox(driver, xpath=f"//input[@type='radio' and @value='{gender}']")
-                    
-                    # Clicking T&C checkbox
-                    driver.find_element(By.NAME, "check-privacy").click()
-                    
-                    # Submitting, then waiting for next page to load
-                    driver.find_element(By.XPATH, "//input[@type='submit']").click()
-                    WebDriverWait(driver, 15).until(
-                    EC.invisibility_of_element_located((By.XPATH, "//input[@value='Please Wait...']"))
-                    )
-                    # ensure_page_ready(driver, xpath="//input[@value='Please Wait...']")
-                    time.sleep(0.5)
-                    
-                    # Extracting our url and then storing our data
-                    current_url = driver.current_url
-                    url_results.append((age, gender, nic, current_url))
-                    print(f"✅ Collected Url for: Age {age}, {gender}, {nic}")
+def collect_url(driver, quote_form, age, gender, nic):
+    """Fills out the quote form for one risk profile and returns the quote page URL it redirects to."""
+    # Calculating birth year corresponding to given age (using 1st of Jan as baseline)
+    birth_year = str(datetime.now().year - age)
+    
+    # Go to the form page for every new combo
+    driver.get(quote_form)
+    
+    # Clicking 'Deny' button for cookies
+    try:
+        driver.find_element(By.XPATH, "//span[text()='Deny']").click()
+    except:
+        pass  # If cookie popup doesn't appear (likely won't after first time)
+    
+    # We select Level cover (for simplicity and to enable fair comparison w/ US data)
+    select_checkbox(driver, xpath=f"//input[@type='radio' and @value='Level']")
+    # Selecting smoker/non-smoker
+    select_checkbox(driver, xpath=f"//input[@type='radio' and @value='{nic}']")
+    
+    # Occupation field is both a text and dropdown field
+    input_field = driver.find_element(By.ID, "react-select-Occupation__c-input")
+    # Click the dropdown to activate it
+    input_field.click()
+    # Selection no occupation, again for fair comparison with US, where this isn't present
+    input_field.send_keys("Other - Occupation not listed")
+    # Finally press "enter" to submit into field
+    input_field.send_keys(Keys.ENTER)
 
-                except Exception as e:
-                    print(f"❌ Error Collecting Url for: Age {age}, {gender}, {nic}: {e}")
-    return url_results
+    # 1st pf Jan as base, then we vary year
+    text_input(driver, field_name="dateDD", value="01")
+    text_input(driver, field_name="dateMM", value="01")
+    text_input(driver, field_name="dateYYYY", value=birth_year)
+    
+    # Inputting placeholder data
+    text_input(driver, field_name="FirstName", value="John")
+    text_input(driver, field_name="LastName", value="Doe")
+    driver.find_element(By.CSS_SELECTOR, '[data-test="TS_INPUT_FORM_PHONE"]').send_keys("07386411071") # Temporary UK phone number
+    text_input(driver, field_name="email", value="placeholder@nowhere.org")
+    
+    # Selecting gender
+    select_checkbox(driver, xpath=f"//input[@type='radio' and @value='{gender}']")
+    
+    # Clicking T&C checkbox
+    driver.find_element(By.NAME, "check-privacy").click()
+    
+    # Submitting, then waiting for next page to load
+    driver.find_element(By.XPATH, "//input[@type='submit']").click()
+    WebDriverWait(driver, 15).until(
+    EC.invisibility_of_element_located((By.XPATH, "//input[@value='Please Wait...']"))
+    )
+    # Waiting for the redirect to the quote page rather than a fixed sleep
+    wait_until(driver, EC.url_contains("/my/get-quote/"), timeout=15)
+    
+    # Extracting our url
+    return driver.current_url
                 
 
-def scrape_combos(driver, current_url, coverage_amounts, term_lengths, age, gender, nic):
+def scrape_combos(driver, current_url, combos, checkpoint):
     """Iterates through combinations of inputs and collects premiums.
 
     Args:
         current_url (str): current url of combo.
-        coverage_amounts, term_lengths (list): lists of variables to input.
-        age, gender, nic (str): risk info. associated with current URL.
+        combos (list): (coverage, term, age, gender, nic) tuples to scrape, all sharing the risk info. of current_url.
+        checkpoint (Checkpoint): store which each combo's premiums are committed to as soon as they are scraped.
     Returns:
-        all_data (list): List of tuples containing input parameters and corresponding premiums.
-        failed_combos (list):  list of tuples containing input parameters abd url for which scraping failed.
+        failed_combos (list): (combo, kind, message) of each combo for which scraping failed (kind from classify_failure).
     """
-    all_data = []
     failed_combos = []
     
-    # Inputting our already collected URL
-    driver.get(current_url)
-    ensure_page_ready(driver, xpath="[data-test='TS_FULL_LOADER_MODAL']")
-    # Close initial "refresh quotes" pop up
-    try:
-        driver.find_element("xpath", '//button[@aria-label="Refresh Quotes"]').click()
-    except NoSuchElementException:
-        pass
-    ensure_page_ready(driver, xpath="[data-test='TS_FULL_LOADER_MODAL']")
-    # Close intial page sign in prompt (only appears when first opening URL)
-    try:
-        driver.find_element(By.CSS_SELECTOR, '[data-test="TS_CLOSE_MODAL"]').click()
-    except:
-        pass
-    ensure_page_ready(driver, xpath="[data-test='TS_BACKDROP']") 
+    # Inputting our already collected URL (traced as a "page" span, apart from the combos)
+    with trace_span("page", url=current_url):
+        load_page(driver, current_url)
+        ensure_page_ready(driver, xpath="[data-test='TS_FULL_LOADER_MODAL']")
+        # Close initial "refresh quotes" pop up
+        try:
+            driver.find_element("xpath", '//button[@aria-label="Refresh Quotes"]').click()
+        except NoSuchElementException:
+            pass
+        ensure_page_ready(driver, xpath="[data-test='TS_FULL_LOADER_MODAL']")
+        # Close intial page sign in prompt (only appears when first opening URL)
+        try:
+            driver.find_element(By.CSS_SELECTOR, '[data-test="TS_CLOSE_MODAL"]').click()
+        except:
+            pass
+        ensure_page_ready(driver, xpath="[data-test='TS_BACKDROP']") 
     
     
     
     
-    for coverage in coverage_amounts:
-        for term in term_lengths:
+    for i, combo in enumerate(combos):
+        coverage, term, age, gender, nic = combo
+        # Each combo is one span, its phases (edit, ready, extract, checkpoint) timed by the helpers it calls
+        with trace_span("combo", combo=list(combo_key(combo))) as span:
             try:
                 # Opening the edit page and inputting cover and term duration
                 with edit_page_context(driver, edit_node="span", edit_text="Edit Quotes", btn_node="input"):
@@ -207,28 +352,36 @@ def scrape_combos(driver, current_url, coverage_amounts, term_lengths, age, gend
                 # Extracting each premium corresponding to this risk profile
                 premiums = extract_premiums(driver)
                 
-                # Appending data to our list (if premiums is empty nothing is appended)
-                for premium in premiums:
-                    all_data.append((coverage, term, age, gender, nic, premium))
+                # Committing the combo (if premiums is empty it is still marked as done, with no rows)
+                with phase("checkpoint"):
+                    checkpoint.record(combo, premiums)
                 
                 if premiums:
+                    span["outcome"] = "ok"
                     print(f"✅ Done: {coverage}, {term}: Age {age}, {gender}, {nic}") # Printing current combo completed        
                 else:
+                    span["outcome"] = "empty"
                     print(f"⏭️  Skipping: No quotes found for {coverage}, {term}, Year Term: Age {age}, {gender}, {nic}")
                     
             except Exception as e:
-                print(f"❌ Error on combo: {coverage}, {term}: Age {age}, {gender}, {nic}: {e}")
-                failed_combos.append((coverage, term, age, gender, nic, current_url)) # Recording failed combos
-                continue
-    return all_data, failed_combos
+                kind = classify_failure(e, driver)
+                span["outcome"] = kind
+                print(f"❌ Error on combo ({kind}): {coverage}, {term}: Age {age}, {gender}, {nic}: {e}")
+                failed_combos.append((combo, kind, str(e))) # Recording failed combos
+                if kind == "block":
+                    # Site is refusing us, so stop hammering it and leave this URL's other combos for a backed-off retry
+                    failed_combos.extend((rest, SKIPPED, "Skipped after block") for rest in combos[i + 1:])
+                    break
+    return failed_combos
     
     
+@traced("extract")
 def extract_premiums(driver):
     """
     Extracts available premiums from the 'Life Insurance Only' section.
 
     Returns:
-        List of multiple premium strings (e.g., ['$14.32']) for each combo.
+        List of quote dicts (see extract_quotes), with each premium already parsed to pence.
     """
     ensure_page_ready(driver, xpath="[data-test='TS_FULL_LOADER_MODAL']")
 
@@ -236,28 +389,129 @@ def extract_premiums(driver):
 
 
 
-    premiums = []
-    
-    # Click the "Life Insurance Only" filter button
+    # Click the "Life Insurance Only" filter button, then wait for the filtered quotes to re-render
     driver.find_element(By.ID, "life-only").click()
+    wait_for_idle(driver)
     
     # Try to expand more results by clicking "Show More" button
     try:
         show_more_button = driver.find_element(By.XPATH, ".//span[contains(text(), 'Show More')]")
         show_more_button.click()
+        wait_for_idle(driver)
     except:
         pass  # Ignore if "Show More" button not present
     
-    # find all quote entries and puts it in a list
-    quote_entries = driver.find_elements(By.XPATH, "//span[contains(@class, 'QuoteCardContent_Price')]")
+    # Reading every quote in a single round trip (the checkpoint formats premiums as displayed on the page)
+    return extract_quotes(driver)
+
+
+def extract_quotes(driver):
+    """Reads every visible quote card on the page in one execute_script call.
+
+    Returns:
+        quotes (list): Dicts with the card's 'provider', 'product' and 'premium_minor' (monthly premium in pence).
+    """
+    return driver.execute_script(QUOTE_CARDS_SCRIPT)
     
-    if not quote_entries:
-        pass # If no quote entries, pass and let empty string be passed 
-    else:
-        for entry in quote_entries:
-            premiums.append(entry.text) # Append only the text (the premiums)
-    return premiums
+
+def scrape_combos_http(session, current_url, combos, checkpoint):
+    """Browserless version of scrape_combos, sending each cover/term update straight to the quote API.
+
+    Args:
+        session (HttpSession): Pooled HTTP session (may be shared between threads).
+        current_url (str): current url of combo (/my/get-quote/<hash>).
+        combos (list): (coverage, term, age, gender, nic) tuples to scrape, all sharing the risk info. of current_url.
+        checkpoint (Checkpoint): store which each combo's premiums are committed to as soon as they are scraped.
+    Returns:
+        failed_combos (list): (combo, kind, message) of each combo for which scraping failed (kind from classify_failure).
+    """
+    failed_combos = []
+    
+    # Loading the quote page once so the session picks up its cookies (in a jar of this quote's own)
+    page = session.request("GET", current_url, jar=current_url)
+    if not 200 <= page.status < 300:
+        # Quote page gone or refused, so none of its combos can be scraped (the whole URL is retried or given up)
+        raise HttpStatusError("GET", current_url, page.status)
+    quote_id = current_url.rstrip("/").rsplit("/", 1)[-1]
+    api_url = urljoin(current_url, QUOTE_API.format(quote_id=quote_id))
     
+    for i, combo in enumerate(combos):
+        coverage, term, age, gender, nic = combo
+        try:
+            # Same fields as the "Edit Quotes" form
+            payload = session.request_json("POST", api_url, {"initialLifeCover": int(coverage), "TermYears": int(term)}, jar=current_url)
+            premiums = extract_quotes_http(payload)
+            
+            # Committing the combo (if premiums is empty it is still marked as done, with no rows)
+            checkpoint.record(combo, premiums)
+            
+            if premiums:
+                print(f"✅ Done: {coverage}, {term}: Age {age}, {gender}, {nic}") # Printing current combo completed        
+            else:
+                print(f"⏭️  Skipping: No quotes found for {coverage}, {term}, Year Term: Age {age}, {gender}, {nic}")
+                
+        except Exception as e:
+            kind = classify_failure(e)
+            print(f"❌ Error on combo ({kind}): {coverage}, {term}: Age {age}, {gender}, {nic}: {e}")
+            failed_combos.append((combo, kind, str(e))) # Recording failed combos
+            if kind == "block":
+                # Site is refusing us, so stop hammering it and leave this URL's other combos for a backed-off retry
+                failed_combos.extend((rest, SKIPPED, "Skipped after block") for rest in combos[i + 1:])
+                break
+    return failed_combos
+
+
+def extract_quotes_http(payload):
+    """Reads the 'Life Insurance Only' quotes of a quote API payload into the same dicts as extract_quotes.
+
+    Unverified: the payload schema (QUOTES_FIELD etc.) is assumed, and the output has never been compared with
+    extract_quotes on the same quote page.
+    """
+    if QUOTES_FIELD not in payload:
+        raise NoResultsError(f"Quote API response has no '{QUOTES_FIELD}' field")
+    return [
+        {
+            "provider": quote.get(PROVIDER_FIELD),
+            "product": quote.get(PRODUCT_FIELD),
+            "premium_minor": round(float(quote[PRICE_FIELD]) * 100),
+        }
+        for quote in payload.get(QUOTES_FIELD) or []
+        if quote.get(COVER_TYPE_FIELD) == LIFE_ONLY_COVER_TYPE and quote.get(PRICE_FIELD) is not None
+    ]
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape Drewberry life insurance quotes.")
+    parser.add_argument("--workers", type=int, default=1, help="number of headless Chrome instances to run in parallel")
+    parser.add_argument("--max-per-site", type=int, default=MAX_PER_SITE, help="maximum concurrent instances on the Drewberry site")
+    parser.add_argument("--min-settle", type=float, default=None, help="minimum settle time (s) after each wait condition is met")
+    parser.add_argument("--fresh", action="store_true", help="discard the checkpoint of a previous run instead of resuming it")
+    parser.add_argument("--retry-failed", action="store_true", help="retry combos a previous run marked as permanently failing")
+    parser.add_argument("--lean", action="store_true", help="block images, fonts and third-party trackers, and load pages eagerly")
+    parser.add_argument("--engine", choices=["browser", "http"], default="browser", help="drive Chrome, or call the quote API over plain HTTP (experimental, unverified)")
+    parser.add_argument("--base-url", default=None, help="http engine only: send requests to this host instead (e.g. a replay server)")
+    parser.add_argument("--record", type=Path, default=None, metavar="DIR", help="http engine only: save every response to DIR, for a replay server")
+    parser.add_argument("--adaptive", action="store_true", help="scrape a seed grid, then only the combos a surrogate model is least sure of")
+    parser.add_argument("--target-error", type=float, default=TARGET_ERROR, help="adaptive stopping threshold (measured RMSE of ln premium on each new batch)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="combos scraped per adaptive round")
+    parser.add_argument("--no-trace", action="store_true", help="don't write per-combo timing spans to UK_quotes.trace.jsonl")
+    parser.add_argument("--worker", nargs="?", const=default_worker_id(), default=None, metavar="ID",
+                        help="scrape URLs claimed from the shared work queue (ID defaults to host:pid)")
+    parser.add_argument("--url-max-age", type=float, default=URL_MAX_AGE_DAYS, help="days after which a cached risk-profile URL is recollected")
+    parser.add_argument("--no-url-check", action="store_true", help="skip the liveness check of cached risk-profile URLs")
+    parser.add_argument("--refresh", action="store_true", help="re-scrape sentinel combos, then only the grid regions whose prices changed")
+    parser.add_argument("--snapshots", action="store_true", help="list the refresh snapshot versions and their changes, then exit")
+    parser.add_argument("--queue-status", action="store_true", help="show the work queue's depth, per-worker throughput and ETA, then exit")
+    args = parser.parse_args()
+    checkpoint_path = Path(__file__).resolve().parent.parent.parent / "data" / "raw" / ("UK_quotes_http.checkpoint.db" if args.engine == "http" else "UK_quotes.checkpoint.db")
+    if args.queue_status:
+        print_status(checkpoint_path)
+    elif args.snapshots:
+        print_snapshots(checkpoint_path)
+    else:
+        configure_waits(min_settle=args.min_settle)
+        main(workers=args.workers, max_per_site=args.max_per_site, fresh=args.fresh, engine=args.engine, base_url=args.base_url,
+             retry_failed=args.retry_failed, lean=args.lean, adaptive=args.adaptive, target_error=args.target_error, batch_size=args.batch_size,
+             trace=not args.no_trace, worker=args.worker,
+             url_max_age=args.url_max_age, check_urls=not args.no_url_check, refresh=args.refresh,
+             record_dir=args.record)
\ No newline at end of file
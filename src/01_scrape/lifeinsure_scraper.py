@@ -1,14 +1,16 @@
 # Standard libraries
-import csv
+import argparse
 from datetime import datetime
+from itertools import product
 from pathlib import Path
-import time
 
 # Third-party libraries
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
 
 # Local imports
-from utils import * # Imports init_driver, edit_page_context, select_dropdown, select_checkbox, text_input, ensure_page_ready and entire data sample
+from utils import * # Imports BrowserSession, edit_page_context, select_dropdown, select_checkbox, text_input, ensure_page_ready, Checkpoint, RetryScheduler, gray_order, AdaptiveSampler, WorkQueue, QuoteCapture, refresh_quotes, tracing helpers and entire data sample
 
 """
 IMPORTANT NOTE:
@@ -22,8 +24,58 @@ Although the scraping programme still works — and limited scrapinng seems to g
 may lead to an IP ban for this website, or other enforcement actions, as current restrictions appear to be more aggressive than during the original data collection. 
 """
 
+# Collects every visible quote row's dollar and cent spans (plus carrier and product) and parses them to cents in the page itself
+QUOTE_ROWS_SCRIPT = """
+const dollarSelector = `span[x-text="getModalPrice(row, paymentMode).split('.')[0]"]`;
+const centSelector = `span[x-text="getModalPrice(row, paymentMode).split('.')[1]"]`;
+const quotes = [];
+for (const dollar of document.querySelectorAll(dollarSelector)) {
+    if (!dollar.getClientRects().length) continue; // Hidden rows, as WebElement.text would skip them
+    // Row rendered by the Alpine x-for template, holding this price's cents, carrier and product
+    let row = dollar;
+    while (row.parentElement && !row.parentElement.querySelector(":scope > template[x-for]")) row = row.parentElement;
+    if (!row.parentElement) row = dollar.parentElement;
+    let cent = null;
+    for (let scope = dollar.parentElement; scope && !cent; scope = scope.parentElement) cent = scope.querySelector(centSelector);
+    const dollars = dollar.innerText.replace(/[^0-9]/g, "");
+    const cents = cent ? cent.innerText.replace(/[^0-9]/g, "") : "";
+    if (!dollars || !cents) continue;
+    const text = (selector) => { const el = row.querySelector(selector); return el ? el.innerText.trim() : null; };
+    const logo = row.querySelector("img[alt]");
+    quotes.push({
+        provider: text("[x-text*='company'], [x-text*='carrier']") || (logo ? logo.alt.trim() : null),
+        product: text("[x-text*='product']"),
+        premium_minor: parseInt(dollars, 10) * 100 + parseInt((cents + "00").slice(0, 2), 10),
+    });
+}
+return quotes;
+"""
+# Quote API calls (XHR/fetch) whose responses QuoteCapture reads in capture mode
+QUOTE_API_PATTERN = r"/quote/"
+LOADER = "div[x-show='loading && !resultsModalOpen']"
+
 
-def main():
+def main(fresh=False, retry_failed=False, lean=False, adaptive=False, target_error=TARGET_ERROR, batch_size=BATCH_SIZE, trace=True,
+         worker=None, capture=False, refresh=False):
+    """Scrapes every combo of the data sample (resuming from any checkpoint), then exports them to 'US_quotes.csv'.
+
+    Args:
+        fresh (bool): If True, discards the checkpoint from a previous run instead of resuming it.
+        retry_failed (bool): If True, combos marked as permanently failing by a previous run are scraped again.
+        lean (bool): If True, the browser uses the lean-browsing profile (no images, fonts or trackers, eager page loads).
+        adaptive (bool): If True, only scrapes the combos an AdaptiveSampler picks (a seed grid, then the most uncertain
+            combos), stopping once the surrogate predicts its freshly scraped batches within target_error.
+        target_error (float): Adaptive stopping threshold: RMSE of ln(premium) between each new batch's predictions
+            and its scraped premiums, which two batches in a row (utils.adaptive.CONFIRM_ROUNDS) must come within.
+        batch_size (int): Combos scraped per adaptive round.
+        trace (bool): If True, appends a span per combo (phase timings and outcome) to 'US_quotes.trace.jsonl'.
+        worker (str): If set, runs as this worker of the checkpoint's shared work queue (see utils.work_queue): claims
+            batches of combos until the queue is drained, and leaves exporting to a normal run.
+        capture (bool): If True, quotes are read from the quote API responses in the browser's network log as soon as
+            they arrive (every row, collapsed ones included), instead of from the rendered and expanded results.
+        refresh (bool): If True, updates the stored quotes by re-scraping sentinel combos and then only the regions
+            of the grid where their prices changed, recording the changes as a new snapshot version (see utils.recrawl).
+    """
     # lifeinsure quote portal
     quote_url = "https://quoter.lifeinsure.com/quote/no-exam?v=47cdeddcb8ce23704d302fbf65dfb9288295ec3bc4cffc9d8b10e3726fc4b54f#gender" 
     
@@ -32,145 +84,276 @@ def main():
     # Using global to avoid UnboundLocalError when modifying imported variable
     global term_lengths
     term_lengths = [f"{term} Year Term" for term in term_lengths] # Required format for matching later
+    grid = (coverage_amounts, term_lengths, ages, genders, nicotine_status)
     
-    driver = init_driver() # Initialising driver 
-    with driver:
-        results, failed = scrape_combos(driver, quote_url, coverage_amounts, term_lengths, ages, genders, nicotine_status)
-        
-        # Retry a maximum of 10 times until success
-        for i in range(1, 11):
-            if not failed:
-                break
-            print(f"🔁 Retrying failed combos... ({i})")
-            new_failed = []
-            for combo in failed:
-                # Unpacks each item in "combo" into separate single-item lists for passing to scrape_combinations
-                retry_results, retry_failed = scrape_combos(driver, quote_url, *[[x] for x in combo])
-                results.extend(retry_results)      # Adding to results
-                new_failed.extend(retry_failed)    # Collecting still-failing combos
-            failed = new_failed                    # Retry remaining ones next round
-            
     file_name = "US_quotes.csv"
     # Explicitly stating file path (../data/raw/{file_name} is done relative to console's current directory)
     output_path = Path(__file__).resolve().parent.parent.parent / "data" / "raw" / file_name
-    # Saving to CSV
-    with open(output_path, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Coverage Amount", "Term Length", "Age", "Gender", "Is_Smoker", "Premium"]) # CSV header
-        writer.writerows(results)
+    
+    # Per-combo spans, summarised with `python src/01_scrape/utils/tracing.py data/raw/US_quotes.trace.jsonl`
+    configure_tracing(output_path.with_suffix(".trace.jsonl") if trace else None, site="lifeinsure")
+    
+    # Every completed combo is committed to the checkpoint straight away, so an interrupted run resumes where it stopped
+    with Checkpoint(output_path.with_suffix(".checkpoint.db"), fresh=fresh, currency="USD") as checkpoint:
+        if retry_failed:
+            checkpoint.clear_failures()
+        # One warm browser for every batch and retry round (launched on first use, relaunched only if it crashes)
+        with BrowserSession(lean=lean, network_log=capture) as browser:
+            if worker:
+                run_worker(browser, quote_url, grid, checkpoint, worker)
+            elif refresh:
+                # Fresh quotes go to a scratch checkpoint first, and only changed combos replace the stored ones
+                refresh_quotes(checkpoint, grid, lambda combos, store: scrape_with_retries(browser, quote_url, combos, grid, store),
+                               output_path.with_suffix(".refresh.db"))
+            elif adaptive:
+                # Each round's combos are picked from everything scraped so far (including by earlier, resumed runs)
+                sampler = AdaptiveSampler(grid, batch_size=batch_size, target_error=target_error)
+                while batch := sampler.next_batch(checkpoint.combo_premiums(), checkpoint.remaining(sampler.grid)):
+                    scrape_with_retries(browser, quote_url, batch, grid, checkpoint)
+            else:
+                # Remaining combos are the full data sample grid minus those already in the checkpoint
+                combos = checkpoint.remaining(product(*grid))
+                print(f"↪️  {len(combos)} combos left to scrape.")
+                if combos:
+                    scrape_with_retries(browser, quote_url, combos, grid, checkpoint)
+        
+        if worker:
+            # Other workers may still be writing to the checkpoint, so exporting is left to a normal run
+            configure_tracing(None)
+            return
+        
+        # Saving to CSV
+        checkpoint.export_csv(output_path)
+        # Typed copy (integer fields, premiums in cents) for zero-parse loads downstream
+        checkpoint.export_parquet(output_path.parent / "quotes", site="lifeinsure")
+    configure_tracing(None)
     print(f"📁 All done — exported to '{file_name}', in {output_path}")
     
     
-def scrape_combos(driver, quote_url, coverage_amounts, term_lengths, ages, genders, nicotine_status):
+def scrape_with_retries(browser, quote_url, combos, grid, checkpoint):
+    """Scrapes combos in Gray-code order, then replays their failures in retry rounds until they succeed or give up.
+
+    Args:
+        browser (BrowserSession): Warm browser shared by the first pass and every retry round.
+        combos (list): (coverage, term, age, gender, nic) tuples to scrape.
+        grid (tuple): The data sample's axes, for Gray-code ordering.
+    """
+    # Scheduling in Gray-code order, so consecutive combos differ in as few fields (page reloads) as possible
+    combos = gray_order(combos, *grid)
+    # Every combo is reached from the same quote page, so each retry round replays all failures in one session
+    scheduler = RetryScheduler(max_rounds=10, checkpoint=checkpoint) # Retry a maximum of 10 rounds
+    for combo, kind, message in scrape_session(browser.driver, quote_url, combos, checkpoint, capture=browser.network_log):
+        scheduler.fail(combo, quote_url, kind, message)
+    for _, groups in scheduler.rounds():
+        combos = gray_order(groups[quote_url], *grid)
+        for combo, kind, message in scrape_session(browser.driver, quote_url, combos, checkpoint, capture=browser.network_log):
+            scheduler.fail(combo, quote_url, kind, message)
+    if scheduler.permanent:
+        print(f"⛔ {len(scheduler.permanent)} combos marked as permanently failing: {dict(scheduler.summary())}")
+
+
+def run_worker(browser, quote_url, grid, checkpoint, worker, batch_size=20):
+    """Scrapes batches of combos claimed from the work queue in the checkpoint file, until the queue is drained.
+
+    Any number of these workers (in other processes, or on other machines sharing the file) can run at once. Each
+    seeds the queue with the data sample grid if it isn't already, and failed combos are retried by whichever
+    worker claims them next, after backing off.
+
+    Args:
+        browser (BrowserSession): This worker's browser.
+        grid (tuple): The data sample's axes.
+        worker (str): This worker's id (see utils.work_queue.default_worker_id).
+        batch_size (int): Combos claimed per lease.
+    """
+    with WorkQueue(checkpoint.path) as work_queue:
+        added = work_queue.seed([(quote_url, product(*grid))], checkpoint)
+        print(f"👷 Worker {worker}: {added} combos added to the queue, {work_queue.unfinished()} left to scrape")
+        for _, combos in work_queue.batches(worker, size=batch_size):
+            # Combos stored since they were queued (e.g. by a normal run) are just marked as done
+            todo = gray_order(checkpoint.remaining(combos), *grid)
+            failed_combos = scrape_session(browser.driver, quote_url, todo, checkpoint, capture=browser.network_log) if todo else []
+            work_queue.settle(worker, combos, failed_combos, checkpoint)
+    print(f"👷 Worker {worker}: queue drained, run the scraper without --worker to export the quotes")
+
+
+def scrape_session(driver, quote_url, combos, checkpoint, capture=False):
+    """Scrapes combos in one session, counting a failure to load the quote page as a failure of every unfinished combo.
+
+    Args:
+        combos (list): (coverage, term, age, gender, nic) tuples to scrape, in order.
+        capture (bool): Passed through to scrape_combos.
+    Returns:
+        failed_combos (list): (combo, kind, message) of each combo for which scraping failed.
+    """
+    try:
+        return scrape_combos(driver, quote_url, combos, checkpoint, capture=capture)
+    except Exception as e:
+        # Quote page or initial form failed, so every unfinished combo of the session is retried
+        kind = classify_failure(e, driver)
+        print(f"❌ Error loading the quote page ({kind}): {e}")
+        return [(combo, kind, str(e)) for combo in checkpoint.remaining(combos)]
+
+
+def scrape_combos(driver, quote_url, combos, checkpoint, capture=False):
     """Iterates through combinations of inputs and collects premiums.
 
     Args:
         quote_url (str): URL of quote website (has premiums and risk editing on same page)
-        var_name (list): takes in multiple lists of variables to form each combo, and collect their premiums.
+        combos (list): (coverage, term, age, gender, nic) tuples to scrape, in order.
+        checkpoint (Checkpoint): store which each combo's premiums are committed to as soon as they are scraped.
+        capture (bool): If True, premiums are read from the quote API responses (driver needs network_log=True),
+            and each edit only waits for its response rather than for the results to re-render.
         
     Returns:
-        all_data (list): List of tuples containing input parameters and corresponding premiums.
-        failed_combos (list): list of tuples containing input parameters for which scraping failed.
+        failed_combos (list): (combo, kind, message) of each combo for which scraping failed (kind from classify_failure).
     """
-    all_data = []
     failed_combos = []
+    # Started before the page loads, so the initial form's quote response is captured too
+    quote_capture = QuoteCapture(driver, QUOTE_API_PATTERN) if capture else None
     
-    driver.get(quote_url) # Reloading the page
+    # Quote page and initial form are traced as a "page" span, apart from the combos
+    with trace_span("page", url=quote_url):
+        load_page(driver, quote_url) # Reloading the page
     
-    current_url = driver.current_url#
-    # Checking if redirected to continue page (happens when retrying)
-    if "#continue" in current_url:
-        time.sleep(1)
-        driver.find_element(By.XPATH, "/html/body/div[1]/div[4]/div/div[3]/a[1]").click() # Clicking continue button if redirected to continue page
-        time.sleep(1)
-        select_dropdown(driver, field_name="coverage", value="100000",) # Selecting "$100,000" cover
-        time.sleep(1)
-        select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[3]/div[4]/label[1]/strong/span") # Selecting 10 Year Term
-        time.sleep(3)
+        current_url = driver.current_url#
+        # Checking if redirected to continue page (happens when retrying)
+        # Each helper waits for its field to become interactable, so no fixed sleeps are needed between steps
+        if "#continue" in current_url:
+            wait_until(driver, EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div[4]/div/div[3]/a[1]"))).click() # Clicking continue button if redirected to continue page
+            select_dropdown(driver, field_name="coverage", value="100000",) # Selecting "$100,000" cover
+            select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[3]/div[4]/label[1]/strong/span") # Selecting 10 Year Term
         
-    else:
-        # Filling out initial form to have preset BMI, Health Rating, 1st Jan DOB and State as Alabama (upon analysis, state does not affect premiums)
-        time.sleep(1)
-        select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[1]/div[4]/label[1]/strong/span") # Selecting "Male"
-        time.sleep(1)
-        select_dropdown(driver, field_name="coverage", value="100000",) # Selecting "$100,000" cover
-        time.sleep(1)
-        select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[3]/div[4]/label[1]/strong/span") # Selecting 10 Year Term
-        time.sleep(1)
-        select_dropdown(driver, field_name="state", value="Alabama", by_visible_text=True) # Selecting state as Alabama
-        time.sleep(1)
-        select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[5]/div[4]/label[1]/strong") # Selecting "No" to used nicotine products
-        time.sleep(1)
-        # Selecting month, day and year of birth
-        text_input(driver, field_name='//*[@id="mm"]', value="1", by_xpath=True)
-        text_input(driver, field_name='//*[@id="dd"]', value="1", by_xpath=True)
-        text_input(driver, field_name='//*[@id="yyyy"]', value="2000", by_xpath=True)
-        time.sleep(1)
-        # Inputting average height and weight which correspond to an average BMI
-        text_input(driver, field_name="height", value="510")
-        text_input(driver, field_name="weight", value="167")
-        time.sleep(1)
-        select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[9]/div[4]/div[2]/label/strong") # Selecting "Average" health
-        time.sleep(3)
+        else:
+            # Filling out initial form to have preset BMI, Health Rating, 1st Jan DOB and State as Alabama (upon analysis, state does not affect premiums)
+            select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[1]/div[4]/label[1]/strong/span") # Selecting "Male"
+            select_dropdown(driver, field_name="coverage", value="100000",) # Selecting "$100,000" cover
+            select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[3]/div[4]/label[1]/strong/span") # Selecting 10 Year Term
+            select_dropdown(driver, field_name="state", value="Alabama", by_visible_text=True) # Selecting state as Alabama
+            select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[5]/div[4]/label[1]/strong") # Selecting "No" to used nicotine products
+            # Selecting month, day and year of birth
+            text_input(driver, field_name='//*[@id="mm"]', value="1", by_xpath=True)
+            text_input(driver, field_name='//*[@id="dd"]', value="1", by_xpath=True)
+            text_input(driver, field_name='//*[@id="yyyy"]', value="2000", by_xpath=True)
+            # Inputting average height and weight which correspond to an average BMI
+            text_input(driver, field_name="height", value="510")
+            text_input(driver, field_name="weight", value="167")
+            select_checkbox(driver, xpath="/html/body/div[1]/div[3]/form/div[9]/div[4]/div[2]/label/strong") # Selecting "Average" health
+    
+        # Results replace the form, so wait for the coverage dropdown of the premiums page before checking the loader
+        wait_until(driver, EC.presence_of_element_located((By.NAME, "coverage_amount")), timeout=30)
+        ensure_page_ready(driver, xpath=LOADER) # Ensuring premiums page has been fully loaded
     
-    ensure_page_ready(driver, xpath="div[x-show='loading && !resultsModalOpen']") # Ensuring premiums page has been fully loaded
+    # Values currently applied on the premiums page, so each combo only touches the fields that differ from the last one
+    form_state = read_form_state(driver)
     
-    # Iterating through each possible combo of variables
-    for coverage in coverage_amounts:
-        for term in term_lengths:
-            for age in ages:
-                for gender in genders:
-                    for nic in nicotine_status:
-                        # Calculating birth year corresponding to given age (using 1st of Jan as baseline)
-                        birth_year = str(datetime.now().year - age)
-                        try:
-                            # Selecting coverage amount and term length
-                            select_dropdown(driver, field_name="coverage_amount", value=coverage)
-                            ensure_page_ready(driver, xpath="div[x-show='loading && !resultsModalOpen']")
-                            # Scroll to top to make sure term dropdown is visible
-                            driver.execute_script("window.scrollTo(0, 0);")
-                            select_dropdown(driver, field_name="category_code", value=term, by_visible_text=True)
-                            ensure_page_ready(driver, xpath="div[x-show='loading && !resultsModalOpen']")
-                            # Opening the edit page and selecting relevant dropdowns for current combo
-                            with edit_page_context(driver, edit_node="a", edit_text="Edit", btn_node="button"):
-                                select_dropdown(driver, field_name="tobacco_years_ago", value=nic, by_visible_text=True)
-                                select_dropdown(driver, field_name="dob_year", value=birth_year)
-                                select_checkbox(driver, xpath=f"//*[normalize-space(text())='{gender}']")
-                            ensure_page_ready(driver, xpath="div[x-show='loading && !resultsModalOpen']")
-                            # Extracting each premium corresponding to this risk profile
-                            premiums = extract_premiums(driver)
-                            
-                            # Appending data to our list (if premiums is empty nothing is appended)
-                            for premium in premiums:
-                                all_data.append((coverage, term, age, gender, nic, premium))
-
-                            if premiums:
-                                print(f"✅ Done: {coverage}, {term}: Age {age}, {gender}, {nic}") # Printing current combo completed
-                            else:
-                                print(f"⏭️  Skipping: No quotes found for {coverage}, {term}: Age {age}, {gender}, {nic}")
-                                
-                        except Exception as e:
-                            print(f"❌ Error on combo: {coverage}, {term}: Age {age}, {gender}, {nic}: {e}")
-                            failed_combos.append((coverage, term, age, gender, nic)) # Recording failed combos
-                            continue
-    return all_data, failed_combos
+    # Iterating through each combo of variables
+    for i, combo in enumerate(combos):
+        coverage, term, age, gender, nic = combo
+        # Calculating birth year corresponding to given age (using 1st of Jan as baseline)
+        birth_year = str(datetime.now().year - age)
+        # Each combo is one span, its phases (ready, edit, extract, checkpoint) timed by the helpers it calls
+        with trace_span("combo", combo=list(combo_key(combo))) as span:
+            try:
+                # Selecting coverage amount and term length (each reloads the quotes, so only when changed)
+                if form_state.get("coverage_amount") != str(coverage):
+                    since = quote_capture.mark() if quote_capture else None
+                    select_dropdown(driver, field_name="coverage_amount", value=coverage)
+                    wait_for_quotes(driver, quote_capture, since)
+                    form_state["coverage_amount"] = str(coverage)
+                if form_state.get("category_code") != term:
+                    # Scroll to top to make sure term dropdown is visible
+                    driver.execute_script("window.scrollTo(0, 0);")
+                    since = quote_capture.mark() if quote_capture else None
+                    select_dropdown(driver, field_name="category_code", value=term, by_visible_text=True)
+                    wait_for_quotes(driver, quote_capture, since)
+                    form_state["category_code"] = term
+            
+                # Opening the edit page (only if one of its fields changed) and selecting the changed dropdowns for current combo
+                edits = {"tobacco_years_ago": nic, "dob_year": birth_year, "gender": gender}
+                edits = {field: value for field, value in edits.items() if form_state.get(field) != value}
+                if edits:
+                    since = quote_capture.mark() if quote_capture else None
+                    with edit_page_context(driver, edit_node="a", edit_text="Edit", btn_node="button"):
+                        if "tobacco_years_ago" in edits:
+                            select_dropdown(driver, field_name="tobacco_years_ago", value=nic, by_visible_text=True)
+                        if "dob_year" in edits:
+                            select_dropdown(driver, field_name="dob_year", value=birth_year)
+                        if "gender" in edits:
+                            select_checkbox(driver, xpath=f"//*[normalize-space(text())='{gender}']")
+                    wait_for_quotes(driver, quote_capture, since)
+                    form_state.update(edits)
+                # Extracting each premium corresponding to this risk profile
+                premiums = extract_premiums(driver) if quote_capture is None else captured_premiums(driver, quote_capture)
+            
+                # Committing the combo (if premiums is empty it is still marked as done, with no rows)
+                with phase("checkpoint"):
+                    checkpoint.record(combo, premiums)
 
+                if premiums:
+                    span["outcome"] = "ok"
+                    print(f"✅ Done: {coverage}, {term}: Age {age}, {gender}, {nic}") # Printing current combo completed
+                else:
+                    span["outcome"] = "empty"
+                    print(f"⏭️  Skipping: No quotes found for {coverage}, {term}: Age {age}, {gender}, {nic}")
+                
+            except Exception as e:
+                kind = classify_failure(e, driver)
+                span["outcome"] = kind
+                print(f"❌ Error on combo ({kind}): {coverage}, {term}: Age {age}, {gender}, {nic}: {e}")
+                failed_combos.append((combo, kind, str(e))) # Recording failed combos
+                if kind == "block":
+                    # Site is refusing us, so stop hammering it and leave the other combos for a backed-off retry
+                    failed_combos.extend((rest, SKIPPED, "Skipped after block") for rest in combos[i + 1:])
+                    break
+                form_state.clear() # Page state is unknown after an error, so the next combo sets every field
+    return failed_combos
+
+
+def wait_for_quotes(driver, quote_capture, since):
+    """Waits for the results to update after an edit.
+
+    Args:
+        quote_capture (QuoteCapture): In capture mode, only the edit's quote response and the loader are waited for
+            (not the re-render). None waits for the results page to be ready (see ensure_page_ready).
+        since (int): quote_capture.mark() taken before the edit.
+    """
+    if quote_capture is None:
+        ensure_page_ready(driver, xpath=LOADER)
+        return
+    with phase("ready"):
+        quote_capture.wait(since)
+        # The loader covers the form while it shows, so it still has to clear before the next edit
+        wait_until(driver, EC.invisibility_of_element_located((By.CSS_SELECTOR, LOADER)), settle=0)
+
+
+def read_form_state(driver):
+    """Reads the coverage and term currently selected on the premiums page.
+
+    Returns:
+        form_state (dict): Field name → applied value. Edit page fields are left out (unknown until first set).
+    """
+    form_state = {}
+    try:
+        form_state["coverage_amount"] = Select(driver.find_element(By.NAME, "coverage_amount")).first_selected_option.get_attribute("value")
+        form_state["category_code"] = Select(driver.find_element(By.NAME, "category_code")).first_selected_option.text.strip()
+    except Exception:
+        pass # Missing fields are simply treated as unknown
+    return form_state
 
+
+@traced("extract")
 def extract_premiums(driver):
     """Extracts available premiums from the 'No Medical Exam Policies' section.
 
     Returns:
-        premiums: List of multiple premium strings (e.g., ['$14.32']) for each combo.
+        premiums: List of quote dicts (see extract_quotes), with each premium already parsed to cents.
     """
-    premiums = []
-    
     no_results_elem = driver.find_element(By.XPATH, "//h2[contains(string(), 'Your original search had no results')]")
     # If 'no results' element is visibly displayed return empty premiums list
     if no_results_elem.is_displayed():
-        return premiums
+        return []
 
-    ensure_page_ready(driver, xpath="div[x-show='loading && !resultsModalOpen']")
-    time.sleep(0.5)
+    ensure_page_ready(driver, xpath=LOADER)
 
     # Try to expand more results by clicking "View more" button
     try:
@@ -178,23 +361,62 @@ def extract_premiums(driver):
     except:
         pass  # Ignore if "View more" button not present
 
-    ensure_page_ready(driver, xpath="div[x-show='loading && !resultsModalOpen']")
-    time.sleep(0.5)
-
-    # Collect premium parts (website already filtering by 'No Medical Exam')
-    dollar_spans = driver.find_elements(By.XPATH, ".//span[@x-text=\"getModalPrice(row, paymentMode).split('.')[0]\"]")
-    cent_spans = driver.find_elements(By.XPATH, ".//span[@x-text=\"getModalPrice(row, paymentMode).split('.')[1]\"]")
-
-    # Pairs dollar and cent values, formats them as "$d.c", and filters out empty values
-    premiums = [
-        f"${d}.{c}"
-        for d, c in zip(
-            (dollar.text.strip() for dollar in dollar_spans),
-            (cent.text.strip() for cent in cent_spans)
-        ) if d and c
-    ]
+    ensure_page_ready(driver, xpath=LOADER)
+
+    # Reading every quote in a single round trip (website already filtering by 'No Medical Exam')
+    quotes = extract_quotes(driver)
+    if not quotes:
+        # Neither quotes nor the 'no results' message, so the rows didn't render rather than there being no quotes
+        raise NoResultsError("Results page showed no quotes and no 'no results' message")
+    return quotes
+
+
+@traced("extract")
+def captured_premiums(driver, quote_capture):
+    """Returns the premiums of the last quote response, falling back to the rendered rows if it wasn't recognised.
+
+    Returns:
+        premiums: List of quote dicts (see parse_quote_rows), empty if the site returned no quotes.
+    """
+    premiums = quote_capture.current
+    if premiums is None:
+        # Request failed, or its body is unreadable or not a quote payload the parser knows, so reading the page as usual
+        return extract_premiums(driver)
     return premiums
 
 
+def extract_quotes(driver):
+    """Reads every visible quote row on the results page in one execute_script call.
+
+    Returns:
+        quotes (list): Dicts with the row's 'provider', 'product' and 'premium_minor' (monthly premium in cents).
+    """
+    return driver.execute_script(QUOTE_ROWS_SCRIPT)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape lifeinsure.com life insurance quotes.")
+    parser.add_argument("--min-settle", type=float, default=None, help="minimum settle time (s) after each wait condition is met")
+    parser.add_argument("--fresh", action="store_true", help="discard the checkpoint of a previous run instead of resuming it")
+    parser.add_argument("--retry-failed", action="store_true", help="retry combos a previous run marked as permanently failing")
+    parser.add_argument("--lean", action="store_true", help="block images, fonts and third-party trackers, and load pages eagerly")
+    parser.add_argument("--adaptive", action="store_true", help="scrape a seed grid, then only the combos a surrogate model is least sure of")
+    parser.add_argument("--target-error", type=float, default=TARGET_ERROR, help="adaptive stopping threshold (measured RMSE of ln premium on each new batch)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="combos scraped per adaptive round")
+    parser.add_argument("--no-trace", action="store_true", help="don't write per-combo timing spans to US_quotes.trace.jsonl")
+    parser.add_argument("--worker", nargs="?", const=default_worker_id(), default=None, metavar="ID",
+                        help="scrape combos claimed from the shared work queue (ID defaults to host:pid)")
+    parser.add_argument("--capture", action="store_true", help="read quotes from the quote API responses instead of the rendered results")
+    parser.add_argument("--refresh", action="store_true", help="re-scrape sentinel combos, then only the grid regions whose prices changed")
+    parser.add_argument("--snapshots", action="store_true", help="list the refresh snapshot versions and their changes, then exit")
+    parser.add_argument("--queue-status", action="store_true", help="show the work queue's depth, per-worker throughput and ETA, then exit")
+    args = parser.parse_args()
+    if args.queue_status:
+        print_status(Path(__file__).resolve().parent.parent.parent / "data" / "raw" / "US_quotes.checkpoint.db")
+    elif args.snapshots:
+        print_snapshots(Path(__file__).resolve().parent.parent.parent / "data" / "raw" / "US_quotes.checkpoint.db")
+    else:
+        configure_waits(min_settle=args.min_settle)
+        main(fresh=args.fresh, retry_failed=args.retry_failed, lean=args.lean,
+             adaptive=args.adaptive, target_error=args.target_error, batch_size=args.batch_size, trace=not args.no_trace,
+             worker=args.worker, capture=args.capture, refresh=args.refresh)
\ No newline at end of file
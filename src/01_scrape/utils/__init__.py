@@ -1,3 +1,21 @@
-from .driver_utils import init_driver, edit_page_context, select_dropdown, select_checkbox, text_input, ensure_page_ready
+from .driver_utils import init_driver, load_page, edit_page_context, select_dropdown, select_checkbox, text_input, ensure_page_ready
+from .driver_utils import configure_waits, wait_until, wait_for_idle, page_idle, page_metrics, resolve_driver_path
+from .browser_session import BrowserSession
+from .driver_pool import DriverPool, MAX_PER_SITE
+from .checkpoint import Checkpoint, combo_key
+from .combo_order import gray_product, gray_order
+from .money import to_minor_units, format_minor_units, CURRENCY_SYMBOLS
+from .quote_dataset import QUOTE_SCHEMA, read_quotes
+from .http_client import HttpSession, HttpStatusError
+from .adaptive import AdaptiveSampler, TARGET_ERROR, BATCH_SIZE
+from .tracing import configure_tracing, trace_span, phase, traced
+from .work_queue import WorkQueue, default_worker_id, print_status
+from .url_cache import UrlCache, URL_MAX_AGE_DAYS
+from .network_capture import QuoteCapture, parse_quote_rows
+from .recrawl import SnapshotLog, refresh_quotes, print_snapshots
+from .retry import RetryScheduler, NoResultsError, classify_failure, SKIPPED
+from .local_server import LocalServer
+from .replay_server import ReplayServer
+from .mock_sites import MockSites
 
 from .data_sample import * # Imports entire data sample
\ No newline at end of file
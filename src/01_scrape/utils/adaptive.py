@@ -0,0 +1,157 @@
+# Standard libraries
+import math
+from itertools import product
+
+# Third-party libraries
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+# Local imports
+from .checkpoint import combo_key
+
+SEED_LEVELS = 3       # Levels of each long (ordered) axis in the seed grid: both ends and the middle
+BATCH_SIZE = 40       # Combos scraped per adaptive round
+TARGET_ERROR = 0.05   # Stop once the surrogate predicts freshly scraped combos' ln(premium) within this RMSE (~5%)
+CONFIRM_ROUNDS = 2    # Consecutive rounds which must meet the target before stopping
+N_ESTIMATORS = 100    # Trees of the surrogate forest
+
+
+def leading_number(value):
+    """Parses the number a grid value starts with (e.g. 250000, "10 Year Term" → 10.0), None if it doesn't."""
+    try:
+        return float(str(value).split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+class AdaptiveSampler:
+    """Chooses which combos of the data sample grid to scrape, instead of exhausting the whole grid.
+
+    A coarse seed grid (both ends and the middle of each long axis, every level of the short ones) is scraped first.
+    After that, each round fits a surrogate of ln(premium) on everything scraped so far and picks the unscraped
+    combos whose predictions disagree the most across the surrogate forest's trees.
+
+    The surrogate is a quadratic trend (premiums are smooth and monotone in coverage, term and age, so this is what
+    interpolates between the grid levels a forest alone would leave as flat steps) plus a random forest of its
+    residuals (steps such as age bands, and interactions). The trees' spread only ranks combos, it understates the
+    real error, so the stopping rule is measured: each batch is predicted before it is scraped, and sampling stops
+    once CONFIRM_ROUNDS batches in a row (the most uncertain combos left) come back within target_error. It also
+    stops if a round made no progress (e.g. the site blocked every combo of the batch), instead of asking for the
+    same combos again.
+    """
+
+    def __init__(self, axes, batch_size=BATCH_SIZE, target_error=TARGET_ERROR, seed_levels=SEED_LEVELS,
+                 n_estimators=N_ESTIMATORS, random_state=42):
+        """
+        Args:
+            axes (list): The grid's axes (e.g. coverage_amounts, term_lengths, ages, genders, nicotine_status), in
+                the same field order as the scrapers' combos.
+            batch_size (int): Combos returned per round after the seed grid.
+            target_error (float): RMSE of ln(premium) on freshly scraped batches at which sampling stops.
+            seed_levels (int): Levels kept from each axis longer than this in the seed grid.
+            n_estimators (int): Trees of the surrogate forest.
+            random_state (int): Seed of the surrogate forest.
+        """
+        self.axes = [list(axis) for axis in axes]
+        self.grid = list(product(*self.axes))
+        self.batch_size = batch_size
+        self.target_error = target_error
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+
+        # Numeric axes (coverage, term, age) are encoded by the log of their value, so the trend is multiplicative;
+        # the others (gender, nicotine use) by their position in the axis
+        self._codes = []
+        for axis in self.axes:
+            numbers = [leading_number(value) for value in axis]
+            if all(number is not None and number > 0 for number in numbers):
+                self._codes.append({str(value): math.log(number) for value, number in zip(axis, numbers)})
+            else:
+                self._codes.append({str(value): float(i) for i, value in enumerate(axis)})
+
+        # Seed grid: evenly spread levels (always including both ends) of the long axes, all levels of the short ones
+        seed_values = [
+            {str(axis[i]) for i in np.linspace(0, len(axis) - 1, seed_levels).round().astype(int)} if len(axis) > seed_levels else {str(value) for value in axis}
+            for axis in self.axes
+        ]
+        self.seed = [combo for combo in self.grid if all(value in kept for value, kept in zip(combo_key(combo), seed_values))]
+        self.batch_errors = [] # Measured RMSE of each adaptive batch, in scrape order
+        self._predicted = {}   # Combo key → ln(premium) the surrogate predicted for the batch in progress
+        self._progress = None  # (scraped with quotes, left to scrape) when the batch in progress was picked
+
+    def encode(self, combos):
+        """Surrogate features of each combo, as a (combos × axes) array."""
+        return np.array([[codes[value] for codes, value in zip(self._codes, combo_key(combo))] for combo in combos], dtype=float)
+
+    def fit(self, premiums):
+        """Fits the surrogate to every scraped combo with quotes.
+
+        Args:
+            premiums (dict): Combo key → typical premium (minor units), see Checkpoint.combo_premiums.
+        Returns:
+            predict (function): Maps a list of combos to a (trees × combos) array of ln(premium) predictions.
+        """
+        scraped = [combo for combo in self.grid if combo_key(combo) in premiums]
+        X = self.encode(scraped)
+        y = np.log([premiums[combo_key(combo)] for combo in scraped])
+        trend = make_pipeline(PolynomialFeatures(2), Ridge(alpha=1e-3)).fit(X, y)
+        forest = RandomForestRegressor(
+            n_estimators=self.n_estimators, random_state=self.random_state, n_jobs=-1
+        ).fit(X, y - trend.predict(X))
+
+        def predict(combos):
+            X = self.encode(combos)
+            return trend.predict(X) + np.stack([tree.predict(X) for tree in forest.estimators_])
+        return predict
+
+    def next_batch(self, premiums, remaining):
+        """Picks the next combos to scrape, after scoring the surrogate on the previous batch.
+
+        Args:
+            premiums (dict): Combo key → typical premium (minor units) of every scraped combo with quotes
+                (see Checkpoint.combo_premiums).
+            remaining (list): Grid combos not yet scraped nor permanently failing (see Checkpoint.remaining).
+        Returns:
+            combos (list): Combos to scrape next, empty once the target error is reached (or nothing is left).
+        """
+        left = {combo_key(combo) for combo in remaining}
+        # Blocked or skipped combos stay unscraped (see RetryScheduler.rounds), so a round which neither scraped nor
+        # settled anything would only be picked, and backed off, again
+        progress = (len(premiums), len(left))
+        if progress == self._progress:
+            print("⛔ Adaptive sampling stopped: the last round scraped none of its combos, re-run later to resume")
+            return []
+        self._progress = progress
+
+        seed_left = [combo for combo in self.seed if combo_key(combo) in left]
+        if seed_left:
+            print(f"🌱 Adaptive sampling: scraping {len(seed_left)} seed combos ({len(self.seed)} in the seed grid)")
+            return seed_left
+
+        # Scoring the last batch's predictions against what was actually scraped (combos without quotes don't count)
+        scored = [(predicted, math.log(premiums[key])) for key, predicted in self._predicted.items() if key in premiums]
+        if scored:
+            self.batch_errors.append(math.sqrt(sum((predicted - actual) ** 2 for predicted, actual in scored) / len(scored)))
+        self._predicted = {}
+        n_scraped = sum(combo_key(combo) in premiums for combo in self.grid)
+        recent = self.batch_errors[-CONFIRM_ROUNDS:]
+        if len(recent) == CONFIRM_ROUNDS and max(recent) <= self.target_error:
+            print(f"🎯 Adaptive sampling done: last {CONFIRM_ROUNDS} batches predicted within {max(recent):.3f} "
+                  f"(target {self.target_error}) after {n_scraped} of {len(self.grid)} combos")
+            return []
+
+        candidates = [combo for combo in self.grid if combo_key(combo) in left]
+        if not candidates or n_scraped < 2:
+            return []
+        trees = self.fit(premiums)(candidates)
+        spread = trees.std(axis=0)
+        order = np.argsort(-spread)[:self.batch_size]
+        batch = [candidates[i] for i in order]
+        self._predicted = {combo_key(candidates[i]): float(trees[:, i].mean()) for i in order}
+        last_error = f"{self.batch_errors[-1]:.3f}" if self.batch_errors else "n/a"
+        print(f"🎯 Adaptive round: surrogate on {n_scraped} combos, last batch error {last_error} (target {self.target_error}), "
+              f"scraping the {len(batch)} most uncertain combos (tree spread up to {spread.max():.3f})")
+        return batch
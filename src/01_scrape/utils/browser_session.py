@@ -0,0 +1,88 @@
+# Standard libraries
+import shutil
+import tempfile
+from urllib.parse import urlsplit
+
+# Local imports
+from .driver_utils import init_driver
+
+
+class BrowserSession:
+    """Keeps one warm Chrome instance alive across scraping phases (e.g. URL collection, scraping, retries).
+
+    The browser is launched on first use and reused afterwards. reset() clears cookies and site storage between
+    phases instead of relaunching, and a crashed browser is transparently relaunched. Use as a context manager.
+    """
+
+    def __init__(self, headless=True, debugging_port=None, profile_dir=None, lean=False, network_log=False):
+        """
+        Args:
+            headless (bool): Passed through to init_driver.
+            debugging_port (int): Passed through to init_driver, None picks a free port at each launch.
+            profile_dir (str): User data directory. If None, a temporary one is created and removed on close().
+            lean (bool): Passed through to init_driver (lean-browsing profile).
+            network_log (bool): Passed through to init_driver (DevTools network log, for QuoteCapture).
+        """
+        self.headless = headless
+        self.lean = lean
+        self.network_log = network_log
+        self.debugging_port = debugging_port
+        self._own_profile = profile_dir is None
+        self.profile_dir = profile_dir or tempfile.mkdtemp(prefix="scraper-session-")
+        self._driver = None
+
+    @property
+    def driver(self):
+        """The session's WebDriver, (re)launching Chrome if it isn't running or has stopped responding."""
+        if self._driver is not None:
+            try:
+                self._driver.current_window_handle # Cheap liveness check
+            except Exception:
+                print("⚠️  Browser stopped responding, relaunching it")
+                self._quit()
+        if self._driver is None:
+            self._driver = init_driver(
+                headless=self.headless, debugging_port=self.debugging_port, profile_dir=self.profile_dir, lean=self.lean,
+                network_log=self.network_log,
+            )
+        return self._driver
+
+    def reset(self, origins=()):
+        """Clears cookies and site storage, then leaves the browser on a blank page, ready for the next phase.
+
+        Args:
+            origins (iterable): Extra origins (e.g. "https://example.com") whose storage is cleared, on top of
+                the current page's.
+        """
+        if self._driver is None:
+            return # Nothing to reset yet
+        driver = self.driver
+        current = urlsplit(driver.current_url)
+        origins = set(origins)
+        if current.scheme in ("http", "https"):
+            origins.add(f"{current.scheme}://{current.netloc}")
+        # Going through DevTools, as Selenium can only delete the current page's cookies
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.get("about:blank")
+
+    def _quit(self):
+        try:
+            self._driver.quit()
+        except Exception:
+            pass # Already gone
+        self._driver = None
+
+    def close(self):
+        """Quits the browser and removes the temporary profile directory (if the session created it)."""
+        if self._driver is not None:
+            self._quit()
+        if self._own_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,240 @@
+# Standard libraries
+import csv
+import sqlite3
+import threading
+from pathlib import Path
+
+# Local imports
+from .money import CURRENCY_SYMBOLS, format_minor_units, to_minor_units
+from .quote_dataset import to_record, utc_now, write_quote_dataset
+
+# CSV header shared by both scrapers' exported quotes
+CSV_HEADER = ["Coverage Amount", "Term Length", "Age", "Gender", "Is_Smoker", "Premium"]
+
+# Typed quote columns (added to checkpoints created before they existed)
+TYPED_COLUMNS = {"premium_minor": "INTEGER", "currency": "TEXT", "provider": "TEXT", "product": "TEXT", "scraped_at": "TEXT"}
+
+
+def combo_key(combo):
+    """Normalises a (coverage, term, age, gender, nic) combo to strings, so ints and CSV-read values compare equal."""
+    return tuple(str(value) for value in combo[:5])
+
+
+class Checkpoint:
+    """Append-only SQLite store which durably records each combo's premiums as soon as they are scraped.
+
+    Every combo is committed in a single transaction (its premiums plus a 'done' marker), so a crash loses at most
+    the combo in progress and a restart can skip everything already stored. Safe to share between threads.
+    """
+
+    def __init__(self, path, fresh=False, currency=None):
+        """
+        Args:
+            path (str | Path): Location of the SQLite checkpoint file (created if missing).
+            fresh (bool): If True, discards any existing checkpoint and starts over.
+            currency (str): ISO code of the scraped premiums (e.g. "GBP"), stored with every quote.
+        """
+        self.path = Path(path)
+        self.currency = currency
+        if fresh:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")   # Appends don't rewrite the file
+        self._conn.execute("PRAGMA synchronous=FULL")   # Each commit is on disk before record() returns
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS quotes (
+                    id INTEGER PRIMARY KEY, coverage TEXT, term TEXT, age TEXT, gender TEXT, nic TEXT, premium TEXT
+                )""")
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(quotes)")}
+            for column, column_type in TYPED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE quotes ADD COLUMN {column} {column_type}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS combos (
+                    coverage TEXT, term TEXT, age TEXT, gender TEXT, nic TEXT, n_quotes INTEGER,
+                    PRIMARY KEY (coverage, term, age, gender, nic)
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS failures (
+                    coverage TEXT, term TEXT, age TEXT, gender TEXT, nic TEXT, kind TEXT, attempts INTEGER, error TEXT,
+                    PRIMARY KEY (coverage, term, age, gender, nic)
+                )""")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def record(self, combo, quotes):
+        """Durably stores a completed combo and its quotes (an empty list marks a combo with no quotes).
+
+        Args:
+            combo (tuple): (coverage, term, age, gender, nic) of the scraped combo.
+            quotes (list): Quote dicts with 'premium_minor' (plus optional 'provider' and 'product'), as returned by
+                the scrapers' extract_quotes, or displayed premium strings (e.g. "£5.00").
+        """
+        key = combo_key(combo)
+        rows = self._quote_rows(key, quotes)
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO combos VALUES (?, ?, ?, ?, ?, ?)", (*key, len(rows))
+            ).rowcount
+            # Combo already stored (e.g. scraped again by a retry), don't duplicate its rows
+            if inserted:
+                self._insert_quotes(key, rows)
+
+    def replace(self, combo, quotes):
+        """Durably replaces a stored combo's quotes with freshly scraped ones (e.g. by a refresh, see utils.recrawl).
+
+        Args:
+            combo (tuple): (coverage, term, age, gender, nic) of the combo.
+            quotes (list): Quote dicts, as for record().
+        """
+        key = combo_key(combo)
+        rows = self._quote_rows(key, quotes)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM quotes WHERE coverage = ? AND term = ? AND age = ? AND gender = ? AND nic = ?", key)
+            self._conn.execute("INSERT OR REPLACE INTO combos VALUES (?, ?, ?, ?, ?, ?)", (*key, len(rows)))
+            self._insert_quotes(key, rows)
+
+    def _quote_rows(self, key, quotes):
+        scraped_at = utc_now()
+        rows = []
+        for quote in quotes:
+            if isinstance(quote, dict):
+                premium = format_minor_units(quote["premium_minor"], CURRENCY_SYMBOLS.get(self.currency, ""))
+                rows.append((*key, premium, quote["premium_minor"], self.currency, quote.get("provider"), quote.get("product"), scraped_at))
+            else:
+                rows.append((*key, quote, to_minor_units(quote), self.currency, None, None, scraped_at))
+        return rows
+
+    def _insert_quotes(self, key, rows):
+        # Called inside the caller's transaction
+        self._conn.executemany(
+            "INSERT INTO quotes (coverage, term, age, gender, nic, premium, premium_minor, currency, provider, product, scraped_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._conn.execute(
+            "DELETE FROM failures WHERE coverage = ? AND term = ? AND age = ? AND gender = ? AND nic = ?", key
+        )
+
+    def mark_failed(self, combo, kind, attempts, error=""):
+        """Marks a combo as permanently failing, so resumed runs skip it (see clear_failures).
+
+        Args:
+            combo (tuple): (coverage, term, age, gender, nic) of the failing combo.
+            kind (str): Failure kind (see utils.retry.classify_failure).
+            attempts (int): Number of attempts made.
+            error (str): Last error message.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (*combo_key(combo), kind, attempts, error)
+            )
+
+    def failures(self):
+        """Returns the combos marked as permanently failing, as {combo key: (kind, attempts, error)}."""
+        with self._lock:
+            rows = self._conn.execute("SELECT coverage, term, age, gender, nic, kind, attempts, error FROM failures")
+            return {tuple(row[:5]): tuple(row[5:]) for row in rows}
+
+    def clear_failures(self):
+        """Unmarks every permanently failing combo, so the next remaining() call includes them again."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM failures")
+
+    def completed(self):
+        """Returns the set of combo keys (see combo_key) already stored."""
+        with self._lock:
+            return set(self._conn.execute("SELECT coverage, term, age, gender, nic FROM combos"))
+
+    def combo_premiums(self):
+        """Returns the median premium (minor units) of every stored combo with quotes, as {combo key: premium}."""
+        premiums = {}
+        with self._lock:
+            for *key, premium, premium_minor in self._conn.execute(
+                "SELECT coverage, term, age, gender, nic, premium, premium_minor FROM quotes"
+            ):
+                premiums.setdefault(tuple(key), []).append(premium_minor if premium_minor is not None else to_minor_units(premium))
+        return {key: sorted(values)[len(values) // 2] for key, values in premiums.items()}
+
+    def combo_quotes(self):
+        """Returns every stored combo's quotes, as {combo key: [quote dicts with 'provider', 'product' and 'premium_minor']}.
+
+        Combos stored without quotes are included with an empty list.
+        """
+        quotes = {}
+        with self._lock:
+            for key in self._conn.execute("SELECT coverage, term, age, gender, nic FROM combos"):
+                quotes[tuple(key)] = []
+            for *key, premium, premium_minor, provider, product in self._conn.execute(
+                "SELECT coverage, term, age, gender, nic, premium, premium_minor, provider, product FROM quotes ORDER BY id"
+            ):
+                quotes.setdefault(tuple(key), []).append({
+                    "provider": provider, "product": product,
+                    "premium_minor": premium_minor if premium_minor is not None else to_minor_units(premium),
+                })
+        return quotes
+
+    def remaining(self, combos):
+        """Filters combos down to those not yet stored (nor marked as permanently failing), preserving their order."""
+        done = self.completed() | set(self.failures())
+        return [combo for combo in combos if combo_key(combo) not in done]
+
+    def export_csv(self, csv_path, encoding=None):
+        """Streams every stored quote, in scrape order, to a CSV with the scrapers' usual header.
+
+        Args:
+            csv_path (str | Path): Destination CSV (overwritten).
+            encoding (str): Passed to open(), e.g. "utf-8" for "£" premiums.
+        Returns:
+            rows (int): Number of quote rows written.
+        """
+        rows = 0
+        with self._lock, open(csv_path, mode="w", newline="", encoding=encoding) as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            # Iterating over the cursor keeps memory flat however many rows are stored
+            for row in self._conn.execute("SELECT coverage, term, age, gender, nic, premium FROM quotes ORDER BY id"):
+                writer.writerow(row)
+                rows += 1
+        return rows
+
+
+    def export_parquet(self, dataset_dir, site, batch_size=50_000):
+        """Streams every stored quote as typed records to a Parquet dataset partitioned by site and scrape date.
+
+        Quotes stored before the typed columns existed are parsed from their premium string and dated at export time.
+
+        Args:
+            dataset_dir (str | Path): Root directory of the dataset (see utils.quote_dataset).
+            site (str): Site partition to write, e.g. "drewberry".
+            batch_size (int): Rows read from the checkpoint and written at a time.
+        Returns:
+            rows (int): Number of quotes written.
+        """
+        def batches():
+            cursor = self._conn.execute(
+                "SELECT coverage, term, age, gender, nic, premium, premium_minor, currency, provider, product,"
+                " COALESCE(scraped_at, ?) FROM quotes ORDER BY id",
+                (utc_now(),),
+            )
+            while rows := cursor.fetchmany(batch_size):
+                batch = []
+                for *combo, premium, premium_minor, currency, provider, product, scraped_at in rows:
+                    if premium_minor is None:
+                        premium_minor = to_minor_units(premium)
+                    batch.append(to_record(site, *combo, premium_minor, currency or self.currency, provider, product, scraped_at))
+                yield batch
+
+        with self._lock:
+            return write_quote_dataset(batches(), dataset_dir, site)
\ No newline at end of file
@@ -0,0 +1,31 @@
+# Local imports
+from .checkpoint import combo_key
+
+
+def gray_product(*axes):
+    """Yields the Cartesian product of the axes in reflected (Gray-code) order.
+
+    Like itertools.product, but every other run of an inner axis is reversed, so consecutive combos differ
+    in exactly one field (e.g. [1, 2] x [a, b] gives (1, a), (1, b), (2, b), (2, a)).
+    """
+    if not axes:
+        yield ()
+        return
+    inner = list(gray_product(*axes[1:]))
+    for i, value in enumerate(axes[0]):
+        # Walking the inner combos backwards on odd steps so the join between runs only changes this axis
+        for tail in (inner if i % 2 == 0 else reversed(inner)):
+            yield (value, *tail)
+
+
+def gray_order(combos, *axes):
+    """Sorts combos into their gray_product(*axes) order, so a scraper moving through them changes as few fields as possible.
+
+    Args:
+        combos (iterable): Combos to schedule (any subset of the grid, e.g. what's left after a checkpoint).
+        axes (list): The grid's axes, in the same field order as the combos.
+    Returns:
+        combos (list): Sorted combos; any not on the grid keep their relative order at the end.
+    """
+    rank = {combo_key(combo): i for i, combo in enumerate(gray_product(*axes))}
+    return sorted(combos, key=lambda combo: rank.get(combo_key(combo), len(rank)))
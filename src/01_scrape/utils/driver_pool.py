@@ -0,0 +1,104 @@
+# Standard libraries
+import queue
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+# Local imports
+from .browser_session import BrowserSession
+
+MAX_PER_SITE = 4 # Default cap on concurrent browsers hitting the same host
+
+
+class DriverPool:
+    """A pool of headless Chrome workers which take tasks from a shared queue.
+
+    Each worker owns its own BrowserSession (driver, debugging port and profile directory), so instances can run
+    side by side. Sessions stay warm between map() calls (e.g. scraping then retries) until the pool is closed.
+    A per-site semaphore caps how many workers may load pages from the same host at once. Use as a context manager.
+    """
+
+    def __init__(self, workers=2, max_per_site=MAX_PER_SITE, headless=True, lean=False, network_log=False):
+        """
+        Args:
+            workers (int): Number of Chrome instances to run concurrently.
+            max_per_site (int): Maximum number of workers allowed on the same host at any one time.
+            headless (bool): Passed through to init_driver.
+            lean (bool): Passed through to init_driver (lean-browsing profile).
+            network_log (bool): Passed through to init_driver (DevTools network log, for QuoteCapture).
+        """
+        self.workers = max(1, workers)
+        self.max_per_site = max(1, max_per_site)
+        self.headless = headless
+        self._site_slots = defaultdict(lambda: threading.BoundedSemaphore(self.max_per_site))
+        self._slots_lock = threading.Lock()
+        # Browsers are only launched once a worker first needs one
+        self.sessions = [
+            BrowserSession(headless=headless, lean=lean, network_log=network_log)
+            for _ in range(self.workers)
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Quits every worker's browser."""
+        for session in self.sessions:
+            session.close()
+
+    def _site_slot(self, url):
+        # Creating semaphores under a lock so two workers never get different semaphores for the same host
+        with self._slots_lock:
+            return self._site_slots[urlparse(url).netloc]
+
+    def map(self, work_fn, items, url_of):
+        """Runs work_fn(driver, item) for every item, spread across the pool's workers.
+
+        Args:
+            work_fn (callable): Function taking (driver, item) and returning a result.
+            items (list): Tasks to process, each is passed to work_fn as-is.
+            url_of (callable): Returns the URL an item will load (used for the per-site cap).
+        Returns:
+            results (list): One entry per item, in the same order as items. Tasks which raised hold the exception instead.
+        """
+        tasks = queue.Queue()
+        for index, item in enumerate(items):
+            tasks.put((index, item))
+        results = [None] * len(items)
+
+        def worker(worker_id):
+            session = self.sessions[worker_id]
+            try:
+                while not tasks.empty():
+                    driver = session.driver # Launching (or relaunching a crashed) browser before taking a task
+                    try:
+                        index, item = tasks.get_nowait()
+                    except queue.Empty:
+                        break # No work left for this worker
+                    with self._site_slot(url_of(item)):
+                        try:
+                            results[index] = work_fn(driver, item)
+                        except Exception as e:
+                            print(f"❌ Worker {worker_id} failed on task {index}: {e}")
+                            results[index] = e
+            except Exception as e:
+                print(f"❌ Worker {worker_id} stopped: {e}") # Remaining tasks are left for the other workers
+
+        # Only start as many workers as there are tasks
+        threads = [
+            threading.Thread(target=worker, args=(worker_id,), daemon=True)
+            for worker_id in range(min(self.workers, len(items)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Tasks left in the queue (e.g. every worker failed to launch Chrome) are reported as errors
+        while not tasks.empty():
+            index, _ = tasks.get_nowait()
+            results[index] = RuntimeError("Task was never picked up by a worker")
+        return results
@@ -1,11 +1,16 @@
 # Standard libraries
+import json
+import os
 import time
 from contextlib import contextmanager
+from pathlib import Path
 import platform
 import shutil
+import socket
 
 # Third-party libraries
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -14,26 +19,145 @@ from selenium.webdriver.support.ui import Select, WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
 
-def init_driver(headless=True):
+# Local imports
+from .tracing import phase, traced
+
+# Where the resolved chromedriver path is remembered between runs (see resolve_driver_path)
+DRIVER_CACHE = Path.home() / ".cache" / "life-insurance-scraper" / "chromedriver.json"
+
+# Lean-browsing profile (see init_driver): the scrapers only need form fields and price text
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m3u8"],
+}
+LEAN_BLOCKED_TYPES = ("image", "font", "media")
+# Third-party analytics, ads and chat widgets
+LEAN_BLOCKED_URLS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*bing.com/bat*",
+    "*intercom.io*", "*intercomcdn.com*", "*zopim.com*", "*zendesk.com*", "*livechatinc.com*", "*tawk.to*",
+    "*trustpilot.com*", "*tiktok.com*", "*linkedin.com/px*", "*snap.licdn.com*",
+)
+
+# Wait settings (see configure_waits), all in seconds
+MIN_SETTLE = 0.1     # Minimum time to let the page settle once a wait condition is met
+POLL_INTERVAL = 0.05 # How often wait conditions are re-checked
+IDLE_QUIET = 0.25    # How long the DOM and network must stay quiet for the page to count as idle
+IDLE_TIMEOUT = 3     # Upper bound on idle waits, so constantly animating pages don't stall scraping
+
+# Installs (once per page) a watcher counting in-flight fetch/XHR requests and timing the last DOM change,
+# then reports whether the page has been quiet for at least arguments[0] milliseconds
+_IDLE_SCRIPT = """
+const quietMs = arguments[0];
+let watch = window.__scrapeWatch;
+if (!watch) {
+    watch = window.__scrapeWatch = {pending: 0, last: performance.now()};
+    const touch = () => { watch.last = performance.now(); };
+    new MutationObserver(touch).observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function (...args) {
+            watch.pending++; touch();
+            return fetch.apply(this, args).finally(() => { watch.pending--; touch(); });
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        watch.pending++; touch();
+        this.addEventListener("loadend", () => { watch.pending--; touch(); }, {once: true});
+        return send.apply(this, args);
+    };
+    return false;
+}
+return document.readyState !== "loading" && watch.pending <= 0 && performance.now() - watch.last >= quietMs;
+"""
+
+# Sums the navigation and resource timing entries of the current page
+_PAGE_METRICS_SCRIPT = """
+const [nav] = performance.getEntriesByType("navigation");
+const resources = performance.getEntriesByType("resource");
+return {
+    bytes: (nav ? nav.transferSize : 0) + resources.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    requests: resources.length + (nav ? 1 : 0),
+    interactive_ms: nav && nav.domInteractive ? nav.domInteractive : null,
+    loaded_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+};
+"""
+
+def detect_chrome_type():
+    """Returns the webdriver_manager ChromeType of the installed browser (Google Chrome or Chromium)."""
+    if shutil.which("google-chrome") or shutil.which("chrome"):
+        return ChromeType.GOOGLE
+    elif shutil.which("chrome.exe"):  # Detect Windows Chrome from WSL
+        return ChromeType.GOOGLE
+    elif shutil.which("chromium-browser") or shutil.which("chromium"):
+        return ChromeType.CHROMIUM
+    raise RuntimeError(
+        "Neither Google Chrome nor Chromium is installed on this system."
+    )
+
+
+def resolve_driver_path(refresh=False):
+    """Returns the chromedriver executable to use, resolving it with webdriver_manager only when not already cached.
+
+    The resolved path is saved to DRIVER_CACHE, so later launches skip the browser probing and webdriver_manager's
+    network version check (and work offline). Setting the CHROMEDRIVER_PATH environment variable bypasses both.
+
+    Args:
+        refresh (bool): If True, ignores the cache and resolves (downloading if needed) the driver again.
+    Returns:
+        driver_path (str): Path of the chromedriver executable.
+        cached (bool): Whether the path came from the cache (or CHROMEDRIVER_PATH) rather than a fresh resolve.
+    """
+    if os.environ.get("CHROMEDRIVER_PATH"):
+        return os.environ["CHROMEDRIVER_PATH"], True
+
+    if not refresh:
+        try:
+            cache = json.loads(DRIVER_CACHE.read_text())
+            if os.access(cache["path"], os.X_OK):
+                return cache["path"], True
+        except (OSError, ValueError, KeyError):
+            pass # No usable cache, resolving below
+
+    chrome_type = detect_chrome_type()
+    # Automatically downloads the matching Chromium driver (browser must be installed separately)
+    driver_path = ChromeDriverManager(chrome_type=chrome_type).install()
+    try:
+        DRIVER_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        DRIVER_CACHE.write_text(json.dumps({"chrome_type": chrome_type, "path": driver_path}))
+    except OSError:
+        pass # Read-only home, the driver is simply resolved again next time
+    return driver_path, False
+
+
+def free_port():
+    """Returns a TCP port nothing is listening on right now, as picked by the OS."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def init_driver(headless=True, debugging_port=None, profile_dir=None, lean=False,
+                blocked_types=LEAN_BLOCKED_TYPES, blocked_urls=LEAN_BLOCKED_URLS, network_log=False):
     """Initializes and returns a headless Chrome WebDriver instance.
     
     Args:
         headless (bool): If True (default), launches Chrome w/no GUI.
+        debugging_port (int): Remote debugging port, must be unique per running instance. If None, a free port is
+            picked, so instances in separate processes (e.g. work queue workers on one host) never collide.
+        profile_dir (str): Optional user data directory, so that parallel instances don't share a profile.
+        lean (bool): If True, uses the lean-browsing profile: the "eager" page load strategy (driver.get returns
+            once the DOM is interactive) and DevTools blocking of blocked_types and blocked_urls.
+        blocked_types (iterable): Lean profile only, resource types to block (keys of RESOURCE_TYPE_PATTERNS).
+        blocked_urls (iterable): Lean profile only, extra URL patterns to block ("*" wildcards).
+        network_log (bool): If True, DevTools network events are recorded to the "performance" log (read by
+            utils.network_capture.QuoteCapture).
     Returns:
         webdriver.Chrome: Configured WebDriver instance.
     """
-
-        # Detect whether Chrome or Chromium is available
-    if shutil.which("google-chrome") or shutil.which("chrome"):
-        chrome_type = ChromeType.GOOGLE
-    elif shutil.which("chrome.exe"):  # Detect Windows Chrome from WSL
-        chrome_type = ChromeType.GOOGLE
-    elif shutil.which("chromium-browser") or shutil.which("chromium"):
-        chrome_type = ChromeType.CHROMIUM
-    else:
-        raise RuntimeError(
-            "Neither Google Chrome nor Chromium is installed on this system."
-        )
+    started = time.perf_counter()
 
     # Set up browser options
     options = Options()
@@ -45,14 +169,112 @@ def init_driver(headless=True):
     options.add_argument("--disable-gpu")  
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--remote-debugging-port=9222")
+    options.add_argument(f"--remote-debugging-port={debugging_port or free_port()}")
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    if lean:
+        options.page_load_strategy = "eager" # Don't wait for images, iframes etc. to finish loading
+        if "image" in blocked_types:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if network_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    def launch(driver_path):
+        service = Service(driver_path, log_path="NUL" if platform.system() == "Windows" else "/dev/null")
+        return webdriver.Chrome(service=service, options=options)
+
+    driver_path, cached = resolve_driver_path()
+    try:
+        driver = launch(driver_path)
+    except SessionNotCreatedException:
+        if not cached:
+            raise
+        # Cached driver no longer matches the installed browser (e.g. Chrome updated itself), so resolving it again
+        driver_path, cached = resolve_driver_path(refresh=True)
+        driver = launch(driver_path)
+    if lean:
+        # Blocking in the browser's network stack, so blocked requests are never sent (applies to every page of the tab)
+        patterns = [pattern for kind in blocked_types for pattern in RESOURCE_TYPE_PATTERNS[kind]] + list(blocked_urls)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    print(f"🚀 Chrome started in {time.perf_counter() - started:.2f}s ({'cached' if cached else 'freshly resolved'} driver)")
+    return driver
+
+def page_metrics(driver):
+    """Reads the current page's transfer size and load timings from the browser's Performance API.
+
+    Returns:
+        metrics (dict): 'bytes' transferred (document plus every resource), 'requests' made, and 'interactive_ms' /
+            'loaded_ms' (time from navigation start to DOM interactive / the load event, None if not reached yet).
+            Cross-origin resources not sending Timing-Allow-Origin count as 0 bytes.
+    """
+    return driver.execute_script(_PAGE_METRICS_SCRIPT)
+
+
+def configure_waits(min_settle=None, poll_interval=None, idle_quiet=None):
+    """Overrides the module-wide wait settings used by every helper below.
+
+    Args:
+        min_settle (float): Minimum settle time after a wait condition is met.
+        poll_interval (float): Time between condition checks.
+        idle_quiet (float): Quiet period required for the page to count as idle.
+    """
+    global MIN_SETTLE, POLL_INTERVAL, IDLE_QUIET
+    if min_settle is not None:
+        MIN_SETTLE = min_settle
+    if poll_interval is not None:
+        POLL_INTERVAL = poll_interval
+    if idle_quiet is not None:
+        IDLE_QUIET = idle_quiet
+
+
+def wait_until(driver, condition, timeout=20, settle=None):
+    """Polls a condition until it holds, then waits the minimum settle time.
+
+    Args:
+        condition (callable): Takes the driver and returns a truthy value once satisfied (e.g. selenium expected_conditions).
+        timeout (float): Maximum seconds to wait before raising TimeoutException.
+        settle (float): Settle time once satisfied, defaults to MIN_SETTLE.
+    Returns:
+        The condition's truthy return value (e.g. the located element).
+    """
+    result = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+    settle = MIN_SETTLE if settle is None else settle
+    if settle > 0:
+        time.sleep(settle)
+    return result
+
+
+def page_idle(quiet=None):
+    """Condition which holds once there are no requests in flight and the DOM has stopped changing for `quiet` seconds."""
+    def condition(driver):
+        return driver.execute_script(_IDLE_SCRIPT, (IDLE_QUIET if quiet is None else quiet) * 1000)
+    return condition
+
+
+def option_applied(field_name, value, by_visible_text=False):
+    """Condition which holds once the dropdown named `field_name` shows `value` as its selected option."""
+    def condition(driver):
+        selected = Select(driver.find_element(By.NAME, field_name)).first_selected_option
+        current = selected.text if by_visible_text else selected.get_attribute("value")
+        return current.strip() == str(value).strip()
+    return condition
+
+
+def wait_for_idle(driver, quiet=None, timeout=IDLE_TIMEOUT):
+    """Best-effort wait for the page to go idle (results re-rendered), returning quietly after `timeout` seconds."""
+    try:
+        wait_until(driver, page_idle(quiet), timeout=timeout, settle=0)
+    except TimeoutException:
+        pass # Page keeps changing (e.g. animations), carry on rather than fail the combo
+
+
+@traced("get")
+def load_page(driver, url):
+    """Navigates to url, traced as the "get" phase (see utils.tracing)."""
+    driver.get(url)
 
-    # Automatically downloads the matching Chromium driver (browser must be installed separately)
-    service = Service(
-        ChromeDriverManager(chrome_type=chrome_type).install(),
-        log_path="NUL" if platform.system() == "Windows" else "/dev/null"
-    )
-    return webdriver.Chrome(service=service, options=options)
 
 @contextmanager
 def edit_page_context(driver, edit_node, edit_text, btn_node):
@@ -63,24 +285,30 @@ def edit_page_context(driver, edit_node, edit_text, btn_node):
         edit_text (str): Visible text of the "Edit" button.
         btn_node (str): Node of the update button.
     """
-    try:
-        # Scroll to top
-        driver.execute_script("window.scrollTo(0, 0);")
-        
-        # Open the edit page
-        driver.find_element(By.XPATH, f"//{edit_node}[contains(text(), '{edit_text}')]").click()
-        time.sleep(1)  # Give time for the edit page to load
-        
-        # Yield control back to the user to interact with the page
-        yield driver
-
-    finally:
-        # Waits up to 20 seconds until the "Update Quote Details" button is clickable, then clicks it
-        update_btn = WebDriverWait(driver, 20).until(
-            EC.element_to_be_clickable((By.XPATH, f"//{btn_node}[@type='submit']")) 
-        )
-        update_btn.click()
-        time.sleep(1)
+    update_xpath = f"//{btn_node}[@type='submit']"
+    # The whole round trip (open, edit, submit, wait for the page to settle) is traced as the "edit" phase
+    with phase("edit"):
+        try:
+            # Scroll to top
+            driver.execute_script("window.scrollTo(0, 0);")
+            
+            # Open the edit page, then wait until its update button can be clicked (i.e. the edit page has loaded)
+            driver.find_element(By.XPATH, f"//{edit_node}[contains(text(), '{edit_text}')]").click()
+            wait_until(driver, EC.element_to_be_clickable((By.XPATH, update_xpath)))
+            
+            # Yield control back to the user to interact with the page
+            yield driver
+
+        finally:
+            # Waits up to 20 seconds until the "Update Quote Details" button is clickable, then clicks it
+            update_btn = wait_until(driver, EC.element_to_be_clickable((By.XPATH, update_xpath)), settle=0)
+            update_btn.click()
+            # Edit page closes (button hidden or removed) once the update has been submitted
+            try:
+                wait_until(driver, EC.invisibility_of_element(update_btn), timeout=IDLE_TIMEOUT, settle=0)
+            except TimeoutException:
+                pass # Some pages keep the button in place, the idle wait below covers them
+            wait_for_idle(driver)
         
         
 def select_dropdown(driver, field_name, value, by_visible_text=False):
@@ -92,8 +320,8 @@ def select_dropdown(driver, field_name, value, by_visible_text=False):
         by_visible_text (bool): Whether to select by visible text (True) or value attribute (False).
     """
     try:
-        # Locate the dropdown element by its name attribute
-        dropdown_element = driver.find_element(By.NAME, field_name)
+        # Locate the dropdown element by its name attribute (waiting for it to be shown, as forms reveal fields progressively)
+        dropdown_element = wait_until(driver, EC.visibility_of_element_located((By.NAME, field_name)), settle=0)
         dropdown_selector = Select(dropdown_element)
         
         # Scroll to element
@@ -103,7 +331,9 @@ def select_dropdown(driver, field_name, value, by_visible_text=False):
             dropdown_selector.select_by_visible_text(str(value))   # Select by text users see
         else:
             dropdown_selector.select_by_value(str(value))           # Select by HTML value attribute
-        time.sleep(0.5)
+        # Wait until the value has been applied (and any request it triggered has finished)
+        wait_until(driver, option_applied(field_name, value, by_visible_text), settle=0)
+        wait_for_idle(driver)
     except Exception as e:
         print(f"Could not select '{value}' for '{field_name}': {e}") # Raising selection error
         raise
@@ -118,9 +348,10 @@ def select_checkbox(driver, xpath):
     """
     try:
         # Look for any clickable element with the target text
-        element = driver.find_element(By.XPATH, xpath)   
+        element = wait_until(driver, EC.element_to_be_clickable((By.XPATH, xpath)), settle=0)
         if not element.is_selected():
             element.click()
+            wait_for_idle(driver)
     except Exception as e:
         print(f"Failed to select checkbox option: {e}")
         raise
@@ -136,12 +367,9 @@ def text_input(driver, field_name, value, by_xpath=False):
     """
     
     try:
-        # Locating the input element by xpath
-        if by_xpath == True:
-            input_element = driver.find_element(By.XPATH, field_name)
-        else:
-            # Locating the input element using its name attribute
-            input_element = driver.find_element(By.NAME, field_name)
+        # Locating the input element by xpath or using its name attribute, once it is shown
+        locator = (By.XPATH, field_name) if by_xpath else (By.NAME, field_name)
+        input_element = wait_until(driver, EC.visibility_of_element_located(locator), settle=0)
 
         # Clearing existing text
         input_element.clear()
@@ -153,21 +381,15 @@ def text_input(driver, field_name, value, by_xpath=False):
         raise
     
 
+@traced("ready")
 def ensure_page_ready(driver, xpath):
-    """Waits unti the loader disappears and page is interactable
+    """Waits until the loader disappears and the page has stopped re-rendering.
 
     Args:
-        driver (_type_): _description_
-        xpath (_type_): _description_
+        driver: Selenium WebDriver instance.
+        xpath (str): CSS selector of the loader element.
     """
-    WebDriverWait(driver, 20).until(
-        EC.invisibility_of_element_located((By.CSS_SELECTOR, xpath))
-    )
-    time.sleep(0.5)
-    
-                
-        
-        
-    
-
-
+    wait_until(driver, EC.invisibility_of_element_located((By.CSS_SELECTOR, xpath)), settle=0)
+    wait_for_idle(driver)
+    if MIN_SETTLE > 0:
+        time.sleep(MIN_SETTLE)
\ No newline at end of file
@@ -0,0 +1,131 @@
+# Standard libraries
+import hashlib
+import json
+import threading
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+# Third-party libraries
+import urllib3
+
+MAX_REDIRECTS = 5 # Redirects followed per request
+
+def exchange_key(method, path, body=b""):
+    """Returns the fixture name for a request, shared by HttpSession (recording) and ReplayServer (replaying).
+
+    Args:
+        method (str): HTTP method, e.g. "POST".
+        path (str): Request path including any query string.
+        body (bytes): Raw request body.
+    """
+    digest = hashlib.sha1(method.upper().encode() + b" " + path.encode() + b"\n" + (body or b"")).hexdigest()
+    return f"{method.upper()}-{digest[:16]}"
+
+
+class HttpStatusError(RuntimeError):
+    """Raised by HttpSession.request_json for non-2xx responses, keeping the status for retry classification."""
+
+    def __init__(self, method, url, status):
+        super().__init__(f"{method} {url} returned HTTP {status}")
+        self.status = status
+
+
+class HttpSession:
+    """Pooled keep-alive HTTP session with cookie jars, for talking to quote sites without a browser.
+
+    Connections are reused across requests (and threads), and each exchange can be recorded to a fixtures
+    directory so a ReplayServer can serve it back later. Cookies are kept in a separate jar per host, or per
+    quote session when requests pass their own jar name, so threads scraping different quotes don't mix them.
+    """
+
+    def __init__(self, base_url=None, maxsize=4, timeout=20, record_dir=None, headers=None):
+        """
+        Args:
+            base_url (str): If set, every request's scheme and host are swapped for this one (e.g. a local ReplayServer).
+            maxsize (int): Connections kept open per host, should match the number of threads using the session.
+            timeout (float): Connect/read timeout in seconds.
+            record_dir (str | Path): If set, each response is saved there as a JSON fixture.
+            headers (dict): Extra headers sent with every request.
+        """
+        self.base_url = base_url
+        self.record_dir = Path(record_dir) if record_dir else None
+        if self.record_dir:
+            self.record_dir.mkdir(parents=True, exist_ok=True)
+        self.headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json, text/html;q=0.9", **(headers or {})}
+        self.cookies = {} # Jar name -> {cookie name: value}
+        self._cookies_lock = threading.Lock()
+        # Redirects are followed in request(), so every hop's cookies are stored and recorded
+        self._pool = urllib3.PoolManager(maxsize=maxsize, block=True, timeout=urllib3.Timeout(total=timeout), retries=False)
+
+    def _resolve(self, url):
+        # Redirecting the request to base_url (keeping path and query) when one is set
+        if not self.base_url:
+            return url
+        parts, base = urlsplit(url), urlsplit(self.base_url)
+        return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, ""))
+
+    def request(self, method, url, json_body=None, jar=None, follow_redirects=True):
+        """Sends a request, following redirects and storing any cookies set by the responses.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Absolute URL.
+            json_body: Optional JSON-serialisable body.
+            jar (str): Name of the cookie jar to use (e.g. the quote page's URL), defaults to the URL's host.
+            follow_redirects (bool): If False, a 3xx response is returned as it is (e.g. to detect moved pages).
+        Returns:
+            response (urllib3.BaseHTTPResponse): Final response with its body already read.
+        """
+        jar = jar or urlsplit(url).netloc
+        body = json.dumps(json_body, sort_keys=True).encode() if json_body is not None else None
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, body, jar)
+            location = response.get_redirect_location()
+            if not location or not follow_redirects:
+                break
+            # Same method changes as a browser: a 303 (or a 301/302 after a POST) is followed with a bodyless GET
+            if response.status == 303 or (response.status in (301, 302) and method.upper() == "POST"):
+                method, body = "GET", None
+            url = urljoin(url, location)
+        return response
+
+    def _send(self, method, url, body, jar):
+        # One exchange, without following redirects
+        headers = dict(self.headers)
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        with self._cookies_lock:
+            cookies = dict(self.cookies.get(jar, {}))
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+        response = self._pool.request(method, self._resolve(url), body=body, headers=headers, redirect=False)
+        set_cookies = {}
+        for cookie in response.headers.getlist("Set-Cookie"):
+            set_cookies.update({name: morsel.value for name, morsel in SimpleCookie(cookie).items()})
+        if set_cookies:
+            with self._cookies_lock:
+                self.cookies.setdefault(jar, {}).update(set_cookies)
+
+        if self.record_dir:
+            parts = urlsplit(url)
+            path = parts.path + (f"?{parts.query}" if parts.query else "")
+            fixture = {
+                "method": method.upper(),
+                "path": path,
+                "status": response.status,
+                "content_type": response.headers.get("Content-Type", ""),
+                "location": response.headers.get("Location"),
+                "body": response.data.decode("utf-8", errors="replace"),
+            }
+            fixture_path = self.record_dir / f"{exchange_key(method, path, body)}.json"
+            fixture_path.write_text(json.dumps(fixture, indent=2), encoding="utf-8")
+        return response
+
+    def request_json(self, method, url, json_body=None, jar=None):
+        """Sends a request and decodes its JSON response, raising for non-2xx statuses."""
+        response = self.request(method, url, json_body, jar=jar)
+        if not 200 <= response.status < 300:
+            raise HttpStatusError(method, url, response.status)
+        return json.loads(response.data)
@@ -0,0 +1,67 @@
+# Standard libraries
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Request handler of a LocalServer: keep-alive, quiet, with helpers sending a whole response at once."""
+
+    protocol_version = "HTTP/1.1" # Keep-alive, so clients don't reconnect per request (like the real sites)
+    disable_nagle_algorithm = True # Headers and body go out as separate writes
+
+    def _body(self):
+        """Reads the raw request body."""
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status, content_type, data, headers=None):
+        """Sends a response with data (bytes) as its body, plus any extra headers."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _reply(self, status, payload):
+        """Sends payload as a JSON response."""
+        self._send(status, "application/json", json.dumps(payload).encode("utf-8"))
+
+    def log_message(self, *args):
+        pass # Logging every request would drown the caller's output and dominate latency
+
+
+class LocalServer:
+    """Threaded HTTP server run in the background. Use as a context manager, then send requests to `server.url`.
+
+    Subclasses implement _handler(), returning their LocalHandler subclass (usually a closure over the server).
+    Only the standard library is used, so the module can be loaded on its own (see analysis.serving).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        """
+        Args:
+            host (str): Address to listen on.
+            port (int): Port to listen on, 0 picks a free one.
+        """
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
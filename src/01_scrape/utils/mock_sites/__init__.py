@@ -0,0 +1,112 @@
+# Standard libraries
+import json
+import math
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+# Local imports
+from ..local_server import LocalHandler, LocalServer
+
+PAGES_DIR = Path(__file__).resolve().parent
+
+# Mock insurers and their price multipliers (Drewberry is UK, lifeinsure is US)
+UK_PROVIDERS = [("Aviva", 1.00), ("Legal & General", 1.04), ("Royal London", 0.97), ("Zurich", 1.08),
+                ("Vitality", 1.12), ("AIG Life", 0.95), ("Scottish Widows", 1.02), ("LV=", 1.06)]
+US_CARRIERS = [("Banner Life", 1.00), ("Protective", 0.98), ("Prudential", 1.07), ("Lincoln Financial", 1.03),
+               ("Pacific Life", 1.05), ("Corebridge", 0.96), ("Transamerica", 1.10), ("John Hancock", 1.01)]
+
+
+def mock_premium(coverage, term, age, gender, smoker, multiplier):
+    """Deterministic monthly premium, increasing smoothly with age, coverage and term like the real quotes.
+
+    Returns:
+        premium (float | None): Monthly premium, or None when the policy would run past age 90 (no quote offered).
+    """
+    if age + term > 90:
+        return None
+    rate = 0.04 * math.exp(0.085 * (age - 20)) * (1 + term / 40)   # Yearly cost per 1,000 of cover
+    rate *= (1.25 if gender == "Male" else 1.0) * (2.5 if smoker else 1.0)
+    return round(coverage / 1000 * rate / 12 * multiplier + 4, 2)
+
+
+class MockSites(LocalServer):
+    """Local replica of the Drewberry get-quote pages and the lifeinsure quoter, for offline scraper runs.
+
+    Serves pages reproducing the DOM hooks the scrapers rely on, plus the JSON APIs those pages (and the
+    Drewberry HTTP engine) call, with a configurable delay so loaders stay visible like on the real sites.
+    The Drewberry API follows the HTTP engine's assumed schema, so runs against it don't verify that schema.
+    Use as a context manager.
+    """
+
+    def __init__(self, latency=0.3, port=0):
+        """
+        Args:
+            latency (float): Seconds each quote API call takes (i.e. how long loaders are shown).
+            port (int): Port to listen on, 0 picks a free one.
+        """
+        self.latency = latency
+        super().__init__(port=port)
+
+    def drewberry_url(self, age, gender, nic):
+        """URL of the mock get-quote page for a risk profile (the equivalent of a drewberry_urls.csv row)."""
+        return f"{self.url}/my/get-quote/{quote(f'{age}_{gender}_{nic}')}"
+
+    def lifeinsure_url(self):
+        """URL of the mock quoter's initial form."""
+        return f"{self.url}/quote/no-exam"
+
+    def drewberry_quotes(self, quote_id, cover, term):
+        age, gender, nic = unquote(quote_id).split("_", 2)
+        quotes = []
+        for provider, multiplier in UK_PROVIDERS:
+            premium = mock_premium(cover, term, int(age), gender, nic == "Smoker", multiplier)
+            if premium is None:
+                continue
+            # Each insurer offers life-only cover and pricier life + critical illness cover (filtered out by the scrapers)
+            quotes.append({"providerName": provider, "productName": "Level Term Life", "coverType": "life-only",
+                           "monthlyPremium": premium})
+            quotes.append({"providerName": provider, "productName": "Level Term Life & CI", "coverType": "life-ci",
+                           "monthlyPremium": round(premium * 2.8, 2)})
+        return {"quotes": sorted(quotes, key=lambda quote: quote["monthlyPremium"])}
+
+    def lifeinsure_rows(self, coverage, term, age, gender, tobacco):
+        rows = []
+        for carrier, multiplier in US_CARRIERS:
+            premium = mock_premium(coverage, term, age, gender, tobacco == "Current user", multiplier * 1.3)
+            if premium is not None:
+                rows.append({"company_name": carrier, "product_name": f"{carrier} Term {term}", "premium": premium})
+        return {"rows": sorted(rows, key=lambda row: row["premium"])}
+
+    def _handler(self):
+        sites = self
+
+        class Handler(LocalHandler):
+            def _send_json(self, payload):
+                time.sleep(sites.latency) # Simulated quote engine latency
+                self._reply(200, payload)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path.startswith("/my/get-quote/"):
+                    self._send(200, "text/html; charset=utf-8", (PAGES_DIR / "drewberry.html").read_bytes())
+                elif parts.path == "/quote/no-exam":
+                    self._send(200, "text/html; charset=utf-8", (PAGES_DIR / "lifeinsure.html").read_bytes())
+                elif parts.path == "/quote/api/quotes":
+                    query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                    self._send_json(sites.lifeinsure_rows(
+                        int(query["coverage"]), int(query["term"]), int(query["age"]), query["gender"], query["tobacco"]
+                    ))
+                else:
+                    self._send(404, "text/plain", b"Not found")
+
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                body = json.loads(self._body() or b"{}")
+                if parts.path.startswith("/my/api/get-quote/"):
+                    quote_id = parts.path.rstrip("/").rsplit("/", 1)[-1]
+                    self._send_json(sites.drewberry_quotes(quote_id, int(body["initialLifeCover"]), int(body["TermYears"])))
+                else:
+                    self._send(404, "text/plain", b"Not found")
+
+        return Handler
@@ -0,0 +1,20 @@
+# Display symbol of each scraped currency
+CURRENCY_SYMBOLS = {"GBP": "£", "USD": "$"}
+
+
+def to_minor_units(text):
+    """Parses a displayed price (e.g. "£1,234.50" or "$21.67") into integer minor units (pence/cents).
+
+    Returns:
+        minor (int | None): Price in minor units, or None if the text holds no number.
+    """
+    digits = "".join(char for char in str(text) if char.isdigit() or char == ".")
+    if not digits:
+        return None
+    whole, _, fraction = digits.partition(".")
+    return int(whole or 0) * 100 + int((fraction + "00")[:2])
+
+
+def format_minor_units(minor, symbol):
+    """Formats integer minor units the way the quote sites display them (e.g. 123450, "£" → "£1,234.50")."""
+    return f"{symbol}{minor // 100:,}.{minor % 100:02d}"
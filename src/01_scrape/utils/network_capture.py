@@ -0,0 +1,130 @@
+# Standard libraries
+import base64
+import json
+import re
+
+# Local imports
+from .driver_utils import wait_until
+from .money import to_minor_units
+
+# Row fields of a quote payload, matched by substring since only the mock site's payload is known exactly
+PROVIDER_KEYS = ("company", "carrier", "provider")
+PRODUCT_KEYS = ("product",)
+PREMIUM_KEYS = ("premium", "price")
+
+
+def find_rows(payload):
+    """Finds the list of quote rows in a decoded JSON payload (e.g. {"rows": [...]}), searching nested dicts.
+
+    Returns:
+        rows (list | None): First list of dicts having a premium field, or None if the payload holds none.
+    """
+    if isinstance(payload, list):
+        if payload and all(isinstance(row, dict) for row in payload) and field(payload[0], PREMIUM_KEYS) is not None:
+            return payload
+        return [] if not payload else None
+    if isinstance(payload, dict):
+        # Preferring the "rows" key the results template iterates over (x-for="row in rows")
+        for value in sorted(payload.values(), key=lambda value: value is not payload.get("rows")):
+            rows = find_rows(value) if isinstance(value, (list, dict)) else None
+            if rows is not None:
+                return rows
+    return None
+
+
+def field(row, keys):
+    """Value of the first of row's keys containing one of keys (case-insensitive), or None."""
+    for key, value in row.items():
+        if any(name in key.lower() for name in keys):
+            return value
+    return None
+
+
+def parse_quote_rows(payload):
+    """Turns a quote API payload into quote dicts, like the ones the DOM extraction returns.
+
+    Returns:
+        quotes (list | None): Dicts with 'provider', 'product' and 'premium_minor' (premium in minor units) for every
+            row of the payload, collapsed ones included, or None if the payload isn't a quote payload.
+    """
+    rows = find_rows(payload)
+    if rows is None:
+        return None
+    quotes = []
+    for row in rows:
+        premium_minor = to_minor_units(field(row, PREMIUM_KEYS))
+        if premium_minor is None:
+            continue
+        quotes.append({"provider": field(row, PROVIDER_KEYS), "product": field(row, PRODUCT_KEYS), "premium_minor": premium_minor})
+    return quotes
+
+
+class QuoteCapture:
+    """Reads quote API responses from Chrome's DevTools network log, as soon as they arrive.
+
+    Needs a driver launched with network_log=True (see init_driver). Every XHR/fetch response whose URL matches
+    url_pattern is decoded and kept if it holds quote rows, so the results can be read without waiting for the page
+    to render them (or for collapsed rows to be expanded).
+    """
+
+    def __init__(self, driver, url_pattern):
+        """
+        Args:
+            driver (webdriver.Chrome): Driver with the performance log enabled.
+            url_pattern (str): Regex matched against request URLs to pick out the quote API calls.
+        """
+        self.driver = driver
+        self.pattern = re.compile(url_pattern)
+        self.pending = {} # Request id -> sequence number of quote requests still loading
+        self.sent = 0     # Quote requests sent so far
+        self.latest = None   # Quotes of the most recently sent request which has finished
+        self.latest_seq = 0  # Its sequence number
+        self.poll() # Dropping entries logged before the capture started
+
+    def poll(self):
+        """Processes the network log entries logged since the last poll."""
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method, params = message["method"], message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                if params.get("type") in ("XHR", "Fetch") and self.pattern.search(params["request"]["url"]):
+                    self.sent += 1
+                    self.pending[params["requestId"]] = self.sent
+            elif method == "Network.loadingFinished" and params["requestId"] in self.pending:
+                seq = self.pending.pop(params["requestId"])
+                quotes = self._read_body(params["requestId"])
+                # Overlapping requests (e.g. coverage then term changed) can finish out of order, the last one sent wins
+                if quotes is not None and seq > self.latest_seq:
+                    self.latest, self.latest_seq = quotes, seq
+            elif method == "Network.loadingFailed":
+                self.pending.pop(params["requestId"], None)
+
+    def _read_body(self, request_id):
+        try:
+            response = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            body = base64.b64decode(response["body"]) if response.get("base64Encoded") else response["body"]
+            return parse_quote_rows(json.loads(body))
+        except Exception:
+            return None # Body evicted or not JSON, the page's own rendering is still there to fall back on
+
+    @property
+    def current(self):
+        """Quotes of the last quote request sent, or None if it failed or didn't return a recognisable quote payload."""
+        return self.latest if self.latest_seq == self.sent else None
+
+    def mark(self):
+        """Returns the number of quote requests sent so far, to wait for the responses of the requests after it."""
+        self.poll()
+        return self.sent
+
+    def wait(self, since, timeout=30):
+        """Waits until a quote request sent after mark() returned since has finished and none is still loading.
+
+        Returns:
+            quotes (list | None): The current quotes (see current).
+        """
+        def arrived(driver):
+            self.poll()
+            return self.sent > since and not self.pending
+        wait_until(self.driver, arrived, timeout=timeout, settle=0)
+        return self.current
@@ -0,0 +1,104 @@
+# Standard libraries
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Third-party libraries
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Typed schema of the scraped quotes dataset (site and scrape_date are the partition keys)
+QUOTE_SCHEMA = pa.schema([
+    ("site", pa.string()),
+    ("scrape_date", pa.date32()),
+    ("coverage", pa.int64()),
+    ("term", pa.int16()),
+    ("age", pa.int16()),
+    ("gender", pa.dictionary(pa.int8(), pa.string())),
+    ("smoker_status", pa.dictionary(pa.int8(), pa.string())),
+    ("premium_minor", pa.int64()),          # Monthly premium in pence/cents
+    ("currency", pa.dictionary(pa.int8(), pa.string())),
+    ("provider", pa.string()),
+    ("product", pa.string()),
+    ("scraped_at", pa.timestamp("s", tz="UTC")),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([("site", pa.string()), ("scrape_date", pa.date32())]), flavor="hive"
+)
+
+# Each site's nicotine answers (lowercased, as the sites differ in case, e.g. Drewberry's "Non-Smoker"), normalised to one smoker status
+SMOKER_STATUS = {"smoker": "Smoker", "current user": "Smoker", "non-smoker": "Non-smoker", "never used": "Non-smoker"}
+
+
+def to_record(site, coverage, term, age, gender, nic, premium_minor, currency, provider, product, scraped_at):
+    """Converts one checkpoint row (string combo fields) into a typed QUOTE_SCHEMA record.
+
+    Terms like "10 Year Term" become 10, and each site's nicotine answer is normalised via SMOKER_STATUS.
+    """
+    scraped_at = datetime.fromisoformat(scraped_at)
+    return {
+        "site": site,
+        "scrape_date": scraped_at.date(),
+        "coverage": int(coverage),
+        "term": int(str(term).split()[0]),
+        "age": int(age),
+        "gender": gender,
+        "smoker_status": SMOKER_STATUS.get(str(nic).lower(), nic),
+        "premium_minor": premium_minor,
+        "currency": currency,
+        "provider": provider,
+        "product": product,
+        "scraped_at": scraped_at,
+    }
+
+
+def write_quote_dataset(batches, dataset_dir, site):
+    """Writes typed quote records to a Parquet dataset partitioned by site and scrape date.
+
+    The site's earlier export is replaced as a whole, since quotes can move to another scrape date between exports
+    (e.g. when a refresh re-scrapes them, see Checkpoint.replace). Other sites' partitions are left untouched.
+
+    Args:
+        batches (iterable): Lists of records (see to_record), streamed so memory stays bounded.
+        dataset_dir (str | Path): Root directory of the dataset.
+        site (str): Site the records come from, used to name the written files.
+    Returns:
+        rows (int): Number of records written.
+    """
+    rows = 0
+    shutil.rmtree(Path(dataset_dir) / f"site={site}", ignore_errors=True)
+
+    def tables():
+        nonlocal rows
+        for batch in batches:
+            rows += len(batch)
+            yield from pa.Table.from_pylist(batch, schema=QUOTE_SCHEMA).to_batches()
+
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(QUOTE_SCHEMA, tables()),
+        dataset_dir,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"{site}-{{i}}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+    return rows
+
+
+def read_quotes(dataset_dir, columns=None, filter=None):
+    """Loads the quotes dataset into a DataFrame, reading only the requested columns and matching partitions.
+
+    Args:
+        dataset_dir (str | Path): Root directory of the dataset.
+        columns (list): Columns to read (all if None).
+        filter (pyarrow.compute.Expression): Row filter, e.g. `pc.field("site") == "drewberry"`.
+    Returns:
+        quotes (pandas.DataFrame): Typed quotes (dictionary columns come back as categoricals).
+    """
+    dataset = ds.dataset(dataset_dir, format="parquet", partitioning=PARTITIONING)
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+
+def utc_now():
+    """Current time as an ISO 8601 UTC string, the scraped_at format stored in checkpoints."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,257 @@
+# Standard libraries
+import json
+import random
+import sqlite3
+import threading
+from collections import Counter
+from itertools import product
+from pathlib import Path
+
+# Local imports
+from .checkpoint import Checkpoint, combo_key
+from .quote_dataset import utc_now
+
+SENTINELS_PER_REGION = 2 # Combos re-scraped per region to detect price changes
+BANDS = 3                # Bands each of coverage and age is split into (contiguous levels of the data sample)
+
+
+def band_of(axis, bands=BANDS):
+    """Maps each level of a grid axis (as strings) to its band, splitting the axis into contiguous runs of levels."""
+    return {str(value): i * bands // len(axis) for i, value in enumerate(axis)}
+
+
+def diff_quotes(old, new):
+    """Compares a combo's stored and freshly scraped quotes.
+
+    Quotes are matched by provider and product (by rank within each, e.g. for rows stored without a provider).
+
+    Returns:
+        changes (list): (provider, product, old premium_minor, new premium_minor) of every quote which changed,
+            appeared (old is None) or disappeared (new is None).
+    """
+    def by_product(quotes):
+        grouped = {}
+        for quote in quotes:
+            grouped.setdefault((quote["provider"], quote["product"]), []).append(quote["premium_minor"])
+        return {key: sorted(premiums) for key, premiums in grouped.items()}
+
+    old, new = by_product(old), by_product(new)
+    changes = []
+    for provider, product_name in sorted(old.keys() | new.keys(), key=str):
+        before, after = old.get((provider, product_name), []), new.get((provider, product_name), [])
+        for i in range(max(len(before), len(after))):
+            old_minor = before[i] if i < len(before) else None
+            new_minor = after[i] if i < len(after) else None
+            if old_minor != new_minor:
+                changes.append((provider, product_name, old_minor, new_minor))
+    return changes
+
+
+class SnapshotLog:
+    """Versioned deltas of a scraper's quotes, stored next to them in the checkpoint file.
+
+    The checkpoint keeps the latest snapshot of every combo (version 0 is the full crawl which filled it). Each
+    refresh is a new version recording only the quotes which changed ('quote_changes'), so older snapshots can be
+    rebuilt by undoing the changes of later versions instead of keeping a full CSV per run.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str | Path): SQLite file holding the log (normally the scraper's checkpoint).
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    version INTEGER PRIMARY KEY, started_at TEXT, finished_at TEXT, sentinels INTEGER, scraped INTEGER,
+                    changed_combos INTEGER, changed_quotes INTEGER, regions TEXT
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS quote_changes (
+                    version INTEGER, coverage TEXT, term TEXT, age TEXT, gender TEXT, nic TEXT,
+                    provider TEXT, product TEXT, old_premium_minor INTEGER, new_premium_minor INTEGER
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS quote_changes_version ON quote_changes (version)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def begin(self):
+        """Starts a new version, or returns the unfinished one of an interrupted refresh so it can resume."""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT version FROM snapshots WHERE finished_at IS NULL ORDER BY version DESC").fetchone()
+            if row:
+                return row[0]
+            version = self._conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM snapshots").fetchone()[0]
+            self._conn.execute("INSERT INTO snapshots (version, started_at) VALUES (?, ?)", (version, utc_now()))
+            return version
+
+    def record(self, version, combo, changes):
+        """Stores a combo's changes under version, replacing any recorded for it by an interrupted attempt."""
+        key = combo_key(combo)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM quote_changes WHERE version = ? AND coverage = ? AND term = ? AND age = ? AND gender = ? AND nic = ?",
+                (version, *key),
+            )
+            self._conn.executemany(
+                "INSERT INTO quote_changes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(version, *key, *change) for change in changes],
+            )
+
+    def finish(self, version, sentinels, scraped, regions):
+        """Closes a version with its refresh's statistics and changed regions."""
+        with self._lock, self._conn:
+            changed_combos, changed_quotes = self._conn.execute(
+                "SELECT COUNT(DISTINCT coverage || '|' || term || '|' || age || '|' || gender || '|' || nic), COUNT(*)"
+                " FROM quote_changes WHERE version = ?", (version,)
+            ).fetchone()
+            self._conn.execute(
+                "UPDATE snapshots SET finished_at = ?, sentinels = ?, scraped = ?, changed_combos = ?, changed_quotes = ?,"
+                " regions = ? WHERE version = ?",
+                (utc_now(), sentinels, scraped, changed_combos, changed_quotes, json.dumps(regions), version),
+            )
+
+    def versions(self):
+        """Returns every finished version's statistics, oldest first, as dicts."""
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM snapshots WHERE finished_at IS NOT NULL ORDER BY version")
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def changes(self, version):
+        """Returns a version's changes, as (combo key, provider, product, old premium_minor, new premium_minor) tuples."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT coverage, term, age, gender, nic, provider, product, old_premium_minor, new_premium_minor"
+                " FROM quote_changes WHERE version = ?", (version,)
+            )
+            return [(tuple(row[:5]), *row[5:]) for row in rows]
+
+    def snapshot(self, version, current):
+        """Rebuilds the quotes as they were at a version, by undoing the changes of every later version.
+
+        Args:
+            version (int): Version to rebuild (0 for the full crawl).
+            current (dict): The checkpoint's latest quotes (see Checkpoint.combo_quotes).
+        Returns:
+            quotes (dict): {combo key: [quote dicts]}, like current.
+        """
+        quotes = {key: [dict(quote) for quote in combo_quotes] for key, combo_quotes in current.items()}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT coverage, term, age, gender, nic, provider, product, old_premium_minor, new_premium_minor"
+                " FROM quote_changes WHERE version > ? ORDER BY version DESC", (version,)
+            ).fetchall()
+        for *key, provider, product_name, old_minor, new_minor in rows:
+            combo_quotes = quotes.setdefault(tuple(key), [])
+            if new_minor is not None:
+                undone = next(quote for quote in combo_quotes if (quote["provider"], quote["product"], quote["premium_minor"]) == (provider, product_name, new_minor))
+                combo_quotes.remove(undone)
+            if old_minor is not None:
+                combo_quotes.append({"provider": provider, "product": product_name, "premium_minor": old_minor})
+        return quotes
+
+
+def refresh_quotes(checkpoint, axes, scrape, scratch_path, per_region=SENTINELS_PER_REGION, bands=BANDS):
+    """Refreshes the stored quotes, re-scraping only the regions of the grid whose prices changed.
+
+    The grid is split into regions (coverage band, age band, gender, nicotine use, covering every term). A few
+    sentinel combos of each region are re-scraped and compared with the stored snapshot, then every combo of the
+    regions where a sentinel's quotes changed is re-scraped. Changed combos are updated in the checkpoint and their
+    changes recorded as a new SnapshotLog version. Sentinels are drawn afresh each version, so over successive
+    refreshes every combo gets checked. Combos whose sentinels all failed to scrape are reported, not re-scraped.
+
+    Args:
+        checkpoint (Checkpoint): The scraper's checkpoint, holding the last snapshot (e.g. a full crawl).
+        axes (tuple): The data sample's axes (coverage, term, age, gender, nic), in combo field order.
+        scrape (callable): scrape(combos, store) scrapes combos into the Checkpoint store (with the scraper's
+            usual retries).
+        scratch_path (str | Path): Checkpoint file the fresh quotes are scraped into (kept until the refresh
+            completes, so an interrupted refresh resumes).
+        per_region (int): Sentinels per region.
+        bands (int): Bands coverage and age are each split into.
+    Returns:
+        version (int): The snapshot version recorded.
+    """
+    coverage_bands, age_bands = band_of(axes[0], bands), band_of(axes[2], bands)
+    def region_of(key):
+        return (coverage_bands[key[0]], age_bands[key[2]], key[3], key[4])
+
+    stored = checkpoint.combo_quotes()
+    regions = {}
+    for combo in product(*axes):
+        if combo_key(combo) in stored:
+            regions.setdefault(region_of(combo_key(combo)), []).append(combo)
+    if not regions:
+        print("⚠️  Nothing stored to refresh yet, run a full crawl first")
+        return None
+
+    with SnapshotLog(checkpoint.path) as log, Checkpoint(scratch_path, currency=checkpoint.currency) as scratch:
+        version = log.begin()
+        # Seeded by version, so a resumed refresh re-picks the same sentinels
+        rng = random.Random(version)
+        sentinels = [combo for combos in regions.values() for combo in rng.sample(combos, min(per_region, len(combos)))]
+        sentinel_keys = {combo_key(combo) for combo in sentinels}
+        total = sum(len(combos) for combos in regions.values())
+        print(f"🔎 Refresh v{version}: checking {len(sentinels)} sentinels across {len(regions)} regions ({len(sentinels) / total:.0%} of {total} combos)")
+        scrape(scratch.remaining(sentinels), scratch)
+
+        fresh = scratch.combo_quotes()
+        changed, unchecked = set(), set()
+        for region, combos in regions.items():
+            checked = [combo_key(combo) for combo in combos if combo_key(combo) in sentinel_keys and combo_key(combo) in fresh]
+            if not checked:
+                unchecked.add(region)
+            elif any(diff_quotes(stored[key], fresh[key]) for key in checked):
+                changed.add(region)
+        if unchecked:
+            print(f"⚠️  {len(unchecked)} regions couldn't be checked (sentinels failed), left as they were")
+
+        todo = [combo for region in changed for combo in regions[region]]
+        if todo:
+            print(f"🔁 Prices changed in {len(changed)} regions, re-scraping their {len(todo)} combos")
+            scrape(scratch.remaining(todo), scratch)
+            fresh = scratch.combo_quotes()
+
+        # Applying the fresh quotes: deltas first, so a crash in between only repeats an idempotent step
+        providers = Counter()
+        for key, quotes in fresh.items():
+            changes = diff_quotes(stored[key], quotes) if key in stored else []
+            if changes:
+                log.record(version, key, changes)
+                checkpoint.replace(key, quotes)
+                providers.update(provider for provider, *_ in changes)
+        log.finish(version, len(sentinels), len(fresh), sorted(map(list, changed)))
+        scraped = len(fresh)
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{scratch_path}{suffix}").unlink(missing_ok=True)
+    print(f"📸 Snapshot v{version}: {scraped} combos scraped ({scraped / total:.0%} of a full crawl), "
+          f"{sum(providers.values())} quotes changed {dict(providers.most_common(5))}")
+    return version
+
+
+def print_snapshots(path):
+    """Prints the version history of the SnapshotLog in path."""
+    if not Path(path).exists():
+        print(f"📸 No checkpoint at {path}, so nothing to refresh yet")
+        return
+    with SnapshotLog(path) as log:
+        versions = log.versions()
+    if not versions:
+        print("📸 No refreshes recorded yet")
+    for snapshot in versions:
+        print(f"📸 v{snapshot['version']} ({snapshot['finished_at']}): {snapshot['scraped']} combos scraped "
+              f"({snapshot['sentinels']} sentinels), {snapshot['changed_quotes']} quotes changed in {snapshot['changed_combos']} combos")
@@ -0,0 +1,47 @@
+# Standard libraries
+import json
+import time
+from pathlib import Path
+
+# Local imports
+from .http_client import exchange_key
+from .local_server import LocalHandler, LocalServer
+
+
+class ReplayServer(LocalServer):
+    """Local stand-in server which replays responses recorded by HttpSession(record_dir=...).
+
+    Requests are matched on method, path (with query) and body, so the HTTP engines can be run and
+    tested offline. Use as a context manager and point the session's base_url at `server.url`.
+    """
+
+    def __init__(self, fixtures_dir, port=0, latency=0.0):
+        """
+        Args:
+            fixtures_dir (str | Path): Directory of recorded JSON fixtures.
+            port (int): Port to listen on, 0 picks a free one.
+            latency (float): Artificial delay (seconds) added to every response.
+        """
+        self.fixtures = {}
+        for fixture_path in Path(fixtures_dir).glob("*.json"):
+            self.fixtures[fixture_path.stem] = json.loads(fixture_path.read_text(encoding="utf-8"))
+        self.latency = latency
+        super().__init__(port=port)
+
+    def _handler(self):
+        server = self
+
+        class Handler(LocalHandler):
+            def _replay(self):
+                fixture = server.fixtures.get(exchange_key(self.command, self.path, self._body()))
+                if server.latency:
+                    time.sleep(server.latency)
+                if fixture is None:
+                    return self._send(404, "text/plain", f"No recorded response for {self.command} {self.path}".encode("utf-8"))
+                headers = {"Location": fixture["location"]} if fixture.get("location") else None
+                self._send(fixture["status"], fixture["content_type"] or "application/octet-stream",
+                           fixture["body"].encode("utf-8"), headers)
+
+            do_GET = do_POST = do_PUT = do_PATCH = _replay
+
+        return Handler
@@ -0,0 +1,156 @@
+# Standard libraries
+import random
+import time
+from collections import Counter
+
+# Third-party libraries
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+# Local imports
+from .checkpoint import combo_key
+from .http_client import HttpStatusError
+
+# Attempts allowed per failure kind before a combo is marked as permanently failing, and the base backoff (s) before retrying it
+RETRY_POLICY = {
+    "timeout":    {"attempts": 5, "delay": 2},   # Slow page or quote engine, usually clears up
+    "stale":      {"attempts": 5, "delay": 1},   # Element re-rendered under the scraper, retrying straight away is fine
+    "no_results": {"attempts": 2, "delay": 1},   # Results page rendered neither quotes nor the "no results" message
+    "block":      {"attempts": 3, "delay": 60},  # Rate limited or challenged by the site, back off hard
+    "error":      {"attempts": 3, "delay": 2},   # Anything else
+}
+MAX_DELAY = 600 # Cap on a single backoff (s)
+SKIPPED = "skipped" # Kind for combos left unattempted after a block, which retry without counting as an attempt
+
+# HTTP statuses and page text which mean the site is refusing the scraper rather than failing
+BLOCK_STATUSES = {403, 429, 503}
+BLOCK_MARKERS = ["access denied", "too many requests", "unusual traffic", "captcha", "are you a robot", "request blocked"]
+
+
+class NoResultsError(Exception):
+    """Raised when a results page finished loading without showing any quotes or a 'no results' message."""
+
+
+def classify_failure(error, driver=None):
+    """Classifies a scraping error as 'timeout', 'stale', 'no_results', 'block' or 'error'.
+
+    Args:
+        error (Exception): Exception raised while scraping a combo.
+        driver (webdriver.Chrome): Optional driver, whose page is checked for block/captcha pages.
+    Returns:
+        kind (str): One of the RETRY_POLICY keys.
+    """
+    if isinstance(error, HttpStatusError) and error.status in BLOCK_STATUSES:
+        return "block"
+    if driver is not None:
+        try:
+            page = f"{driver.title} {driver.find_element('tag name', 'body').text[:2000]}".lower()
+            if any(marker in page for marker in BLOCK_MARKERS):
+                return "block"
+        except Exception:
+            pass # Page unreadable (e.g. browser crashed), classify on the error alone
+    if isinstance(error, NoResultsError):
+        return "no_results"
+    if isinstance(error, StaleElementReferenceException):
+        return "stale"
+    if isinstance(error, (TimeoutException, TimeoutError)) or "timed out" in str(error).lower():
+        return "timeout"
+    return "error"
+
+
+def backoff_delay(kind, attempt):
+    """Exponential backoff with jitter: the kind's base delay doubled per attempt, then drawn from [delay/2, delay]."""
+    delay = min(MAX_DELAY, RETRY_POLICY[kind]["delay"] * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+class RetryScheduler:
+    """Collects failed combos and hands them back in rounds, grouped by the page state they share.
+
+    Every combo in a group can be retried in one session (e.g. one page load per Drewberry URL), each round waits
+    out an exponential backoff with jitter, and combos exceeding their failure kind's attempts are marked as
+    permanently failing instead of being retried every round.
+    """
+
+    def __init__(self, max_rounds=10, checkpoint=None, sleep=time.sleep):
+        """
+        Args:
+            max_rounds (int): Maximum number of retry rounds.
+            checkpoint (Checkpoint): If set, permanently failing combos are marked in it (and skipped when resuming).
+            sleep (callable): Used to wait out the backoff (swappable, e.g. for dry runs).
+        """
+        self.max_rounds = max_rounds
+        self.checkpoint = checkpoint
+        self.sleep = sleep
+        self.pending = {}   # group -> {combo key: combo}, in failure order
+        self.attempts = {}  # combo key -> [kind of each failure]
+        self.permanent = {} # combo key -> (combo, kind, attempts)
+        self.blocked = 0    # Consecutive rounds in which the site blocked us (blocks back off site-wide, not per combo)
+        self._saw_block = False
+
+    def __bool__(self):
+        return any(self.pending.values())
+
+    def fail(self, combo, group, kind, message=""):
+        """Records a failed attempt at a combo, scheduling it for retry or marking it as permanently failing.
+
+        Args:
+            combo (tuple): The failed combo.
+            group: Page state the combo needs (combos sharing it are retried together), e.g. its URL.
+            kind (str): Failure kind, see classify_failure (or SKIPPED if the combo was never attempted).
+            message (str): Error message, stored with permanent failures.
+        """
+        key = combo_key(combo)
+        if kind == SKIPPED:
+            self.pending.setdefault(group, {})[key] = combo
+            return
+        kinds = self.attempts.setdefault(key, [])
+        kinds.append(kind)
+        self._saw_block = self._saw_block or kind == "block"
+        if kinds.count(kind) >= RETRY_POLICY[kind]["attempts"]:
+            self._give_up(combo, kind, message)
+        else:
+            self.pending.setdefault(group, {})[key] = combo
+
+    def _give_up(self, combo, kind, message):
+        key = combo_key(combo)
+        self.permanent[key] = (combo, kind, len(self.attempts[key]))
+        for combos in self.pending.values():
+            combos.pop(key, None)
+        if self.checkpoint is not None:
+            self.checkpoint.mark_failed(combo, kind, len(self.attempts[key]), message)
+        print(f"⛔ Giving up on combo {key} after {len(self.attempts[key])} attempts ({kind})")
+
+    def rounds(self):
+        """Yields (round number, {group: [combos]}) until nothing is left to retry, sleeping out the backoff before each round.
+
+        Failures reported (via fail) while a round is being scraped are scheduled for the next one. Combos still
+        pending after max_rounds are marked as permanently failing.
+        """
+        for i in range(1, self.max_rounds + 1):
+            if not self:
+                return
+            # Waiting as long as the most backed-off combo needs, or longer while the site keeps blocking us
+            self.blocked = self.blocked + 1 if self._saw_block else 0
+            self._saw_block = False
+            failed = [key for combos in self.pending.values() for key in combos if key in self.attempts]
+            delay = max((backoff_delay(self.attempts[key][-1], len(self.attempts[key])) for key in failed), default=0)
+            if self.blocked:
+                delay = max(delay, backoff_delay("block", self.blocked))
+            kinds = Counter(self.attempts.get(key, [SKIPPED])[-1] for combos in self.pending.values() for key in combos)
+            print(f"🔁 Retrying {sum(kinds.values())} failed combos in {delay:.1f}s... ({i}) {dict(kinds)}")
+            self.sleep(delay)
+
+            batch = {group: list(combos.values()) for group, combos in self.pending.items() if combos}
+            self.pending = {}
+            yield i, batch
+
+        # Combos which were never attempted are left unmarked, so a resumed run still picks them up
+        for combos in list(self.pending.values()):
+            for key, combo in list(combos.items()):
+                if key in self.attempts:
+                    self._give_up(combo, self.attempts[key][-1], "Retry rounds exhausted")
+        self.pending = {}
+
+    def summary(self):
+        """Returns a count of permanently failing combos per failure kind."""
+        return Counter(kind for _, kind, _ in self.permanent.values())
@@ -0,0 +1,224 @@
+# Standard libraries
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+# Active tracer (see configure_tracing), None leaves every span and phase a no-op
+TRACER = None
+
+# Thread-local stack of the open span and phases, so nested phases only count their own (self) time
+_local = threading.local()
+
+
+class Tracer:
+    """Appends one JSON line per traced span (e.g. a scraped combo) to a trace file.
+
+    Each span records its wall-clock start, duration, outcome and the time spent in each phase (driver.get, loader
+    waits, the edit page round trip, extracting premiums, ...). Phases are timed with perf_counter and summed in
+    memory, and a span is written as a single line when it ends, so tracing costs microseconds per combo.
+    """
+
+    def __init__(self, path, site=None):
+        """
+        Args:
+            path (str | Path): JSONL trace file, appended to (so resumed runs add to the same trace).
+            site (str): Site name stored with every span, e.g. "drewberry".
+        """
+        self.path = Path(path)
+        self.site = site
+        self.run = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{os.getpid()}" # Tells runs apart in a shared file
+        self._lock = threading.Lock()
+        self._file = open(self.path, mode="a", encoding="utf-8")
+
+    def write(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush() # A crashed run keeps every finished span
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def configure_tracing(path=None, site=None):
+    """Starts writing spans to path (or stops tracing if path is None), replacing any active tracer.
+
+    Returns:
+        tracer (Tracer | None): The active tracer.
+    """
+    global TRACER
+    if TRACER is not None:
+        TRACER.close()
+    TRACER = Tracer(path, site=site) if path else None
+    return TRACER
+
+
+@contextmanager
+def trace_span(kind, **fields):
+    """Traces the enclosed block as one span, collecting the time of every phase entered inside it (on this thread).
+
+    Set the yielded record's "outcome" inside the block to record how it ended (defaults to "error" if an exception
+    escapes the block, "ok" otherwise).
+
+    Args:
+        kind (str): Span type, e.g. "combo" or "page" (loading a quote page before its combos).
+        fields: Extra JSON-serialisable fields stored with the span, e.g. combo=... or url=...
+    """
+    tracer = TRACER
+    if tracer is None:
+        yield {}
+        return
+    record = {"kind": kind, "run": tracer.run, "site": tracer.site, "worker": threading.current_thread().name, **fields}
+    frame = {"phases": defaultdict(float), "child": 0.0}
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(frame)
+    record["ts"] = time.time()
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record.setdefault("outcome", "error")
+        raise
+    finally:
+        record["duration"] = round(time.perf_counter() - start, 4)
+        record.setdefault("outcome", "ok")
+        record["phases"] = {name: round(seconds, 4) for name, seconds in frame["phases"].items()}
+        stack.pop()
+        tracer.write(record)
+
+
+@contextmanager
+def phase(name):
+    """Adds the enclosed block's self time (minus nested phases) to the open span's phase totals, if any."""
+    stack = getattr(_local, "stack", None)
+    if not stack:
+        yield
+        return
+    span_frame = next(frame for frame in reversed(stack) if "phases" in frame)
+    frame = {"child": 0.0}
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        span_frame["phases"][name] += elapsed - frame["child"]
+        stack[-1]["child"] += elapsed # Parent phase (or span) doesn't count this time twice
+
+
+def traced(name):
+    """Decorator timing every call of a function as a phase (see phase)."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not getattr(_local, "stack", None):
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_spans(trace_path, run="latest"):
+    """Loads the spans of a trace file.
+
+    Args:
+        trace_path (str | Path): JSONL trace file.
+        run (str): "latest" for the last run in the file, "all" for every run, or a run id.
+    Returns:
+        spans (list): Span dicts, in the order they finished.
+    """
+    spans = []
+    with open(trace_path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                pass # Line cut short by a crash
+    if run == "latest" and spans:
+        run = spans[-1]["run"]
+    return spans if run == "all" else [record for record in spans if record["run"] == run]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+
+def summarise(spans, bucket_minutes=5, slowest=10):
+    """Prints the time breakdown per phase, throughput over time and the slowest combos of a trace.
+
+    Args:
+        spans (list): Spans from read_spans.
+        bucket_minutes (int): Width of each throughput bucket.
+        slowest (int): Number of slowest combos to list.
+    """
+    combos = [record for record in spans if record["kind"] == "combo"]
+    if not spans:
+        print("No spans found.")
+        return
+    wall = max(record["ts"] + record["duration"] for record in spans) - min(record["ts"] for record in spans)
+    runs = sorted({record["run"] for record in spans})
+    print(f"Runs: {', '.join(runs)}")
+    print(f"{len(combos)} combos in {wall / 60:.1f} min ({len(combos) / max(wall, 1e-9) * 60:.1f} combos/min), "
+          f"outcomes: {dict(Counter(record['outcome'] for record in combos))}")
+
+    # Time breakdown: every span's self time per phase, with whatever isn't in a phase counted as "other"
+    print("\nTime per phase (all spans)")
+    totals, per_combo = defaultdict(float), defaultdict(list)
+    for record in spans:
+        phases = dict(record["phases"])
+        phases["other"] = max(0.0, record["duration"] - sum(phases.values()))
+        for name, seconds in phases.items():
+            totals[f"{record['kind']}:{name}"] += seconds
+            if record["kind"] == "combo":
+                per_combo[name].append(seconds)
+    traced_total = sum(totals.values()) or 1e-9
+    print(f"  {'phase':<22}{'total (s)':>11}{'share':>8}{'p50/combo':>11}{'p95/combo':>11}")
+    for name, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        kind, phase_name = name.split(":", 1)
+        samples = per_combo.get(phase_name, []) if kind == "combo" else []
+        p50 = f"{percentile(samples, 50):.2f}" if samples else "-"
+        p95 = f"{percentile(samples, 95):.2f}" if samples else "-"
+        print(f"  {name:<22}{seconds:>11.1f}{seconds / traced_total:>8.1%}{p50:>11}{p95:>11}")
+
+    # Throughput over time, in buckets since the first span started
+    print(f"\nThroughput ({bucket_minutes} min buckets)")
+    start = min(record["ts"] for record in spans)
+    buckets = defaultdict(Counter)
+    for record in combos:
+        buckets[int((record["ts"] + record["duration"] - start) // (bucket_minutes * 60))][record["outcome"]] += 1
+    for bucket in range(max(buckets, default=-1) + 1):
+        counts = buckets[bucket]
+        done = sum(counts.values())
+        failed = done - counts["ok"] - counts["empty"]
+        print(f"  +{bucket * bucket_minutes:>4} min  {done / bucket_minutes:>6.1f} combos/min  ({failed} failed)")
+
+    print(f"\nSlowest {slowest} combos")
+    for record in sorted(combos, key=lambda record: -record["duration"])[:slowest]:
+        top = max(record["phases"].items(), key=lambda item: item[1], default=("other", 0.0))
+        print(f"  {record['duration']:>7.2f}s  {record['outcome']:<10} {', '.join(map(str, record['combo']))}  "
+              f"(mostly {top[0]}: {top[1]:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a scraper trace (per-phase time, throughput, slowest combos).")
+    parser.add_argument("trace", help="JSONL trace file, e.g. data/raw/UK_quotes.trace.jsonl")
+    parser.add_argument("--run", default="latest", help="'latest' (default), 'all', or a run id")
+    parser.add_argument("--bucket", type=int, default=5, help="throughput bucket width (minutes)")
+    parser.add_argument("--slowest", type=int, default=10, help="number of slowest combos to list")
+    args = parser.parse_args()
+    summarise(read_spans(args.trace, run=args.run), bucket_minutes=args.bucket, slowest=args.slowest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Standard libraries
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Local imports
+from .http_client import HttpSession
+from .retry import BLOCK_STATUSES
+
+URL_MAX_AGE_DAYS = 30 # Cached quote URLs older than this are recollected, however alive they look
+CHECK_WORKERS = 8     # Concurrent liveness checks
+FIELDS = ["Age", "Gender", "Nicotine Use", "URL", "Collected"]
+
+
+def profile_key(age, gender, nic):
+    """Normalises an (age, gender, nic) risk profile to strings, so ints and CSV-read values compare equal."""
+    return (str(age), str(gender), str(nic))
+
+
+def url_alive(session, url):
+    """Cheap liveness check of a quote URL: one plain GET, no browser, no redirects followed.
+
+    Returns:
+        alive (bool): False if the page is gone (4xx) or redirects elsewhere (e.g. back to the quote form). Network
+            errors and block statuses aren't evidence the URL died, so they count as alive.
+    """
+    try:
+        status = session.request("GET", url, follow_redirects=False).status
+    except Exception:
+        return True
+    return 200 <= status < 300 or status in BLOCK_STATUSES
+
+
+class UrlCache:
+    """Per-profile cache of Drewberry quote URLs, stored in drewberry_urls.csv with a collection timestamp per row.
+
+    Only profiles whose URL is missing, older than max_age_days or failing a liveness check need collecting, so
+    adding an age to the data sample only collects that age's URLs. CSVs written before the 'Collected' column
+    existed are read with the file's modification time as every row's timestamp.
+    """
+
+    def __init__(self, path, max_age_days=URL_MAX_AGE_DAYS):
+        """
+        Args:
+            path (str | Path): CSV of cached URLs (created on the first update).
+            max_age_days (float): Age after which a cached URL is recollected.
+        """
+        self.path = Path(path)
+        self.max_age = timedelta(days=max_age_days)
+        self.entries = {} # Profile key -> CSV row (dict of FIELDS)
+        if self.path.exists():
+            fallback = datetime.fromtimestamp(self.path.stat().st_mtime, timezone.utc).isoformat(timespec="seconds")
+            with open(self.path, newline="") as file:
+                for row in csv.DictReader(file):
+                    row["Collected"] = row.get("Collected") or fallback
+                    self.entries[profile_key(row["Age"], row["Gender"], row["Nicotine Use"])] = row
+
+    def stale(self, profiles, check=True, base_url=None):
+        """Returns the profiles which need collecting: missing, expired, or (if check) whose URL is no longer alive.
+
+        Args:
+            profiles (list): (age, gender, nic) risk profiles of the data sample.
+            check (bool): If True, cached, unexpired URLs get a liveness check (see url_alive), in parallel.
+            base_url (str): Sends the liveness checks to this host instead (e.g. a local mock site).
+        """
+        now = datetime.now(timezone.utc)
+        stale, cached = [], []
+        for profile in profiles:
+            row = self.entries.get(profile_key(*profile))
+            if row is None or now - datetime.fromisoformat(row["Collected"]) > self.max_age:
+                stale.append(profile)
+            else:
+                cached.append(profile)
+        if check and cached:
+            session = HttpSession(base_url=base_url, maxsize=CHECK_WORKERS)
+            with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as executor:
+                alive = list(executor.map(lambda profile: url_alive(session, self.entries[profile_key(*profile)]["URL"]), cached))
+            dead = [profile for profile, ok in zip(cached, alive) if not ok]
+            if dead:
+                print(f"⚠️  {len(dead)} cached URLs no longer lead to a quote page")
+            stale += dead
+        return stale
+
+    def update(self, url_results):
+        """Stores freshly collected URLs (timestamped now) and rewrites the CSV.
+
+        Args:
+            url_results (list): (age, gender, nic, url) tuples, as returned by extract_risk_info.
+        """
+        collected = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        for age, gender, nic, url in url_results:
+            self.entries[profile_key(age, gender, nic)] = {
+                "Age": str(age), "Gender": gender, "Nicotine Use": nic, "URL": url, "Collected": collected,
+            }
+        # Written to a temporary file first, so an interrupted write never loses the cache
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.entries.values())
+        os.replace(temp_path, self.path)
+
+    def rows(self, profiles):
+        """Cached rows (dicts with 'Age', 'Gender', 'Nicotine Use' and 'URL') of the given profiles, in their order."""
+        return [self.entries[profile_key(*profile)] for profile in profiles if profile_key(*profile) in self.entries]
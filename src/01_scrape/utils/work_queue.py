@@ -0,0 +1,285 @@
+# Standard libraries
+import argparse
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+# Local imports
+from .checkpoint import combo_key
+from .retry import RETRY_POLICY, SKIPPED, backoff_delay
+
+LEASE_SECONDS = 300   # How long a claim lasts without a heartbeat before the combos are re-issued to another worker
+POLL_INTERVAL = 5     # How long an idle worker waits before trying to claim again (s)
+RATE_WINDOW = 15 * 60 # Window of recent completions used for throughput and ETA (s)
+
+
+def default_worker_id():
+    """Host and process id, e.g. "scraper-2:4182", so workers on different machines never clash."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """Durable queue of combos, shared by scraper worker processes through a SQLite file.
+
+    The queue lives in the scraper's checkpoint file (as a 'queue' table next to the stored quotes), so workers'
+    results land in the usual checkpoint and export as normal. Workers claim a batch of combos sharing a page (e.g.
+    one Drewberry URL) under a time-limited lease and heartbeat while scraping it. A worker that dies or hangs
+    stops heartbeating, so its lease expires and the combos are handed to the next worker to claim. Failed combos
+    back off and are retried under utils.retry's RETRY_POLICY, then marked as permanently failing in the checkpoint.
+    """
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS):
+        """
+        Args:
+            path (str | Path): SQLite file holding the queue (normally the scraper's checkpoint).
+            lease_seconds (float): Lease length, renewed by every heartbeat.
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self._combos = {} # Combo key -> combo as seeded by this process (original types, e.g. int ages)
+        self._blocked = 0 # Consecutive batches this worker was blocked on, backs off before its next claim
+        self._lock = threading.Lock()
+        self._stop = threading.Event() # Stops the heartbeat thread of batches()
+        # Autocommit mode, so claims can take the write lock up front with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queue (
+                coverage TEXT, term TEXT, age TEXT, gender TEXT, nic TEXT, grp TEXT,
+                status TEXT DEFAULT 'pending', worker TEXT, lease_expires REAL, not_before REAL DEFAULT 0,
+                claims INTEGER DEFAULT 0, kinds TEXT DEFAULT '', error TEXT, finished_at REAL,
+                PRIMARY KEY (coverage, term, age, gender, nic)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS queue_status ON queue (status, grp)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS workers (worker TEXT PRIMARY KEY, started REAL, heartbeat REAL)""")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        # Write lock is taken before reading, so two workers can never claim the same rows
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def seed(self, tasks, checkpoint=None):
+        """Adds combos to the queue (those already queued are left as they are), safe to call from every worker.
+
+        Args:
+            tasks (iterable): (group, combos) pairs, where group is the page the combos share (e.g. their URL).
+            checkpoint (Checkpoint): If set, combos it already stores (or marks as failing) are queued as finished.
+        Returns:
+            added (int): Number of combos newly queued.
+        """
+        finished = (checkpoint.completed() | set(checkpoint.failures())) if checkpoint is not None else set()
+        rows = []
+        for group, combos in tasks:
+            for combo in combos:
+                key = combo_key(combo)
+                self._combos[key] = combo
+                rows.append((*key, str(group), "done" if key in finished else "pending"))
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO queue (coverage, term, age, gender, nic, grp, status) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            return conn.total_changes - before
+
+    def claim(self, worker, size):
+        """Leases up to size claimable combos (pending, or leased with an expired lease), all from one group.
+
+        Returns:
+            group (str): The claimed combos' group (None if nothing is claimable right now).
+            combos (list): The claimed combos (as seeded by this process), empty if nothing is claimable right now.
+        """
+        now = time.time()
+        claimable = "((status = 'pending' AND not_before <= ?) OR (status = 'leased' AND lease_expires < ?))"
+        with self._transaction() as conn:
+            first = conn.execute(f"SELECT grp FROM queue WHERE {claimable} ORDER BY rowid LIMIT 1", (now, now)).fetchone()
+            if first is None:
+                return None, []
+            keys = conn.execute(
+                f"SELECT coverage, term, age, gender, nic FROM queue WHERE grp = ? AND {claimable} ORDER BY rowid LIMIT ?",
+                (first[0], now, now, size),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE queue SET status = 'leased', worker = ?, lease_expires = ?, claims = claims + 1"
+                " WHERE coverage = ? AND term = ? AND age = ? AND gender = ? AND nic = ?",
+                [(worker, now + self.lease_seconds, *key) for key in keys],
+            )
+            conn.execute("INSERT OR REPLACE INTO workers VALUES (?, COALESCE((SELECT started FROM workers WHERE worker = ?), ?), ?)",
+                         (worker, worker, now, now))
+        return first[0], [self._combos.get(tuple(key), tuple(key)) for key in keys]
+
+    def heartbeat(self, worker):
+        """Renews the lease of every combo the worker holds."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("UPDATE queue SET lease_expires = ? WHERE status = 'leased' AND worker = ?", (now + self.lease_seconds, worker))
+            conn.execute("UPDATE workers SET heartbeat = ? WHERE worker = ?", (now, worker))
+
+    def settle(self, worker, combos, failed_combos, checkpoint=None):
+        """Writes a claimed batch's outcome back: failed combos back off (or give up), the others are done.
+
+        Args:
+            combos (list): The batch's combos, as claimed.
+            failed_combos (list): (combo, kind, message) of each failed combo, as returned by scrape_combos.
+            checkpoint (Checkpoint): If set, combos exceeding their kind's attempts are marked as failing in it.
+        """
+        failures = {combo_key(combo): (kind, message) for combo, kind, message in failed_combos}
+        self._blocked = self._blocked + 1 if any(kind == "block" for kind, _ in failures.values()) else 0
+        now = time.time()
+        given_up = []
+        with self._transaction() as conn:
+            for combo in combos:
+                key = combo_key(combo)
+                where = "WHERE coverage = ? AND term = ? AND age = ? AND gender = ? AND nic = ? AND worker = ?"
+                if key not in failures:
+                    conn.execute(f"UPDATE queue SET status = 'done', finished_at = ?, error = NULL {where}", (now, *key, worker))
+                    continue
+                kind, message = failures[key]
+                if kind == SKIPPED:
+                    # Never attempted (skipped after a block), so it goes back without counting as an attempt
+                    conn.execute(f"UPDATE queue SET status = 'pending', claims = claims - 1 {where}", (*key, worker))
+                    continue
+                row = conn.execute(f"SELECT kinds FROM queue {where}", (*key, worker)).fetchone()
+                if row is None:
+                    continue # Lease expired and was re-issued to another worker, which now owns the combo
+                kinds = [*filter(None, row[0].split(",")), kind]
+                attempts = kinds.count(kind)
+                if attempts >= RETRY_POLICY[kind]["attempts"]:
+                    conn.execute(f"UPDATE queue SET status = 'failed', kinds = ?, error = ?, finished_at = ? {where}",
+                                 (",".join(kinds), message, now, *key, worker))
+                    given_up.append((combo, kind, len(kinds), message))
+                    print(f"⛔ Giving up on combo {key} after {len(kinds)} attempts ({kind})")
+                else:
+                    conn.execute(f"UPDATE queue SET status = 'pending', kinds = ?, error = ?, not_before = ? {where}",
+                                 (",".join(kinds), message, now + backoff_delay(kind, attempts), *key, worker))
+        # Outside the queue's transaction, which holds the file's write lock the checkpoint needs
+        if checkpoint is not None:
+            for combo, kind, attempts, message in given_up:
+                checkpoint.mark_failed(combo, kind, attempts, message)
+
+    def unfinished(self):
+        """Number of combos still pending or leased."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM queue WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def batches(self, worker, size):
+        """Yields claimed (group, combos) batches until the queue is drained, heartbeating in the background while each is scraped.
+
+        Settle each batch (see settle) before asking for the next. While other workers still hold leases (or
+        failures are backing off), the worker waits and claims again, taking over any lease which expires.
+
+        Args:
+            worker (str): This worker's id (see default_worker_id).
+            size (int): Maximum combos per batch.
+        """
+        self._stop = stop = threading.Event() # Set by close() too, so the heartbeat never outlives the connection
+
+        def beat():
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    self.heartbeat(worker)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Heartbeat failed: {e}")
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        try:
+            while self.unfinished():
+                if self._blocked:
+                    # This worker's address is being refused, so it backs off while the others keep going
+                    delay = backoff_delay("block", self._blocked)
+                    print(f"🛑 Blocked, pausing this worker for {delay:.0f}s")
+                    time.sleep(delay)
+                group, combos = self.claim(worker, size)
+                if combos:
+                    yield group, combos
+                else:
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            stop.set()
+
+    def status(self, window=RATE_WINDOW):
+        """Summarises the queue: depth by state, per-worker throughput and an ETA at the recent completion rate.
+
+        Returns:
+            status (dict): 'depth' (state -> combos), 'workers' ({worker: {done, rate, heartbeat}}), 'rate'
+                (combos/min over the window, all workers) and 'eta' (seconds, None if nothing is completing).
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute("SELECT status, worker, lease_expires, not_before, finished_at FROM queue").fetchall()
+            heartbeats = dict(self._conn.execute("SELECT worker, heartbeat FROM workers"))
+        depth = Counter()
+        workers = {worker: {"done": 0, "recent": 0, "heartbeat": heartbeat} for worker, heartbeat in heartbeats.items()}
+        recent = 0
+        for status, worker, lease_expires, not_before, finished_at in rows:
+            if status == "leased" and lease_expires < now:
+                status = "expired"
+            elif status == "pending" and not_before > now:
+                status = "backing off"
+            depth[status] += 1
+            if status in ("done", "failed") and worker is not None and finished_at is not None:
+                stats = workers.setdefault(worker, {"done": 0, "recent": 0, "heartbeat": None})
+                stats["done"] += 1
+                if finished_at >= now - window:
+                    stats["recent"] += 1
+                    recent += 1
+        for stats in workers.values():
+            stats["rate"] = stats.pop("recent") / (window / 60)
+        rate = recent / (window / 60)
+        left = depth["pending"] + depth["backing off"] + depth["leased"] + depth["expired"]
+        return {"depth": dict(depth), "workers": workers, "rate": rate, "eta": left / rate * 60 if rate else None}
+
+
+def print_status(path, window=RATE_WINDOW):
+    """Prints WorkQueue.status() for the queue in path."""
+    with WorkQueue(path) as work_queue:
+        status = work_queue.status(window=window)
+    depth = status["depth"]
+    print(f"📋 Queue depth: {depth.get('pending', 0)} pending, {depth.get('backing off', 0)} backing off, "
+          f"{depth.get('leased', 0)} leased, {depth.get('expired', 0)} expired leases, "
+          f"{depth.get('done', 0)} done, {depth.get('failed', 0)} failed")
+    now = time.time()
+    for worker, stats in sorted(status["workers"].items()):
+        seen = f"{now - stats['heartbeat']:.0f}s ago" if stats["heartbeat"] else "never"
+        print(f"   👷 {worker}: {stats['done']} finished, {stats['rate']:.1f} combos/min (last {window // 60} min), last heartbeat {seen}")
+    if status["eta"] is None:
+        print(f"⏱️  No combos finished in the last {window // 60} min, so no ETA")
+    else:
+        print(f"⏱️  {status['rate']:.1f} combos/min overall, ETA {status['eta'] / 3600:.1f} h")
+
+
+def main():
+    # Part of the utils package (relative imports), so run as a module from src/01_scrape: python -m utils.work_queue <queue>
+    parser = argparse.ArgumentParser(description="Show the state of a scraper work queue.")
+    parser.add_argument("queue", help="checkpoint file holding the queue, e.g. ../../data/raw/UK_quotes.checkpoint.db")
+    parser.add_argument("--window", type=int, default=RATE_WINDOW // 60, help="minutes of recent completions used for rates and ETA")
+    args = parser.parse_args()
+    print_status(args.queue, window=args.window * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+# Standard libraries
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+# Third-party libraries
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+RAW_DIR = ROOT / "data" / "raw"
+CLEAN_PATH = ROOT / "data" / "clean" / "all_quotes.csv"
+RATES_PATH = ROOT / "data" / "rates" / "usd_gbp.csv"
+
+# Raw scraper outputs cleaned by default: (file in data/raw, country, date the quotes were scraped)
+# The scrape date picks the exchange rate used for US quotes (see usd_gbp_rates)
+RAW_SOURCES = [
+    ("final_US_quotes.csv", "US", "2025-04-21"),
+    ("final_UK_quotes.csv", "UK", "2025-04-21"),
+]
+SITE_COUNTRY = {"drewberry": "UK", "lifeinsure": "US"} # Sites of the typed Parquet dataset (data/raw/quotes)
+
+# Schema of all_quotes.csv
+CLEAN_COLUMNS = ["ln(Coverage_Amount)", "Term_Length", "Age", "Is_Male", "Is_Smoker", "Is_UK", "Premium (£)", "ln(Premium)"]
+SMOKER_VALUES = ["Current user", "Smoker"] # Nicotine answers (US, UK) which mean the quote is for a smoker
+
+CHUNKSIZE = 50_000   # Raw rows processed at a time
+TAIL_BYTES = 64_000  # Bytes before a source's processed offset hashed to detect rewritten files
+
+
+def usd_gbp_rates(rates_path=RATES_PATH):
+    """Loads the local USD→GBP rate table (one row per date, e.g. XE rates retrieved when a scrape finished)."""
+    rates = pd.read_csv(rates_path, usecols=["date", "usd_gbp"], parse_dates=["date"])
+    return rates.sort_values("date").reset_index(drop=True)
+
+
+def rate_lookup(scrape_dates, rates):
+    """Returns the USD→GBP rate of each scrape date, using the table's nearest date.
+
+    Args:
+        scrape_dates (pandas.Series): Scrape date of each row.
+        rates (pandas.DataFrame): Rate table from usd_gbp_rates.
+    Returns:
+        rates (numpy.ndarray): One rate per row, in the same order.
+    """
+    dates = pd.DataFrame({"date": pd.to_datetime(scrape_dates).astype("datetime64[ns]"), "row": np.arange(len(scrape_dates))})
+    matched = pd.merge_asof(dates.sort_values("date"), rates.astype({"date": "datetime64[ns]"}), on="date", direction="nearest")
+    return matched.sort_values("row")["usd_gbp"].to_numpy()
+
+
+def transform(coverage, term, age, gender, smoker, premium, is_uk, usd_gbp):
+    """Applies the all_quotes.csv transforms to one chunk of quotes, fully vectorised.
+
+    US coverage and premiums are converted to GBP (rounded to 2 d.p.), coverage and premiums are log-transformed,
+    and gender, smoking status and country become 0/1 columns.
+
+    Args:
+        coverage, term, age (pandas.Series): Numeric combo fields.
+        gender, smoker (pandas.Series): "Male"/"Female" and each site's nicotine answer.
+        premium (pandas.Series): Monthly premium in the quote's own currency.
+        is_uk (numpy.ndarray): Boolean, True for UK (already GBP) quotes.
+        usd_gbp (numpy.ndarray): USD→GBP rate of each row (ignored for UK rows).
+    Returns:
+        clean (pandas.DataFrame): Rows in the all_quotes.csv schema.
+    """
+    coverage = coverage.to_numpy(dtype=float)
+    premium = premium.to_numpy(dtype=float)
+    premium_gbp = np.where(is_uk, premium, np.round(premium * usd_gbp, 2))
+    coverage_gbp = np.where(is_uk, coverage, np.round(coverage * usd_gbp, 2))
+    return pd.DataFrame({
+        "ln(Coverage_Amount)": np.log(coverage_gbp),
+        "Term_Length": term.to_numpy(dtype=np.int64),
+        "Age": age.to_numpy(dtype=np.int64),
+        "Is_Male": (gender.to_numpy() == "Male").astype(np.int64),
+        "Is_Smoker": np.isin(smoker.to_numpy(), SMOKER_VALUES).astype(np.int64),
+        "Is_UK": np.asarray(is_uk, dtype=np.int64),
+        "Premium (£)": premium_gbp,
+        "ln(Premium)": np.log(premium_gbp),
+    })
+
+
+def clean_csv_chunk(chunk, country, scrape_date, rates):
+    """Cleans one chunk of a raw scraper CSV (premiums like "£5.00", US terms like "10 Year Term")."""
+    is_uk = np.full(len(chunk), country == "UK")
+    term = chunk["Term Length"].astype(str).str.replace(" Year Term", "", regex=False)
+    premium = chunk["Premium"].astype(str).str.replace(r"[£$,]", "", regex=True)
+    return transform(
+        chunk["Coverage Amount"], term, chunk["Age"], chunk["Gender"], chunk["Is_Smoker"], premium,
+        is_uk, rate_lookup(pd.Series([scrape_date] * len(chunk)), rates),
+    )
+
+
+def clean_parquet_batch(batch, site, scrape_date, rates):
+    """Cleans one batch of the typed quotes dataset, which needs no parsing (premiums are already in minor units)."""
+    is_uk = np.full(len(batch), SITE_COUNTRY[site] == "UK")
+    return transform(
+        batch["coverage"], batch["term"], batch["age"], batch["gender"].astype(str), batch["smoker_status"].astype(str),
+        batch["premium_minor"] / 100, is_uk, rate_lookup(pd.Series([scrape_date] * len(batch)), rates),
+    )
+
+
+class _ByteRange:
+    """Read-only file view from `start` up to `end`, so pandas only parses the not-yet-cleaned rows of a CSV."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._left = end - start
+
+    def read(self, size=-1):
+        size = self._left if size is None or size < 0 else min(size, self._left)
+        data = self._file.read(size)
+        self._left -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        size = self._left if size is None or size < 0 else min(size, self._left)
+        line = self._file.readline(size)
+        self._left -= len(line)
+        return line
+
+    def __iter__(self):
+        while line := self.readline():
+            yield line
+
+    def close(self):
+        self._file.close()
+
+
+def tail_hash(path, offset):
+    """Hashes the header line and the TAIL_BYTES before offset, which change if already-cleaned rows were rewritten."""
+    with open(path, "rb") as file:
+        digest = hashlib.sha1(file.readline())
+        file.seek(max(0, offset - TAIL_BYTES))
+        digest.update(file.read(offset - file.tell()))
+    return digest.hexdigest()
+
+
+def csv_end(path):
+    """Returns the byte offset just after the last complete line of a CSV (rows after it are still being written)."""
+    size = path.stat().st_size
+    with open(path, "rb") as file:
+        file.seek(max(0, size - 65_536))
+        tail = file.read()
+    return size - len(tail) + tail.rfind(b"\n") + 1
+
+
+def file_hash(path):
+    """SHA-1 of a (small) file, e.g. the rate table."""
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def clean_quotes(output_path=CLEAN_PATH, sources=RAW_SOURCES, dataset_dir=None, full=False, chunksize=CHUNKSIZE,
+                 rates_path=RATES_PATH):
+    """Cleans the raw scraper outputs into all_quotes.csv, only processing raw rows not cleaned by a previous run.
+
+    A manifest next to the output records how far each raw CSV has been cleaned (byte offset, plus a hash to detect
+    rewritten files), which Parquet files are done and where each source's rows end in the output. Rows are kept in
+    source order, so the output is byte-identical to a full rebuild: new rows of the last source are appended, while
+    new rows of an earlier source cut the output back to the end of that source's rows and re-clean the sources after
+    it. The whole output is rebuilt if a source was rewritten, the rate table changed or the output no longer matches
+    the manifest.
+
+    Args:
+        output_path (str | Path): Clean CSV to write.
+        sources (list): (file in data/raw, country, scrape date) raw CSVs to clean, in output order.
+        dataset_dir (str | Path): Optional typed Parquet dataset (see the scrapers' export_parquet) to clean as well.
+        full (bool): If True, rebuilds the whole output.
+        chunksize (int): Rows processed at a time, bounding memory use.
+        rates_path (str | Path): USD→GBP rate table.
+    Returns:
+        added (int): Number of clean rows written by this run.
+    """
+    output_path = Path(output_path)
+    manifest_path = output_path.with_suffix(".manifest.json")
+    rates = usd_gbp_rates(rates_path)
+
+    manifest = {}
+    if not full and manifest_path.exists() and output_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+    stale = (
+        manifest.get("output_bytes") != (output_path.stat().st_size if output_path.exists() else None)
+        or manifest.get("rates") != file_hash(rates_path)
+    )
+
+    # Working out what is left to clean in each source
+    csv_work = []
+    for file_name, country, scrape_date in sources:
+        path = RAW_DIR / file_name
+        end = csv_end(path)
+        done = manifest.get("sources", {}).get(file_name)
+        if done and not stale and done["offset"] <= end and tail_hash(path, done["offset"]) == done["hash"]:
+            start = done["offset"]
+        else:
+            stale = stale or bool(done) # A rewritten source means its old rows in the output are wrong
+            start = None
+        csv_work.append((file_name, country, scrape_date, path, start, end))
+    parquet_files = sorted(Path(dataset_dir).glob("site=*/scrape_date=*/*.parquet")) if dataset_dir else []
+    done_files = manifest.get("parquet", {})
+    if dataset_dir and set(done_files) - {path.relative_to(dataset_dir).as_posix() for path in parquet_files}:
+        stale = True # Partition removed by a re-export, its old rows in the output are wrong
+    for path in parquet_files:
+        done = done_files.get(path.relative_to(dataset_dir).as_posix())
+        if done and (done["bytes"], done["mtime"]) != (path.stat().st_size, path.stat().st_mtime_ns):
+            stale = True # Partition re-exported, its old rows in the output are wrong
+
+    # Each source's rows follow the previous source's, so new rows of an earlier source push the later sources back
+    parquet_keys = [path.relative_to(dataset_dir).as_posix() for path in parquet_files]
+    done_entries = [manifest.get("sources", {}).get(work[0]) for work in csv_work] + [done_files.get(key) for key in parquet_keys]
+    has_new_rows = [start is None or start < end for *_, start, end in csv_work] + [key not in done_files for key in parquet_keys]
+    output_ends = [done.get("output_end") for done in done_entries if done]
+    if None in output_ends or output_ends != sorted(output_ends):
+        stale = True # Manifest from before output positions were recorded, or sources listed in another order
+    first_new = next((i for i, new in enumerate(has_new_rows) if new), None)
+    if not stale and manifest and first_new is not None:
+        resume = done_entries[first_new] or (done_entries[first_new - 1] if first_new else None)
+        if resume is None:
+            stale = True # The very first source is new, so every row moves
+        else:
+            # Keeping the rows up to the first source with new rows, every source after it is cleaned again
+            with open(output_path, "r+b") as file:
+                file.truncate(resume["output_end"])
+            for i, work in enumerate(csv_work[first_new + 1:], first_new + 1):
+                csv_work[i] = (*work[:4], None, work[5])
+                manifest["sources"].pop(work[0], None)
+            for key in parquet_keys[max(0, first_new + 1 - len(csv_work)):]:
+                manifest["parquet"].pop(key, None)
+
+    if stale or not manifest:
+        # Starting over: every source is cleaned from its first row
+        manifest = {"sources": {}, "parquet": {}}
+        csv_work = [(*work[:4], None, work[5]) for work in csv_work]
+        pd.DataFrame(columns=CLEAN_COLUMNS).to_csv(output_path, index=False)
+        print("▶️  Rebuilding the clean dataset from scratch")
+
+    added = 0
+
+    def write(clean):
+        nonlocal added
+        clean.to_csv(output_path, mode="a", header=False, index=False)
+        added += len(clean)
+
+    for file_name, country, scrape_date, path, start, end in csv_work:
+        # Continuing after the rows already cleaned (whose header line was already read) or from the top
+        reader = _ByteRange(path, start or 0, end)
+        names = pd.read_csv(path, nrows=0).columns if start else None
+        try:
+            if start is None or start < end:
+                dtypes = {"Gender": "category", "Is_Smoker": "category"} # Few distinct values, so stored compactly
+                chunks = pd.read_csv(reader, chunksize=chunksize, dtype=dtypes, encoding="utf-8", header=None if start else "infer", names=names)
+                for chunk in chunks:
+                    chunk.columns = chunk.columns.str.strip()
+                    write(clean_csv_chunk(chunk, country, scrape_date, rates))
+        finally:
+            reader.close()
+        # A source without new rows still ends where the manifest says (the output may since have been cut after it)
+        output_end = manifest["sources"][file_name]["output_end"] if start == end else output_path.stat().st_size
+        manifest["sources"][file_name] = {"offset": end, "hash": tail_hash(path, end), "output_end": output_end}
+
+    for path in parquet_files:
+        key = path.relative_to(dataset_dir).as_posix()
+        if key in manifest["parquet"]:
+            continue
+        site = re.search(r"site=([^/\\]+)", key).group(1)
+        scrape_date = re.search(r"scrape_date=(\d{4}-\d{2}-\d{2})", key).group(1)
+        columns = ["coverage", "term", "age", "gender", "smoker_status", "premium_minor"]
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            write(clean_parquet_batch(batch.to_pandas(), site, scrape_date, rates))
+        manifest["parquet"][key] = {"bytes": path.stat().st_size, "mtime": path.stat().st_mtime_ns, "output_end": output_path.stat().st_size}
+
+    manifest["output_bytes"] = output_path.stat().st_size
+    manifest["rates"] = file_hash(rates_path)
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return added
+
+
+def category_counts(output_path=CLEAN_PATH, chunksize=CHUNKSIZE):
+    """Counts the values of each binary column of the clean dataset (for the table in the report), chunk by chunk.
+
+    Returns:
+        counts (dict): Column name → pandas.Series of value counts.
+    """
+    columns = ["Is_Male", "Is_Smoker", "Is_UK"]
+    counts = {column: pd.Series(dtype=np.int64) for column in columns}
+    for chunk in pd.read_csv(output_path, usecols=columns, chunksize=chunksize):
+        for column in columns:
+            counts[column] = counts[column].add(chunk[column].value_counts(dropna=False), fill_value=0).astype(np.int64)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean the raw scraper outputs into data/clean/all_quotes.csv.")
+    parser.add_argument("--full", action="store_true", help="rebuild the whole clean dataset instead of only adding new raw rows")
+    parser.add_argument("--dataset", type=Path, default=None, help="also clean this typed Parquet quotes dataset (e.g. data/raw/quotes)")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="raw rows processed at a time")
+    parser.add_argument("--output", type=Path, default=CLEAN_PATH, help="clean CSV to write")
+    args = parser.parse_args()
+
+    added = clean_quotes(output_path=args.output, dataset_dir=args.dataset, full=args.full, chunksize=args.chunksize)
+    # Printing value counts of each categorical variable (for table in final blog)
+    for column, counts in category_counts(args.output).items():
+        print(f"--- {column} ---")
+        print(f"{counts}\n")
+    print(f"📁 All done — {added} new rows cleaned into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# Standard libraries
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Third-party libraries
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_PATH = ROOT / "data" / "clean" / "all_quotes.csv"
+TARGET = "ln(Premium)"
+DROPPED = ["Premium (£)", TARGET] # Columns which aren't features
+
+SCALES = [1, 10, 100]  # Benchmarked dataset sizes, as multiples of all_quotes.csv
+SHAP_ROWS = 200        # Rows explained per SHAP timing (against a SHAP_BACKGROUND-row background)
+SHAP_BACKGROUND = 100
+JITTERED = ["ln(Coverage_Amount)", "Term_Length", "Age"] # Features moved off the scraped grid in synthetic rows
+
+
+class ModelEngine:
+    """A kind of premium model: the estimator behind it, its default hyperparameters and how its size is counted.
+
+    Every engine is a tree ensemble, so the rest of the analysis (ModelStore, TreeSHAP, PDP/ICE, serving) works
+    unchanged whichever one is picked.
+    """
+
+    def __init__(self, name, estimator, defaults, size_param, can_grow=False, description=""):
+        """
+        Args:
+            name (str): Engine name, as stored in the model registry.
+            estimator (type): scikit-learn regressor class.
+            defaults (dict): Default hyperparameters, overridden by those passed to build().
+            size_param (str): Hyperparameter counting the ensemble's trees (e.g. "n_estimators").
+            can_grow (bool): If True, models can be grown with warm_start when rows are added (see ModelStore).
+            description (str): One-line summary, shown by the benchmark.
+        """
+        self.name = name
+        self.estimator = estimator
+        self.defaults = defaults
+        self.size_param = size_param
+        self.can_grow = can_grow
+        self.description = description
+
+    def params(self, params=None):
+        """The engine's defaults, overridden by params."""
+        return {**self.defaults, **(params or {})}
+
+    def build(self, params=None):
+        """An unfitted estimator with the engine's defaults, overridden by params."""
+        return self.estimator(**self.params(params))
+
+    def size(self, params=None):
+        """Number of trees a model built with params has."""
+        return self.params(params)[self.size_param]
+
+
+ENGINES = {
+    engine.name: engine for engine in [
+        # The analysis' original model: deep, fully grown trees, most accurate on the grid but large and slow to explain
+        ModelEngine("forest", RandomForestRegressor, {"n_estimators": 500, "random_state": 42, "n_jobs": -1},
+                    size_param="n_estimators", can_grow=True, description="500 fully grown trees"),
+        # Fewer trees with a bounded number of leaves, so size and SHAP cost stop growing with the data
+        ModelEngine("compact-forest", RandomForestRegressor,
+                    {"n_estimators": 64, "max_leaf_nodes": 512, "min_samples_leaf": 5, "max_samples": 0.5, "random_state": 42, "n_jobs": -1},
+                    size_param="n_estimators", can_grow=True, description="64 trees of at most 512 leaves, on half-size bootstraps"),
+        # Binned features make fitting near-linear in rows, and shallow trees keep the model small
+        ModelEngine("hgb", HistGradientBoostingRegressor, {"max_iter": 500, "early_stopping": False, "random_state": 42},
+                    size_param="max_iter", description="histogram gradient boosting, 500 iterations of 31-leaf trees"),
+    ]
+}
+DEFAULT_ENGINE = "forest"
+
+
+def get_engine(engine):
+    """Returns the ModelEngine named engine (or engine itself if it already is one)."""
+    if isinstance(engine, ModelEngine):
+        return engine
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown model engine {engine!r}, expected one of {sorted(ENGINES)}")
+    return ENGINES[engine]
+
+
+def synthetic_quotes(df, scale, random_state=42):
+    """Grows the cleaned quotes to scale × their rows, as a denser scraped grid would.
+
+    Each synthetic row is a real quote moved off the grid: coverage, term and age are jittered by up to half the gap
+    between grid levels, and ln(Premium) is shifted by how much a smooth trend (quadratic ridge fitted on the real
+    quotes) changes between the two points. This keeps the real quotes' noise and steps (providers, age bands)
+    without favouring any engine. scale=1 returns the real quotes unchanged.
+
+    Returns:
+        df (pandas.DataFrame): Same columns as df, scale × as many rows.
+    """
+    if scale <= 1:
+        return df
+    rng = np.random.default_rng(random_state)
+    features = [column for column in df.columns if column not in DROPPED]
+    trend = make_pipeline(PolynomialFeatures(2), Ridge(alpha=1.0)).fit(df[features], df[TARGET])
+
+    base = df.iloc[rng.integers(0, len(df), size=len(df) * (scale - 1))].reset_index(drop=True)
+    moved = base.copy()
+    for column in JITTERED:
+        levels = np.unique(df[column])
+        step = np.diff(levels).min() if len(levels) > 1 else 0
+        moved[column] = np.clip(base[column] + rng.uniform(-step / 2, step / 2, len(base)), levels.min(), levels.max())
+    moved["Age"] = moved["Age"].round()
+    moved["Term_Length"] = moved["Term_Length"].round()
+    moved[TARGET] = base[TARGET] + trend.predict(moved[features]) - trend.predict(base[features])
+    moved["Premium (£)"] = np.exp(moved[TARGET]).round(2)
+    return pd.concat([df, moved], ignore_index=True)
+
+
+def model_bytes(model):
+    """Size of a fitted model as the model store would save it (joblib, compression level 3)."""
+    # Through a temporary file rather than memory, as a large forest's dump can be as big as the forest itself
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.joblib"
+        joblib.dump(model, path, compress=3)
+        return path.stat().st_size
+
+
+def shap_seconds(model, X_background, X, rows=SHAP_ROWS, background=SHAP_BACKGROUND):
+    """Seconds taken to explain `rows` rows of X with interventional TreeSHAP, as analysis.shap_cache does."""
+    import shap
+
+    explainer = shap.TreeExplainer(model, X_background.sample(min(background, len(X_background)), random_state=42),
+                                   feature_perturbation="interventional")
+    start = time.perf_counter()
+    explainer(X.iloc[:rows], check_additivity=False)
+    return time.perf_counter() - start
+
+
+def benchmark(df, engines=tuple(ENGINES), scales=SCALES, shap_rows=SHAP_ROWS):
+    """Fits every engine on synthetic datasets of each scale and measures the analysis' costs.
+
+    Args:
+        df (pandas.DataFrame): Cleaned quotes (all_quotes.csv).
+        engines (iterable): Engine names to benchmark.
+        scales (iterable): Dataset sizes, as multiples of df's rows (see synthetic_quotes).
+        shap_rows (int): Rows explained per SHAP timing.
+    Returns:
+        results (list): One dict per (scale, engine): rows, fit_s, predict_rows_per_s, size_mb,
+            shap_ms_per_row and rmse (held-out, on ln(Premium)).
+    """
+    results = []
+    for scale in scales:
+        data = synthetic_quotes(df, scale)
+        X, y = data.drop(columns=DROPPED), data[TARGET]
+        # Same split as the notebook
+        X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=42)
+        for name in engines:
+            engine = get_engine(name)
+            model = engine.build()
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            predictions = model.predict(X_test)
+            predict_seconds = time.perf_counter() - start
+
+            shap_time = shap_seconds(model, X_train, X_test, rows=shap_rows)
+            result = {
+                "scale": scale,
+                "engine": engine.name,
+                "rows": len(data),
+                "fit_s": fit_seconds,
+                "predict_rows_per_s": len(X_test) / predict_seconds,
+                "size_mb": model_bytes(model) / 1e6,
+                "shap_ms_per_row": shap_time / min(shap_rows, len(X_test)) * 1000,
+                "rmse": float(np.sqrt(np.mean((predictions - y_test) ** 2))),
+            }
+            results.append(result)
+            print(f"{scale:>5}× {engine.name:<16}{result['rows']:>10}{result['fit_s']:>10.2f}{result['predict_rows_per_s']:>14.0f}"
+                  f"{result['size_mb']:>11.2f}{result['shap_ms_per_row']:>12.2f}{result['rmse']:>9.4f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the premium model engines on the cleaned quotes, scaled up synthetically.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES), help="engines to benchmark")
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES, help="dataset sizes, as multiples of all_quotes.csv")
+    parser.add_argument("--shap-rows", type=int, default=SHAP_ROWS, help="rows explained per SHAP timing")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="cleaned quotes CSV")
+    parser.add_argument("--output", type=Path, default=None, help="optional JSON file to write the results to")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    for name in args.engines:
+        print(f"⚙️  {name}: {ENGINES[name].description}")
+    print(f"{'scale':>6} {'engine':<16}{'rows':>10}{'fit (s)':>10}{'predict/s':>14}{'size (MB)':>11}{'SHAP ms/row':>12}{'RMSE':>9}")
+    results = benchmark(df, engines=args.engines, scales=args.scales, shap_rows=args.shap_rows)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"📁 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
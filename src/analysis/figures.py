@@ -0,0 +1,400 @@
+# Standard libraries
+import hashlib
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Third-party libraries
+import joblib
+import matplotlib
+import numpy as np
+from PIL import Image
+from scipy.stats.mstats import mquantiles
+from sklearn.inspection import PartialDependenceDisplay, partial_dependence
+
+# Local imports
+from .ice import grouped_ice
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+FIGURES_DIR = ROOT / "output" / "figures"
+PREVIEW_DIR = FIGURES_DIR / "preview" # Low-DPI previews, kept apart from the report's figures
+
+DPI = 500        # Resolution of the report's figures
+PREVIEW_DPI = 60 # Resolution in preview mode, for quick iteration
+HASH_KEY = "InputsHash" # PNG text chunk holding the hash a figure was rendered from
+
+
+# === Plot functions (each takes plain arrays/DataFrames and returns its figure) ===
+def plot_premium_distribution(premiums):
+    """Fig01: side-by-side histograms of raw and log-transformed premiums."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))  # 1 row, 2 columns
+
+    # Plotting Raw premium distribution
+    sns.histplot(premiums["Premium (£)"], bins=30, kde=True, ax=axes[0], color="skyblue")
+    axes[0].set_title("Distribution of Raw Premiums")
+
+    # Plotting log-transformed premium
+    sns.histplot(premiums["ln(Premium)"], bins=30, kde=True, ax=axes[1], color="salmon")
+    axes[1].set_title("Distribution of Log-Transformed Premiums")
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_correlation_matrix(df):
+    """Fig02: heatmap of correlations across all numeric features, except the raw premium."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig = plt.figure(figsize=(8, 6))
+
+    # Forming our correlation matrix
+    corr = df.drop(columns="Premium (£)").corr()
+
+    # Getting the Upper Triangle of the co-relation matrix
+    mask = np.triu(corr)
+    # Including the main diagonal
+    np.fill_diagonal(mask, False)
+
+    # Plotting our heatmap
+    sns.heatmap(corr, annot=True, mask=mask, cmap="Reds", fmt=".2f")
+    plt.xticks(rotation=45)
+    plt.suptitle("Correlation Heatmap")
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_demographic_trends(df):
+    """Fig03: average premium by age across gender, smoking status and UK residency (FacetGrid)."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # === Setting up the FacetGrid: by UK residency (columns), Smoking status (rows), colored by gender ===
+    g = sns.FacetGrid(df, col="Is_UK", row="Is_Smoker", hue="Is_Male", height=4, palette={"violet", "dodgerblue"})
+
+    # Plotting lineplot of age vs. premium in each subplot
+    g.map_dataframe(sns.lineplot, x="Age", y="Premium (£)", marker="o")
+    plt.subplots_adjust(top=0.9) # Making space for suptitle
+    g.tick_params(bottom=True) # Adding tick marks
+    g.figure.suptitle("Average Premium Trends by Demographics")
+
+    # Adding our legend
+    g.add_legend(title="Gender")
+    for t, l in zip(g._legend.texts, ["Female", "Male"]):
+        t.set_text(l)
+    g._legend.set_bbox_to_anchor((1.025, 0.5))  # Moving legend to remove overlap
+
+    # === Setting more descriptive titles for subplots manually ===
+    # Creating our dictionary, where (False, False) maps to "Non-Smoker | US" etc.,
+    titles = {(smoker, uk): f"{'Smoker' if smoker else 'Non-Smoker'} | {'UK' if uk else 'US'}"
+              for smoker in [False, True] for uk in [False, True]}
+
+    # Adding our titles
+    for (smoker_status, uk_status), ax in g.axes_dict.items():
+        ax.set_title(titles[(smoker_status, uk_status)])
+    return g.figure
+
+
+def plot_pdps(pd_results, deciles, feature_names, features_to_plot):
+    """Fig04: PDPs of the features_to_plot (precomputed by figure_jobs), on a raw premium scale."""
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FuncFormatter
+
+    # Creating subplots: one for each feature
+    fig, ax = plt.subplots(1, len(features_to_plot), figsize=(6 * len(features_to_plot), 4))
+
+    # Plotting the precomputed PDPs, exactly as PartialDependenceDisplay.from_estimator would
+    indices = [feature_names.index(feature) for feature in features_to_plot]
+    PartialDependenceDisplay(
+        pd_results, features=[(i,) for i in indices], feature_names=feature_names, target_idx=0, deciles=deciles,
+        is_categorical=[(False,)] * len(indices),
+    ).plot(ax=ax)
+
+    # Formatting subplot titles
+    for axis, feature in zip(ax, features_to_plot):
+        axis.set_title(feature)
+
+    # Relabelling y-axis and x-axis to show raw premiums
+    for i, axis in enumerate(ax):
+        axis.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"£{int(np.exp(y)):,}"))
+        # Only for the ln(Coverage_Amount) plot
+        if features_to_plot[i] == "ln(Coverage_Amount)":
+            axis.xaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{round(np.exp(x) / 1e3) * 1e3 / 1e3:.0f}K"))
+            axis.set_xlabel("Coverage_Amount (£)\n [Rounded to nearest 1k]")
+
+    # Labelling only the first y-axis to avoid clutter
+    for i, axis in enumerate(ax):
+        if i != 0:
+            axis.set_ylabel("")
+        else:
+            axis.set_ylabel("Predicted Premium (£)")
+
+    # Plotting main title
+    plt.suptitle("PDPs for Age, ln(Coverage_Amount) and Term_Length")
+
+    # Adjusting layout to make space for legend
+    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    return fig
+
+
+def plot_ice_grid(ice_results, features, group_vars, label_mappings, group_colors):
+    """Fig05: ICE + group/global PDPs, one subplot per feature (cols) × group var (rows), from grouped_ice results."""
+    import matplotlib.pyplot as plt
+
+    # Setting up subplots
+    fig, axes = plt.subplots(2, 2, figsize=(6 * 2, 4 * 2), sharey='row')
+    fig.suptitle("ICE + PDP Plots by Group", fontsize=16)
+
+    for i, feature in enumerate(features):
+        for j, group_var in enumerate(group_vars):
+            ax = axes[j, i] # Accessing current subplot axis
+            ice = ice_results[(feature, group_var)]
+            feature_vals = ice["grid"] # Grid of values to plot
+
+            # Plotting separately for each group value (0 or 1)
+            for group_val, group_ice in ice["groups"].items():
+                # Convert 0/1 to readable label (e.g., "Smoker" vs "Non-Smoker")
+                label = label_mappings.get(group_var, {}).get(group_val, f"{group_var} = {group_val}")
+                color = group_colors.get(group_val, "gray")
+
+                # Plotting individual ICE lines, then the PDP (mean of ICE) per group
+                ax.plot(feature_vals, group_ice["curves"].T, alpha=0.15, color=color)
+                ax.plot(feature_vals, group_ice["average"], label=f"Average {label}", linewidth=3, color=color, linestyle="--")
+
+            # Adding global PDP overlay (if any lines exist)
+            if ice["groups"]:
+                ax.plot(feature_vals, ice["global_average"], label="Global Average", linewidth=3, color="black")
+
+            # Label formatting
+            ax.set_title(f"{feature} by {group_var}")
+            ax.tick_params(bottom=True)
+            ax.set_ylabel("Predicted ln(Premium)" if i == 0 else "")  # Y label on first col only
+            ax.legend()
+
+    # Adjusting spacing to avoid overlap with suptitle
+    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    return fig
+
+
+def plot_shap_importance(shap_arrays):
+    """Fig06: mean(|SHAP|) feature importance, natively on the ln(Premium) scale and as % effects on premiums."""
+    import matplotlib.pyplot as plt
+    import shap
+
+    shap_values = shap.Explanation(**shap_arrays)
+
+    # Creating our subplots
+    fig, axes = plt.subplots(1, 2, figsize=(13, 5))
+
+    # === Left: Native SHAP Bar Plot on ln(Premium) Scale ===
+    shap.plots.bar(shap_values, show=False, ax=axes[0])
+    axes[0].set_title("SHAP Feature Importance\n[ln(Premium) Scale]", fontsize=14)
+    axes[0].set_xlabel("mean(|SHAP value|)", fontsize=13)
+    axes[0].tick_params(axis='x', labelsize=12)
+    axes[0].tick_params(axis='y', labelsize=12)
+
+    # === Right: Custom Horizontal Bar plot in % Space ===
+    # Creating custom bar plot since shap.plots.bar does not support converiting to % change
+    shap_vals = np.abs(shap_values.values).mean(0) # mean(|SHAP|) across all samples (across axis 0)
+    features = np.array(shap_values.feature_names) # Feature names array
+
+    # Sorting features by importance (ascending order will be converted to descending by barh)
+    idx = np.argsort(shap_vals)
+    shap_vals, feats = shap_vals[idx], features[idx]
+
+    # Custom bar plot with % effect annotations
+    axes[1].barh(feats, shap_vals, color="deeppink")
+
+    # Converting to custom x-axis tick labels showing % effect
+    xtick_vals = axes[1].get_xticks()
+    xtick_pct_labels = [(np.exp(x) - 1) * 100 for x in xtick_vals]
+    axes[1].set_xticks(xtick_vals) # To avoid UserWarning
+    axes[1].set_xticklabels([f"{pct:.0f}%" for pct in xtick_pct_labels])
+
+    # Annotate each bar with the exact % increase
+    for i, val in enumerate(shap_vals):
+        pct = (np.exp(val) - 1) * 100
+        axes[1].text(val + 0.01, i, f"+{pct:.0f}%", va="center", color="crimson")
+
+    # Axis styling for consistence and clarity
+    axes[1].set_title("SHAP Feature Importance\n[% Effect on Premium]", fontsize=14)
+    axes[1].set_xlabel("mean(|SHAP value|) [% Effect]", fontsize=13)
+    axes[1].tick_params(axis='x', labelsize=12)
+    axes[1].tick_params(axis='x', bottom=True)
+    axes[1].tick_params(axis='y', labelsize=12)
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_shap_beeswarm(shap_arrays):
+    """Fig07: SHAP beeswarm, showing how each feature's value dictates the direction of its effect."""
+    import matplotlib.pyplot as plt
+    import shap
+
+    fig = plt.figure(figsize=(10, 6))
+    shap.plots.beeswarm(shap.Explanation(**shap_arrays), show=False)
+    plt.suptitle("SHAP Beeswarm Plot")
+    plt.tight_layout()
+    return fig
+
+
+def plot_shap_waterfall(shap_row, percentile, idx):
+    """Fig08-10: SHAP waterfall of the test quote closest to a premium percentile."""
+    import matplotlib.pyplot as plt
+    import shap
+
+    shap.plots.waterfall(shap.Explanation(**shap_row), show=False)  # Plotting SHAP values for this sample
+    plt.title(f"Waterfall Plot for the {percentile}th Percentile Premium (index {idx})")
+    plt.tight_layout()
+    return plt.gcf()
+
+
+# === Building and rendering the figure jobs ===
+def explanation_arrays(shap_values, rows=slice(None)):
+    """Plain arrays of (some rows of) a shap.Explanation, cheap to hash and to send to another process."""
+    base_values = np.asarray(shap_values.base_values[rows])
+    return {
+        "values": np.asarray(shap_values.values[rows]),
+        "base_values": base_values if base_values.ndim else float(base_values), # A single row's is a plain float
+        "data": np.asarray(shap_values.data[rows]),
+        "feature_names": list(shap_values.feature_names),
+    }
+
+
+def figure_jobs(df, model, X, X_test, y_test, shap_values, grid_resolution=20, individuals_per_group=50):
+    """Computes every figure's inputs (the model-dependent ones here, once) and returns the jobs to render.
+
+    Args:
+        df (pandas.DataFrame): Clean quotes (all_quotes.csv).
+        model: Fitted model.
+        X (pandas.DataFrame): All features (for the PDPs).
+        X_test (pandas.DataFrame): Test features (for the ICE plots).
+        y_test (pandas.Series): Test ln(Premium), picking the waterfall plots' quotes.
+        shap_values (shap.Explanation): SHAP values of X_test.
+        grid_resolution (int): Number of points to compute per feature for the ICE plots.
+        individuals_per_group (int): Max individuals to sample per group for the ICE plots.
+    Returns:
+        jobs (list): (file name, plot function, keyword arguments) of each figure.
+    """
+    # PDPs for Age, ln(Coverage_Amount) and Term_Length
+    features_to_plot = ["Age", "ln(Coverage_Amount)", "Term_Length"]
+    feature_names = list(X.columns)
+    pd_results = [partial_dependence(model, X, [feature_names.index(f)], kind="average") for f in features_to_plot]
+    deciles = {
+        feature_names.index(f): mquantiles(X[f], prob=np.arange(0.1, 1.0, 0.1)) for f in features_to_plot
+    }
+
+    # ICE + PDP for Age & ln(Coverage_Amounts), by UK/US and Smoking Status
+    features = ["Age", "ln(Coverage_Amount)"]   # Features to analyse (one per column in subplot)
+    group_vars = ["Is_UK", "Is_Smoker"]         # Categorical grouping vars (one per row)
+    ice_results = {
+        (feature, group_var): grouped_ice(model, X_test, feature, group_var, grid_resolution, individuals_per_group,
+                                          random_state=42)
+        for feature in features for group_var in group_vars
+    }
+    label_mappings = {
+        "Is_UK": {0: "US", 1: "UK"},
+        "Is_Smoker": {0: "Non-Smoker", 1: "Smoker"}
+    }
+    group_colors = {0: "red", 1: "blue"}        # Consistent coloring per binary group
+
+    shap_arrays = explanation_arrays(shap_values)
+    jobs = [
+        ("Fig01-premdist", plot_premium_distribution, {"premiums": df[["Premium (£)", "ln(Premium)"]]}),
+        ("Fig02-corrhmap", plot_correlation_matrix, {"df": df}),
+        ("Fig03-avgdem", plot_demographic_trends, {"df": df}),
+        ("Fig04-PDPs", plot_pdps, {"pd_results": pd_results, "deciles": deciles, "feature_names": feature_names,
+                                   "features_to_plot": features_to_plot}),
+        ("Fig05-ICEs", plot_ice_grid, {"ice_results": ice_results, "features": features, "group_vars": group_vars,
+                                       "label_mappings": label_mappings, "group_colors": group_colors}),
+        ("Fig06-SHAPimp", plot_shap_importance, {"shap_arrays": shap_arrays}),
+        ("Fig07-SHAPbee", plot_shap_beeswarm, {"shap_arrays": shap_arrays}),
+    ]
+
+    # Waterfall plots of the test quotes closest to the 10th, 50th and 90th percentile premiums
+    percentiles = [10, 50, 90]
+    for i, (p, ln_premium) in enumerate(zip(percentiles, np.percentile(y_test, percentiles))):
+        idx = int(np.argmin(np.abs(y_test - ln_premium)))
+        jobs.append((f"Fig{8 + i:02d}-SHAPwater", plot_shap_waterfall,
+                     {"shap_row": explanation_arrays(shap_values, idx), "percentile": p, "idx": idx}))
+    return jobs
+
+
+def figure_hash(plot, kwargs, dpi):
+    """Hash of a figure's inputs, its plot function's code and the resolution it is saved at."""
+    digest = hashlib.sha1(inspect.getsource(plot).encode())
+    digest.update(joblib.hash(kwargs).encode())
+    digest.update(str(dpi).encode())
+    return digest.hexdigest()
+
+
+def saved_hash(path):
+    """Hash stored in an existing PNG (see render_figure), None if missing or rendered some other way."""
+    try:
+        with Image.open(path) as image:
+            return image.text.get(HASH_KEY)
+    except (OSError, AttributeError):
+        return None
+
+
+def _init_worker():
+    import seaborn as sns
+
+    matplotlib.use("Agg", force=True) # Rendering straight to files, never to a notebook or window
+    sns.set_theme()
+
+
+def render_figure(path, plot, kwargs, dpi, inputs_hash):
+    """Renders one figure to a PNG, storing inputs_hash in its metadata. Returns the time it took."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    fig = plot(**kwargs)
+    fig.savefig(path, dpi=dpi, bbox_inches="tight", metadata={HASH_KEY: inputs_hash})
+    plt.close("all")
+    return time.perf_counter() - start
+
+
+def render_figures(jobs, preview=False, workers=None, force=False, figures_dir=None):
+    """Renders figure jobs concurrently in a process pool, skipping figures whose inputs are unchanged.
+
+    Each PNG stores the hash of its inputs, plot function and DPI, and is only re-rendered when that hash changes.
+
+    Args:
+        jobs (list): (file name, plot function, keyword arguments), see figure_jobs.
+        preview (bool): If True, renders at PREVIEW_DPI into PREVIEW_DIR, leaving the report's figures untouched.
+        workers (int): Processes rendering figures, defaults to the number of CPUs.
+        force (bool): If True, re-renders every figure.
+        figures_dir (str | Path): Where to save the PNGs (defaults to FIGURES_DIR, or PREVIEW_DIR in preview mode).
+    Returns:
+        paths (list): Path of each job's PNG, in job order.
+    """
+    dpi = PREVIEW_DPI if preview else DPI
+    figures_dir = Path(figures_dir or (PREVIEW_DIR if preview else FIGURES_DIR))
+    figures_dir.mkdir(parents=True, exist_ok=True)
+
+    paths, pending = [], []
+    for file_name, plot, kwargs in jobs:
+        path = figures_dir / f"{file_name}.png"
+        paths.append(path)
+        inputs_hash = figure_hash(plot, kwargs, dpi)
+        if force or saved_hash(path) != inputs_hash:
+            pending.append((path, plot, kwargs, dpi, inputs_hash))
+    print(f"✔️  {len(jobs) - len(pending)} figures unchanged, rendering {len(pending)} at {dpi} DPI")
+
+    if pending:
+        start = time.perf_counter()
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(render_figure, *job) for job in pending]
+            for job, future in zip(pending, futures):
+                print(f"Saved to: {job[0]} ({future.result():.1f}s)")
+        print(f"✅ Rendered {len(pending)} figures in {time.perf_counter() - start:.1f}s ({workers} processes)")
+    return paths
@@ -0,0 +1,83 @@
+# Standard libraries
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party libraries
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 250_000 # Design matrix rows predicted per call, bounding memory use
+
+
+def feature_grid(X, feature, grid_resolution):
+    """Evenly spaced values between a feature's min and max, the x-axis of its ICE/PDP curves."""
+    return np.linspace(X[feature].min(), X[feature].max(), grid_resolution)
+
+
+def ice_curves(model, X, feature, grid, chunk_rows=CHUNK_ROWS, workers=1):
+    """Computes ICE curves for every row of X, predicting the whole (individuals × grid) design matrix at once.
+
+    The design matrix is built once as a NumPy array (each row repeated for every grid value, with the feature
+    overwritten), then predicted in a single call, or in chunks of chunk_rows when it is larger than that.
+
+    Args:
+        model: Fitted regressor with a predict method (trained on X's columns).
+        X (pandas.DataFrame): Individuals to compute curves for.
+        feature (str): Feature varied along the grid.
+        grid (numpy.ndarray): Values the feature takes (see feature_grid).
+        chunk_rows (int): Maximum rows per predict call.
+        workers (int): Chunks predicted concurrently (threads, as predict mostly releases the GIL).
+    Returns:
+        curves (numpy.ndarray): Shape (len(X), len(grid)), one prediction curve per individual.
+    """
+    grid = np.asarray(grid, dtype=float)
+    design = np.repeat(X.to_numpy(dtype=float), len(grid), axis=0)
+    design[:, X.columns.get_loc(feature)] = np.tile(grid, len(X))
+
+    # Keeping column names so the model doesn't warn about missing feature names
+    def predict(rows):
+        return model.predict(pd.DataFrame(rows, columns=X.columns, copy=False))
+
+    chunks = [design[start:start + chunk_rows] for start in range(0, len(design), chunk_rows)]
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            preds = list(executor.map(predict, chunks))
+    else:
+        preds = [predict(chunk) for chunk in chunks]
+    return np.concatenate(preds).reshape(len(X), len(grid)) if preds else np.empty((0, len(grid)))
+
+
+def grouped_ice(model, X, feature, group_var, grid_resolution=20, individuals_per_group=50, random_state=42,
+                chunk_rows=CHUNK_ROWS, workers=1):
+    """ICE curves for a sample of individuals from each group, along with group and global averages (PDPs).
+
+    Individuals are sampled per group exactly as before (`sample(..., random_state=random_state)`), then all groups'
+    curves are predicted together in one batch.
+
+    Args:
+        model: Fitted regressor with a predict method.
+        X (pandas.DataFrame): Data to sample individuals from (e.g. X_test).
+        feature (str): Feature varied along the grid.
+        group_var (str): Categorical column to group individuals by (e.g. "Is_UK").
+        grid_resolution (int): Number of grid points, spanning the feature's range in X.
+        individuals_per_group (int): Maximum individuals sampled from each group.
+        random_state (int): Seed of the per-group sampling.
+        chunk_rows, workers: Passed through to ice_curves.
+    Returns:
+        ice (dict): "grid" (numpy.ndarray), "groups" ({group value: {"curves", "average"}}, in sorted order) and
+            "global_average" (mean of all sampled curves).
+    """
+    grid = feature_grid(X, feature, grid_resolution)
+    samples = {}
+    for group_val in sorted(X[group_var].unique()):
+        group_df = X[X[group_var] == group_val]
+        samples[group_val] = group_df.sample(min(individuals_per_group, len(group_df)), random_state=random_state)
+
+    curves = ice_curves(model, pd.concat(samples.values()), feature, grid, chunk_rows=chunk_rows, workers=workers)
+
+    groups = {}
+    start = 0
+    for group_val, sample_df in samples.items():
+        group_curves = curves[start:start + len(sample_df)]
+        groups[group_val] = {"curves": group_curves, "average": group_curves.mean(axis=0)}
+        start += len(sample_df)
+    return {"grid": grid, "groups": groups, "global_average": curves.mean(axis=0)}
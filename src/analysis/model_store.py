@@ -0,0 +1,191 @@
+# Standard libraries
+import argparse
+import hashlib
+import json
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Third-party libraries
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+# Local imports
+from .engines import DEFAULT_ENGINE, get_engine
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+MODEL_DIR = ROOT / ".cache" / "models"
+
+IGNORED_PARAMS = {"n_jobs", "verbose", "warm_start"} # Don't change the fitted model, so aren't part of its key
+COMPRESS = 3 # joblib compression level, 0 stores raw arrays which can then be loaded memory-mapped
+
+
+def row_hashes(X, y):
+    """One 64-bit hash per training row (features and target), used to tell which rows a model was trained on."""
+    return pd.util.hash_pandas_object(X.assign(__target=np.asarray(y)), index=False).to_numpy()
+
+
+def data_hash(hashes):
+    """Order-independent hash of a training set, from its row hashes."""
+    return hashlib.sha1(np.sort(hashes).tobytes()).hexdigest()
+
+
+def model_params(params, size_param="n_estimators"):
+    """Hyperparameters that define a model, without its tree count (tracked separately) and IGNORED_PARAMS."""
+    return {key: value for key, value in sorted(params.items()) if key not in IGNORED_PARAMS | {size_param}}
+
+
+class ModelStore:
+    """Registry of fitted premium models on disk, so an unchanged training configuration is reloaded instead
+    of retrained.
+
+    Each artifact is a joblib file keyed by the model engine (see analysis.engines), the training data's hash, the
+    feature list and the hyperparameters. registry.json records, per artifact, its fit time, file size and latest
+    load time.
+    """
+
+    def __init__(self, store_dir=MODEL_DIR, compress=COMPRESS):
+        """
+        Args:
+            store_dir (str | Path): Directory holding the artifacts and registry.json.
+            compress (int): joblib compression level of new artifacts (0 to allow memory-mapped loads).
+        """
+        self.store_dir = Path(store_dir)
+        self.compress = compress
+        self.registry_path = self.store_dir / "registry.json"
+        self.registry = json.loads(self.registry_path.read_text()) if self.registry_path.exists() else {}
+        for entry in self.registry.values():
+            entry.setdefault("engine", "forest") # Stored before engines existed, when every model was a random forest
+
+    def train(self, X, y, params=None, grow=False, grow_trees=None, engine=DEFAULT_ENGINE):
+        """Returns a model fitted on (X, y), reusing a stored artifact whenever possible.
+
+        Args:
+            X (pandas.DataFrame): Training features.
+            y (pandas.Series): Training target.
+            params (dict): Hyperparameters, overriding the engine's defaults.
+            grow (bool): If no artifact matches exactly but one was trained on a subset of these rows (e.g. before
+                new quotes were appended) with the same hyperparameters, grows it with warm_start instead of
+                retraining: extra trees are fitted on the full data, the existing trees are kept. Forest engines only.
+            grow_trees (int): Trees added when growing, defaults to n_estimators × the share of new rows.
+            engine (str): Model engine (see analysis.engines.ENGINES).
+        Returns:
+            model: Fitted (or reloaded) model.
+        """
+        engine = get_engine(engine)
+        params = engine.params(params)
+        grow = grow and engine.can_grow
+        hashes = row_hashes(X, y)
+        base = {
+            "engine": engine.name,
+            "data_hash": data_hash(hashes),
+            "features": list(X.columns),
+            "params": model_params(params, engine.size_param),
+            "sklearn": sklearn.__version__,
+        }
+        n_estimators = engine.size(params)
+
+        for key, entry in self.registry.items():
+            if self._matches(entry, base) and (entry["n_estimators"] == n_estimators and not entry["grown_from"]
+                                               or grow and entry["grown_from"]):
+                return self.load(key)
+
+        if grow:
+            # Growing the model trained on the most rows
+            for key, entry in sorted(self.registry.items(), key=lambda item: -item[1]["rows"]):
+                trained_on = self.store_dir / f"{key}.rows.npy"
+                if (
+                    entry["engine"] == base["engine"]
+                    and entry["features"] == base["features"] and entry["params"] == base["params"]
+                    and entry["sklearn"] == base["sklearn"] and trained_on.exists()
+                    and np.isin(np.load(trained_on), hashes).all()
+                ):
+                    return self._grow(key, X, y, params, base, hashes, grow_trees)
+
+        start = time.perf_counter()
+        model = engine.build(params).fit(X, y)
+        return self._save(model, base, hashes, time.perf_counter() - start, grown_from=None)
+
+    def load(self, key):
+        """Loads a stored model by key, recording how long it took."""
+        entry = self.registry[key]
+        start = time.perf_counter()
+        model = joblib.load(self.store_dir / entry["file"], mmap_mode=None if entry["compress"] else "r")
+        entry["load_seconds"] = round(time.perf_counter() - start, 4)
+        self._write_registry()
+        print(f"♻️  Loaded {entry['engine']} model {key} ({entry['n_estimators']} trees) in {entry['load_seconds']:.2f}s")
+        return model
+
+    def _grow(self, key, X, y, params, base, hashes, grow_trees):
+        """Adds trees fitted on the full (X, y) to the model stored under key."""
+        model = self.load(key)
+        new_rows = len(X) - len(np.load(self.store_dir / f"{key}.rows.npy"))
+        grow_trees = grow_trees or max(1, math.ceil(model.n_estimators * new_rows / len(X)))
+        start = time.perf_counter()
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + grow_trees, n_jobs=params.get("n_jobs"))
+        model.fit(X, y)
+        model.set_params(warm_start=False)
+        print(f"🌱 Grew model {key} by {grow_trees} trees for {new_rows} new rows")
+        return self._save(model, base, hashes, time.perf_counter() - start, grown_from=key)
+
+    def _save(self, model, base, hashes, fit_seconds, grown_from):
+        n_estimators = get_engine(base["engine"]).size(model.get_params())
+        identity = {**base, "n_estimators": n_estimators, "grown_from": grown_from}
+        key = hashlib.sha1(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:16]
+        path = self.store_dir / f"{key}.joblib"
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, path, compress=self.compress)
+        np.save(self.store_dir / f"{key}.rows.npy", hashes)
+        self.registry[key] = {
+            **base,
+            "file": path.name,
+            "n_estimators": n_estimators,
+            "rows": len(hashes),
+            "grown_from": grown_from,
+            "compress": self.compress,
+            "fit_seconds": round(fit_seconds, 2),
+            "size_bytes": path.stat().st_size,
+            "load_seconds": None,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self._write_registry()
+        print(f"✅ Trained {base['engine']} model {key} in {fit_seconds:.1f}s ({path.stat().st_size / 1e6:.1f} MB on disk)")
+        return model
+
+    @staticmethod
+    def _matches(entry, base):
+        return all(entry[field] == value for field, value in base.items())
+
+    def _write_registry(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.registry_path.write_text(json.dumps(self.registry, indent=2))
+
+
+def train_model(X, y, params=None, grow=False, store_dir=MODEL_DIR, engine=DEFAULT_ENGINE):
+    """Shortcut for `ModelStore(store_dir).train(X, y, params, grow=grow, engine=engine)`."""
+    return ModelStore(store_dir).train(X, y, params, grow=grow, engine=engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the stored models with their fit time, size and load time.")
+    parser.add_argument("--store", type=Path, default=MODEL_DIR, help="model store directory")
+    args = parser.parse_args()
+
+    registry = ModelStore(args.store).registry
+    if not registry:
+        print(f"No models stored in {args.store}")
+        return
+    for key, entry in registry.items():
+        load = f"{entry['load_seconds']:.2f}s" if entry["load_seconds"] is not None else "never"
+        grown = f", grown from {entry['grown_from']}" if entry["grown_from"] else ""
+        print(
+            f"{key}  {entry['engine']:<15}{entry['n_estimators']:>4} trees  {entry['rows']:>7} rows  fit {entry['fit_seconds']:>7.1f}s  "
+            f"{entry['size_bytes'] / 1e6:>7.1f} MB  load {load}{grown}"
+        )
+
+
+if __name__ == "__main__":
+    main()
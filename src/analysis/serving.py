@@ -0,0 +1,307 @@
+# Standard libraries
+import argparse
+import importlib.util
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from itertools import product
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Third-party libraries
+import numpy as np
+import pandas as pd
+
+# Local imports
+from .cleaning import usd_gbp_rates
+from .model_store import ModelStore
+
+SRC = Path(__file__).resolve().parent.parent
+FEATURES = ["ln(Coverage_Amount)", "Term_Length", "Age", "Is_Male", "Is_Smoker", "Is_UK"] # Model inputs, in order
+COUNTRIES = ["US", "UK"]
+GENDERS = ["Female", "Male"]
+
+MAX_BATCH = 256      # Off-grid queries predicted per model call
+MAX_WAIT = 0.002     # Seconds the batcher waits for more off-grid queries before predicting
+CACHE_SIZE = 100_000 # Off-grid predictions kept in the LRU cache
+LATENCY_WINDOW = 10_000 # Latest request latencies kept for the p99 metric
+
+
+def load_scrape_util(name):
+    """A standalone module of the scrapers' utils (e.g. data_sample), loaded by path to avoid importing the Selenium utilities."""
+    spec = importlib.util.spec_from_file_location(name, SRC / "01_scrape" / "utils" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+local_server = load_scrape_util("local_server") # HTTP server base shared with the scrapers' mock and replay servers
+
+
+def parse_query(query):
+    """Normalises a profile query into a hashable (coverage, term, age, gender, smoker, country) tuple.
+
+    Args:
+        query (dict): coverage (in the country's currency), term (years), age, gender ("Male"/"Female"),
+            smoker (bool, or "Smoker"/"Non-Smoker"), country ("UK"/"US").
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    try:
+        smoker = query["smoker"]
+        if isinstance(smoker, str):
+            smoker = smoker.strip().lower() in ("1", "true", "yes", "smoker")
+        profile = (
+            float(query["coverage"]), int(query["term"]), int(query["age"]),
+            str(query["gender"]).capitalize(), bool(smoker), str(query["country"]).upper(),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid query {query!r}: {e}") from None
+    if profile[3] not in GENDERS or profile[5] not in COUNTRIES or profile[0] <= 0:
+        raise ValueError(f"Invalid query {query!r}")
+    return profile
+
+
+class PremiumService:
+    """Answers "what monthly premium (£) for this profile?" queries from a trained model, at high request rates.
+
+    Every profile of the scrapers' discrete grid (coverage × term × age × gender × smoker × country) is predicted
+    up front into an array, so grid queries are plain O(1) lookups. Off-grid queries go through an LRU cache, then a
+    background thread which micro-batches them into single model calls. Request rate and latency are tracked for
+    metrics().
+    """
+
+    def __init__(self, model, usd_gbp, max_batch=MAX_BATCH, max_wait=MAX_WAIT, cache_size=CACHE_SIZE):
+        """
+        Args:
+            model: Fitted regressor predicting ln(Premium) from FEATURES.
+            usd_gbp (float): USD→GBP rate, converting US coverage like the cleaning did.
+            max_batch (int): Maximum off-grid queries per model call.
+            max_wait (float): Seconds to wait for a batch to fill up.
+            cache_size (int): Maximum off-grid predictions kept in the LRU cache.
+        """
+        self.model = model
+        self.usd_gbp = usd_gbp
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+
+        # Precomputing the whole grid: one axis per profile field, each with a value → index map
+        sample = load_scrape_util("data_sample")
+        self.axes = [
+            sorted(sample.coverage_amounts), sorted(sample.term_lengths), sorted(sample.ages), GENDERS, [False, True],
+            COUNTRIES,
+        ]
+        self.index = [{value: i for i, value in enumerate(axis)} for axis in self.axes]
+        start = time.perf_counter()
+        profiles = list(product(*self.axes))
+        self.table = self._predict(profiles).reshape([len(axis) for axis in self.axes])
+        print(f"✅ Precomputed {len(profiles)} grid premiums in {time.perf_counter() - start:.2f}s")
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue = deque()
+        self._queue_ready = threading.Condition()
+        self._closed = False
+        self._batcher = threading.Thread(target=self._batch_loop, daemon=True)
+        self._batcher.start()
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._times = deque() # Request completion times of the last minute, for the request rate
+        self._counts = {"grid": 0, "cache": 0, "model": 0}
+        self._batches = 0
+        self._started = time.monotonic()
+
+    def features(self, profiles):
+        """Model inputs of profiles, converting US coverage to GBP and log-transforming it as in all_quotes.csv."""
+        coverage, term, age, gender, smoker, country = (np.array(column) for column in zip(*profiles))
+        is_uk = country == "UK"
+        coverage_gbp = np.where(is_uk, coverage, np.round(coverage * self.usd_gbp, 2))
+        return pd.DataFrame({
+            "ln(Coverage_Amount)": np.log(coverage_gbp.astype(float)),
+            "Term_Length": term.astype(np.int64),
+            "Age": age.astype(np.int64),
+            "Is_Male": (gender == "Male").astype(np.int64),
+            "Is_Smoker": smoker.astype(np.int64),
+            "Is_UK": is_uk.astype(np.int64),
+        }, columns=FEATURES)
+
+    def _predict(self, profiles):
+        return np.round(np.exp(self.model.predict(self.features(profiles))), 2)
+
+    def _grid_index(self, profile):
+        try:
+            return tuple(index[value] for index, value in zip(self.index, profile))
+        except KeyError:
+            return None # Off the grid
+
+    def predict(self, query):
+        """Predicted monthly premium (£) of one profile query (see parse_query), with where it came from."""
+        return self.predict_many([query])[0]
+
+    def predict_many(self, queries):
+        """Predicts several queries at once.
+
+        Returns:
+            results (list): (premium, source) per query, source being "grid", "cache" or "model".
+        """
+        start = time.perf_counter()
+        profiles = [parse_query(query) for query in queries]
+        results = [None] * len(profiles)
+        waiting = []
+        for i, profile in enumerate(profiles):
+            grid_index = self._grid_index(profile)
+            if grid_index is not None:
+                results[i] = (float(self.table[grid_index]), "grid")
+                continue
+            with self._cache_lock:
+                premium = self._cache.get(profile)
+                if premium is not None:
+                    self._cache.move_to_end(profile)
+            if premium is not None:
+                results[i] = (premium, "cache")
+            else:
+                future = Future()
+                with self._queue_ready:
+                    self._queue.append((profile, future))
+                    self._queue_ready.notify()
+                waiting.append((i, future))
+        for i, future in waiting:
+            results[i] = (future.result(), "model")
+        self._record(results, time.perf_counter() - start)
+        return results
+
+    def _batch_loop(self):
+        """Collects off-grid queries for up to max_wait (or max_batch of them), then predicts them in one call."""
+        while True:
+            with self._queue_ready:
+                while not self._queue and not self._closed:
+                    self._queue_ready.wait()
+                if self._closed:
+                    return
+                deadline = time.monotonic() + self.max_wait
+                while len(self._queue) < self.max_batch and (left := deadline - time.monotonic()) > 0:
+                    self._queue_ready.wait(left)
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+            try:
+                premiums = self._predict([profile for profile, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            with self._cache_lock:
+                for (profile, _), premium in zip(batch, premiums):
+                    self._cache[profile] = float(premium)
+                    self._cache.move_to_end(profile)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            self._batches += 1
+            for (_, future), premium in zip(batch, premiums):
+                future.set_result(float(premium))
+
+    def _record(self, results, latency):
+        now = time.monotonic()
+        with self._stats_lock:
+            self._latencies.append(latency)
+            self._times.extend([now] * len(results))
+            while self._times and self._times[0] < now - 60:
+                self._times.popleft()
+            for _, source in results:
+                self._counts[source] += 1
+
+    def metrics(self):
+        """Request rate (over the last minute), latency percentiles (ms) and where answers came from."""
+        now = time.monotonic()
+        with self._stats_lock:
+            latencies = np.array(self._latencies) * 1000
+            window = min(60, now - self._started) or 1
+            recent = sum(1 for t in self._times if t >= now - 60)
+            counts = dict(self._counts)
+        return {
+            "requests_per_second": round(recent / window, 1),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None,
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3) if len(latencies) else None,
+            "answered": counts,
+            "model_batches": self._batches,
+            "cache_entries": len(self._cache),
+        }
+
+    def close(self):
+        with self._queue_ready:
+            self._closed = True
+            self._queue_ready.notify_all()
+        self._batcher.join()
+
+
+class PremiumServer(local_server.LocalServer):
+    """Local HTTP front end of a PremiumService. Use as a context manager, then query `server.url`.
+
+    GET /predict?coverage=250000&term=20&age=40&gender=Male&smoker=0&country=UK answers one profile, POST /predict
+    with a JSON list of such objects answers many, and GET /metrics returns PremiumService.metrics().
+    """
+
+    def __init__(self, service, host="127.0.0.1", port=8000):
+        self.service = service
+        super().__init__(host, port)
+
+    def _handler(self):
+        service = self.service
+
+        class Handler(local_server.LocalHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == "/metrics":
+                    return self._reply(200, service.metrics())
+                if url.path != "/predict":
+                    return self._reply(404, {"error": f"Unknown path {url.path}"})
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    premium, source = service.predict(query)
+                except ValueError as e:
+                    return self._reply(400, {"error": str(e)})
+                self._reply(200, {"premium_gbp": premium, "source": source})
+
+            def do_POST(self):
+                if urlsplit(self.path).path != "/predict":
+                    return self._reply(404, {"error": f"Unknown path {self.path}"})
+                try:
+                    queries = json.loads(self._body())
+                    results = service.predict_many(queries if isinstance(queries, list) else [queries])
+                except ValueError as e: # Includes malformed JSON
+                    return self._reply(400, {"error": str(e)})
+                self._reply(200, [{"premium_gbp": premium, "source": source} for premium, source in results])
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve premium predictions from a stored model over HTTP.")
+    parser.add_argument("--model", default=None, help="model store key (default: the most recently stored model)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="off-grid queries predicted per model call")
+    parser.add_argument("--max-wait", type=float, default=MAX_WAIT, help="seconds to wait for an off-grid batch to fill")
+    args = parser.parse_args()
+
+    store = ModelStore()
+    if not store.registry:
+        parser.error("no stored models, run 03_visualise.ipynb (or ModelStore.train) first")
+    key = args.model or max(store.registry, key=lambda key: store.registry[key]["created"])
+    usd_gbp = float(usd_gbp_rates()["usd_gbp"].iloc[-1]) # Latest rate in the table
+
+    service = PremiumService(store.load(key), usd_gbp, max_batch=args.max_batch, max_wait=args.max_wait)
+    with PremiumServer(service, args.host, args.port) as server:
+        print(f"🚀 Serving predictions of model {key} on {server.url}/predict (metrics on {server.url}/metrics)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
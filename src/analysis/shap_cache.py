@@ -0,0 +1,129 @@
+# Standard libraries
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Third-party libraries
+import joblib
+import numpy as np
+import pandas as pd
+import shap
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_DIR = ROOT / ".cache" / "shap"
+
+ROWS_PER_CHUNK = 500 # Rows explained per task handed to the process pool
+
+_worker_explainer = None # TreeExplainer of each pool process, built once by _init_worker
+
+
+def model_fingerprint(model):
+    """Hash of a fitted model's parameters and learned state (e.g. every tree's arrays), changing if it is retrained."""
+    return joblib.hash(model)
+
+
+def data_hash(X):
+    """Hash of a DataFrame's column names, index and values."""
+    digest = hashlib.sha1(json.dumps([str(column) for column in X.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def background_sample(X_background, background_size=None, random_state=42):
+    """Subsamples the explainer's background data (all of it if background_size is None or not smaller)."""
+    if background_size is None or background_size >= len(X_background):
+        return X_background
+    return X_background.sample(background_size, random_state=random_state)
+
+
+def _init_worker(model, background):
+    global _worker_explainer
+    _worker_explainer = shap.TreeExplainer(model, background, feature_perturbation="interventional")
+
+
+def _explain_chunk(chunk):
+    explanation = _worker_explainer(chunk)
+    return explanation.values, np.broadcast_to(explanation.base_values, len(chunk))
+
+
+def explain(model, X_background, X, background_size=None, workers=None, rows_per_chunk=ROWS_PER_CHUNK,
+            random_state=42, cache_dir=CACHE_DIR, refresh=False):
+    """Interventional TreeSHAP values of X, loaded from the on-disk cache when already computed.
+
+    Cache entries are keyed by the model's fingerprint, the hashes of X and of the background data, and the explainer
+    settings. On a miss, X is split into chunks explained across a process pool (each process builds its explainer
+    once) and the values are written straight into .npy files. Cached arrays are loaded memory-mapped, so the plots
+    read them without loading everything into memory first.
+
+    Args:
+        model: Fitted tree model (e.g. the notebook's RandomForestRegressor).
+        X_background (pandas.DataFrame): Background data of the explainer (e.g. X_train).
+        X (pandas.DataFrame): Rows to explain (e.g. X_test).
+        background_size (int): Rows subsampled from X_background, all of them if None (much slower for big sets).
+        workers (int): Processes explaining chunks, defaults to the number of CPUs.
+        rows_per_chunk (int): Rows of X explained per task.
+        random_state (int): Seed of the background subsample.
+        cache_dir (str | Path): Directory holding one subdirectory per cache entry.
+        refresh (bool): If True, recomputes even if cached.
+    Returns:
+        shap_values (shap.Explanation): Same as `shap.TreeExplainer(model, background)(X)`.
+    """
+    background = background_sample(X_background, background_size, random_state)
+    settings = {
+        "model": model_fingerprint(model),
+        "data": data_hash(X),
+        "background": data_hash(background),
+        "feature_perturbation": "interventional",
+        "shap": shap.__version__,
+    }
+    key = hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+    entry = Path(cache_dir) / key
+
+    if refresh or not (entry / "meta.json").exists():
+        _compute(model, background, X, entry, settings, workers, rows_per_chunk)
+    else:
+        print(f"♻️  Loaded cached SHAP values ({entry.name})")
+
+    # Plain ndarray views of the memory maps (no copy), as shap's slicing doesn't recognise np.memmap
+    meta = json.loads((entry / "meta.json").read_text())
+    return shap.Explanation(
+        values=np.asarray(np.load(entry / "values.npy", mmap_mode="r")),
+        base_values=np.asarray(np.load(entry / "base_values.npy", mmap_mode="r")),
+        data=np.asarray(np.load(entry / "data.npy", mmap_mode="r")),
+        feature_names=meta["feature_names"],
+    )
+
+
+def _compute(model, background, X, entry, settings, workers, rows_per_chunk):
+    """Explains X chunk by chunk across a process pool, writing the values into a new cache entry."""
+    start = time.perf_counter()
+    partial = entry.with_name(entry.name + ".partial") # Only renamed into place once complete
+    shutil.rmtree(partial, ignore_errors=True)
+    partial.mkdir(parents=True)
+
+    values = np.lib.format.open_memmap(partial / "values.npy", mode="w+", dtype=np.float64, shape=X.shape)
+    base_values = np.lib.format.open_memmap(partial / "base_values.npy", mode="w+", dtype=np.float64, shape=(len(X),))
+    np.save(partial / "data.npy", X.to_numpy(dtype=np.float64))
+
+    bounds = list(range(0, len(X), rows_per_chunk))
+    chunks = [X.iloc[row:row + rows_per_chunk] for row in bounds]
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model, background)) as executor:
+        for row, (chunk_values, chunk_base) in zip(bounds, executor.map(_explain_chunk, chunks)):
+            values[row:row + len(chunk_values)] = chunk_values
+            base_values[row:row + len(chunk_values)] = chunk_base
+    values.flush()
+    base_values.flush()
+    del values, base_values
+
+    elapsed = time.perf_counter() - start
+    meta = {**settings, "feature_names": list(X.columns), "rows": len(X), "background_rows": len(background),
+            "workers": workers, "seconds": round(elapsed, 2)}
+    (partial / "meta.json").write_text(json.dumps(meta, indent=2))
+    shutil.rmtree(entry, ignore_errors=True)
+    partial.rename(entry)
+    print(f"✅ Computed SHAP values for {len(X)} rows in {elapsed:.1f}s ({workers} processes), cached as {entry.name}")
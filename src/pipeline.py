@@ -0,0 +1,210 @@
+# Standard libraries
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STATE_PATH = ROOT / ".cache" / "pipeline.json"
+
+# Stages of the project: how each is run, and the files (globs, relative to the repo root) it reads and writes
+# A stage depends on every stage whose outputs match its inputs, and is skipped if none of its files changed since
+# its last successful run. Manual stages (the scrapers, which take hours and hit live sites) only run when named.
+# The report uses fixed snapshots of the raw quotes (final_*_quotes.csv), so a scrape stage's "promote" step copies
+# its fresh output over the snapshot which the clean stage reads, once the scraper succeeds.
+STAGES = {
+    "scrape_uk": {
+        "command": [sys.executable, "drewberry_scraper.py"],
+        "cwd": "src/01_scrape",
+        "inputs": ["src/01_scrape/drewberry_scraper.py", "src/01_scrape/utils/**/*.py"],
+        "promote": [("data/raw/UK_quotes.csv", "data/raw/final_UK_quotes.csv")],
+        "outputs": ["data/raw/UK_quotes.csv", "data/raw/final_UK_quotes.csv"],
+        "manual": True,
+    },
+    "scrape_us": {
+        "command": [sys.executable, "lifeinsure_scraper.py"],
+        "cwd": "src/01_scrape",
+        "inputs": ["src/01_scrape/lifeinsure_scraper.py", "src/01_scrape/utils/**/*.py"],
+        "promote": [("data/raw/US_quotes.csv", "data/raw/final_US_quotes.csv")],
+        "outputs": ["data/raw/US_quotes.csv", "data/raw/final_US_quotes.csv"],
+        "manual": True,
+    },
+    "clean": {
+        "notebook": "src/02_clean.ipynb",
+        "cwd": "src",
+        "inputs": ["data/raw/final_*_quotes.csv", "data/rates/*.csv", "src/analysis/cleaning.py"],
+        "outputs": ["data/clean/all_quotes.csv"],
+    },
+    "visualise": {
+        "notebook": "src/03_visualise.ipynb",
+        "cwd": "src",
+        "inputs": ["data/clean/all_quotes.csv", "src/analysis/*.py"],
+        "outputs": ["output/figures/*.png"],
+    },
+    "report": {
+        "notebook": "report/report.ipynb",
+        "cwd": "report",
+        "inputs": ["output/figures/*.png"],
+        "outputs": [],
+    },
+}
+
+
+def stage_files(stage, kind):
+    """Files currently matching a stage's input or output globs (executed notebooks are both)."""
+    patterns = list(stage[kind])
+    if "notebook" in stage:
+        patterns.append(stage["notebook"])
+    return sorted({path for pattern in patterns for path in ROOT.glob(pattern) if path.is_file()})
+
+
+def dependencies(stages):
+    """Maps each stage to the stages producing its inputs (notebooks executed in place don't count)."""
+    deps = {}
+    for name, stage in stages.items():
+        deps[name] = set()
+        for other_name, other in stages.items():
+            if other_name != name and any(
+                Path(output).match(pattern) or Path(pattern).match(output) or output == pattern
+                for output in other["outputs"] for pattern in stage["inputs"]
+            ):
+                deps[name].add(other_name)
+    return deps
+
+
+class FileHasher:
+    """SHA-1 of files, reusing the previous hash of any file whose size and modification time are unchanged."""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def __call__(self, path):
+        stat = path.stat()
+        key = path.relative_to(ROOT).as_posix()
+        cached = self.known.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime_ns:
+            return cached["sha1"]
+        digest = hashlib.sha1()
+        with open(path, "rb") as file:
+            while block := file.read(1 << 20):
+                digest.update(block)
+        self.known[key] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha1": digest.hexdigest()}
+        return digest.hexdigest()
+
+
+def snapshot(stage, hasher):
+    """Hashes of every input and output file of a stage."""
+    return {
+        kind: {path.relative_to(ROOT).as_posix(): hasher(path) for path in stage_files(stage, kind)}
+        for kind in ("inputs", "outputs")
+    }
+
+
+def run_stage(name, stage):
+    """Runs one stage (a script, or a notebook executed in place by papermill) and its promote step, returning its wall time."""
+    if "notebook" in stage:
+        notebook = str(ROOT / stage["notebook"])
+        command = [sys.executable, "-m", "papermill", notebook, notebook, "--cwd", str(ROOT / stage["cwd"])]
+    else:
+        command = stage["command"]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT / stage["cwd"], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} exited with code {result.returncode}:\n{result.stderr[-2000:]}")
+    for source, target in stage.get("promote", []):
+        shutil.copyfile(ROOT / source, ROOT / target)
+    return time.perf_counter() - start
+
+
+def run_pipeline(selected=None, force=(), workers=4, dry_run=False, stages=STAGES, state_path=STATE_PATH):
+    """Runs the selected stages in dependency order, skipping those whose files are unchanged since their last run.
+
+    Independent stages (e.g. the two scrapers, or a scraper and the cleaning) run concurrently. A stage's inputs are
+    hashed when it becomes ready, so a stage whose upstream re-ran without changing its outputs is still skipped.
+
+    Args:
+        selected (list): Stages to consider, all non-manual stages if None.
+        force (iterable): Stages to run even if unchanged.
+        workers (int): Maximum stages running at once.
+        dry_run (bool): If True, only reports what would run (assuming upstream stages don't change anything).
+        stages (dict): Stage definitions (see STAGES).
+        state_path (str | Path): JSON file recording each stage's file hashes and wall time.
+    Returns:
+        results (dict): Stage name → "ran", "skipped", "failed" or "blocked" (an upstream stage failed).
+    """
+    state_path = Path(state_path)
+    state = json.loads(state_path.read_text()) if state_path.exists() else {"stages": {}, "files": {}}
+    hasher = FileHasher(state["files"])
+    selected = [name for name in stages if name in selected] if selected else [
+        name for name, stage in stages.items() if not stage.get("manual")
+    ]
+    deps = {name: deps & set(selected) for name, deps in dependencies(stages).items() if name in selected}
+
+    results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while len(results) < len(selected):
+            for name in selected:
+                if name in results or name in running or not deps[name] <= set(results):
+                    continue
+                if any(results[dep] in ("failed", "blocked") for dep in deps[name]):
+                    results[name] = "blocked"
+                    print(f"⏭️  {name}: blocked by a failed upstream stage")
+                    continue
+                files = snapshot(stages[name], hasher)
+                previous = state["stages"].get(name, {})
+                if name not in force and previous.get("files") == files:
+                    results[name] = "skipped"
+                    print(f"✔️  {name}: unchanged, skipped (last run took {previous.get('seconds', 0):.1f}s)")
+                elif dry_run:
+                    results[name] = "ran"
+                    print(f"▶️  {name}: would run")
+                else:
+                    print(f"▶️  {name}: running")
+                    running[name] = executor.submit(run_stage, name, stages[name])
+            if not running:
+                continue
+            done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+            for name, future in list(running.items()):
+                if future not in done:
+                    continue
+                del running[name]
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    results[name] = "failed"
+                    print(f"❌ {name}: {e}")
+                    continue
+                results[name] = "ran"
+                state["stages"][name] = {"files": snapshot(stages[name], hasher), "seconds": round(seconds, 2)}
+                print(f"✅ {name}: done in {seconds:.1f}s")
+                state_path.parent.mkdir(parents=True, exist_ok=True)
+                state_path.write_text(json.dumps(state, indent=2))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scrape → clean → visualise → report pipeline, skipping unchanged stages.")
+    parser.add_argument("stages", nargs="*", help=f"stages to run, from {', '.join(STAGES)} (default: all but the scrapers)")
+    parser.add_argument("--force", nargs="*", default=[], choices=list(STAGES), help="stages to run even if unchanged")
+    parser.add_argument("--workers", type=int, default=4, help="maximum stages running at once")
+    parser.add_argument("--dry-run", action="store_true", help="only report which stages would run")
+    args = parser.parse_args()
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    results = run_pipeline(args.stages or None, force=args.force, workers=args.workers, dry_run=args.dry_run)
+    print(f"📁 Pipeline finished in {time.perf_counter() - start:.1f}s: "
+          + ", ".join(f"{name} {result}" for name, result in results.items()))
+    sys.exit(1 if "failed" in results.values() else 0)
+
+
+if __name__ == "__main__":
+    main()
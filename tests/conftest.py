@@ -0,0 +1,6 @@
+# Standard libraries
+import sys
+from pathlib import Path
+
+# The scrapers' utils package is imported the way the scrapers import it (from inside src/01_scrape)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "01_scrape"))
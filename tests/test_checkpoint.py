@@ -0,0 +1,63 @@
+# Third-party libraries
+import pytest
+
+# Local imports
+from utils.checkpoint import Checkpoint, combo_key
+
+GRID = [(coverage, 20, 40, "Female", "Non-Smoker") for coverage in (100000, 200000, 300000, 400000)]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "UK_quotes.checkpoint.db"
+
+
+def quotes(*premiums_minor):
+    return [{"provider": "Aviva", "product": "Term", "premium_minor": premium} for premium in premiums_minor]
+
+
+def test_resume_skips_stored_combos(path):
+    with Checkpoint(path, currency="GBP") as checkpoint:
+        checkpoint.record(GRID[0], quotes(1250, 1399))
+        checkpoint.record(GRID[1], []) # Scraped, but no quotes
+
+    # A restarted run (string combo fields, as read back from CSVs) only scrapes what's left
+    with Checkpoint(path, currency="GBP") as checkpoint:
+        assert checkpoint.remaining(GRID) == GRID[2:]
+        assert checkpoint.remaining([tuple(map(str, combo)) for combo in GRID[:2]]) == []
+        assert checkpoint.combo_quotes()[combo_key(GRID[1])] == []
+
+
+def test_recording_a_combo_twice_keeps_its_first_quotes(path, tmp_path):
+    with Checkpoint(path, currency="GBP") as checkpoint:
+        checkpoint.record(GRID[0], quotes(1250))
+        checkpoint.record(GRID[0], quotes(9999)) # e.g. scraped again by a retry
+        assert checkpoint.combo_premiums() == {combo_key(GRID[0]): 1250}
+        assert checkpoint.export_csv(tmp_path / "UK_quotes.csv", encoding="utf-8") == 1
+    assert (tmp_path / "UK_quotes.csv").read_text(encoding="utf-8").splitlines()[1] == "100000,20,40,Female,Non-Smoker,£12.50"
+
+
+def test_failed_combos_are_skipped_until_cleared(path):
+    with Checkpoint(path) as checkpoint:
+        checkpoint.mark_failed(GRID[0], "timeout", 5, "timed out")
+    with Checkpoint(path) as checkpoint:
+        assert checkpoint.remaining(GRID) == GRID[1:]
+        checkpoint.clear_failures() # --retry-failed
+        assert checkpoint.remaining(GRID) == GRID
+
+
+def test_recording_a_failed_combo_clears_its_failure(path):
+    with Checkpoint(path) as checkpoint:
+        checkpoint.mark_failed(GRID[0], "block", 3, "HTTP 429")
+        checkpoint.record(GRID[0], quotes(1250))
+        assert checkpoint.failures() == {}
+        assert checkpoint.remaining(GRID) == GRID[1:]
+
+
+def test_fresh_discards_the_previous_run(path):
+    with Checkpoint(path) as checkpoint:
+        checkpoint.record(GRID[0], quotes(1250))
+        checkpoint.mark_failed(GRID[1], "error", 3)
+    with Checkpoint(path, fresh=True) as checkpoint:
+        assert checkpoint.remaining(GRID) == GRID
+        assert checkpoint.combo_quotes() == {}
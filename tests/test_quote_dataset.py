@@ -0,0 +1,56 @@
+# Third-party libraries
+import pyarrow.compute as pc
+import pytest
+
+# Local imports
+from utils import checkpoint as checkpoint_module
+from utils.checkpoint import Checkpoint
+from utils.quote_dataset import read_quotes
+
+REFRESHED = (200000, 20, 40, "Female", "Non-Smoker")
+UNCHANGED = (100000, 20, 40, "Female", "Non-Smoker")
+
+
+@pytest.fixture
+def scraped_at(monkeypatch):
+    # Stand-in clock for the checkpoint's scrape timestamps, so the two exports fall on different scrape dates
+    clock = {"now": "2025-04-21T12:00:00+00:00"}
+    monkeypatch.setattr(checkpoint_module, "utc_now", lambda: clock["now"])
+    return clock
+
+
+def quotes(*premiums_minor):
+    return [{"provider": "Aviva", "product": "Term", "premium_minor": premium} for premium in premiums_minor]
+
+
+def test_reexport_after_replace_drops_the_old_quotes(tmp_path, scraped_at):
+    dataset_dir = tmp_path / "quotes"
+    with Checkpoint(tmp_path / "UK_quotes.checkpoint.db", currency="GBP") as checkpoint:
+        checkpoint.record(UNCHANGED, quotes(1000))
+        scraped_at["now"] = "2025-04-22T09:00:00+00:00" # Scraped the next day, so alone in its partition
+        checkpoint.record(REFRESHED, quotes(2000, 2100))
+        assert checkpoint.export_parquet(dataset_dir, site="drewberry") == 3
+
+        # A refresh a month later re-scrapes one combo, its quotes move to the new scrape date's partition
+        scraped_at["now"] = "2025-05-21T12:00:00+00:00"
+        checkpoint.replace(REFRESHED, quotes(2200))
+        assert checkpoint.export_parquet(dataset_dir, site="drewberry") == 2
+
+    exported = read_quotes(dataset_dir).sort_values("coverage")
+    assert exported["premium_minor"].tolist() == [1000, 2200]
+    assert exported["scrape_date"].astype(str).tolist() == ["2025-04-21", "2025-05-21"]
+    assert sorted(path.parent.name for path in dataset_dir.glob("site=drewberry/*/*.parquet")) == ["scrape_date=2025-04-21", "scrape_date=2025-05-21"]
+
+
+def test_export_leaves_other_sites_alone(tmp_path, scraped_at):
+    dataset_dir = tmp_path / "quotes"
+    with Checkpoint(tmp_path / "UK_quotes.checkpoint.db", currency="GBP") as checkpoint:
+        checkpoint.record(UNCHANGED, quotes(1000))
+        checkpoint.export_parquet(dataset_dir, site="drewberry")
+    with Checkpoint(tmp_path / "US_quotes.checkpoint.db", currency="USD") as checkpoint:
+        checkpoint.record((100000, "20 Year Term", 40, "Female", "Never Used"), quotes(1500))
+        checkpoint.export_parquet(dataset_dir, site="lifeinsure")
+        checkpoint.export_parquet(dataset_dir, site="lifeinsure")
+
+    assert len(read_quotes(dataset_dir, filter=pc.field("site") == "drewberry")) == 1
+    assert len(read_quotes(dataset_dir, filter=pc.field("site") == "lifeinsure")) == 1
@@ -0,0 +1,91 @@
+# Third-party libraries
+import pytest
+
+# Local imports
+from utils.checkpoint import Checkpoint
+from utils import retry
+from utils.retry import MAX_DELAY, RETRY_POLICY, SKIPPED, RetryScheduler
+
+URL = "https://example.com/my/get-quote/abc"
+
+
+def combo(i):
+    return (100000 + i, 10, 30, "Male", "Smoker")
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    # Backoff delays drawn at their upper bound, so they can be compared exactly
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: high)
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    with Checkpoint(tmp_path / "quotes.checkpoint.db") as checkpoint:
+        yield checkpoint
+
+
+@pytest.mark.parametrize("kind", sorted(RETRY_POLICY))
+def test_combo_given_up_after_its_kinds_attempts(kind, checkpoint, sleeps):
+    scheduler = RetryScheduler(max_rounds=10, checkpoint=checkpoint, sleep=sleeps.append)
+    scheduler.fail(combo(0), URL, kind, "first")
+    attempts = 1
+    for _, groups in scheduler.rounds():
+        assert groups == {URL: [combo(0)]}
+        scheduler.fail(combo(0), URL, kind, "again")
+        attempts += 1
+
+    assert attempts == RETRY_POLICY[kind]["attempts"]
+    assert scheduler.permanent == {("100000", "10", "30", "Male", "Smoker"): (combo(0), kind, attempts)}
+    assert checkpoint.failures() == {("100000", "10", "30", "Male", "Smoker"): (kind, attempts, "again")}
+    assert checkpoint.remaining([combo(0)]) == []
+
+
+def test_skipped_combos_left_unmarked_after_max_rounds(checkpoint, sleeps):
+    scheduler = RetryScheduler(max_rounds=3, checkpoint=checkpoint, sleep=sleeps.append)
+    scheduler.fail(combo(0), URL, "block", "HTTP 429")
+    scheduler.fail(combo(1), URL, SKIPPED, "Skipped after block")
+    for _, groups in scheduler.rounds():
+        assert groups == {URL: [combo(0), combo(1)]}
+        # The site keeps blocking: the first combo fails again and the one after it is never attempted
+        scheduler.fail(combo(0), URL, "timeout", "timed out")
+        scheduler.fail(combo(1), URL, SKIPPED, "Skipped after block")
+
+    assert len(sleeps) == 3
+    # The attempted combo is given up once the rounds run out, the never attempted one is left for a resumed run
+    assert list(scheduler.permanent) == [("100000", "10", "30", "Male", "Smoker")]
+    assert set(checkpoint.failures()) == {("100000", "10", "30", "Male", "Smoker")}
+    assert checkpoint.remaining([combo(0), combo(1)]) == [combo(1)]
+    assert not scheduler
+
+
+def test_skipped_combos_dont_count_as_attempts(sleeps):
+    scheduler = RetryScheduler(max_rounds=20, sleep=sleeps.append)
+    scheduler.fail(combo(0), URL, SKIPPED)
+    for i, _ in scheduler.rounds():
+        scheduler.fail(combo(0), URL, SKIPPED if i < 10 else "no_results")
+
+    assert scheduler.attempts[("100000", "10", "30", "Male", "Smoker")] == ["no_results"] * RETRY_POLICY["no_results"]["attempts"]
+    # Nothing failed yet, so the rounds of skipped combos aren't backed off
+    assert sleeps[:10] == [0] * 10
+
+
+def test_block_delay_grows_across_rounds(sleeps):
+    scheduler = RetryScheduler(max_rounds=6, sleep=sleeps.append)
+    scheduler.fail(combo(0), URL, "block")
+    for i, _ in scheduler.rounds():
+        # A different combo is blocked every round, so only the site-wide block count drives the delay
+        if i < 5:
+            scheduler.fail(combo(i), URL, "block")
+        else:
+            scheduler.fail(combo(i), URL, "stale")
+
+    base = RETRY_POLICY["block"]["delay"]
+    assert sleeps[:5] == [base, base * 2, base * 4, base * 8, min(MAX_DELAY, base * 16)]
+    # A round without blocks resets the site-wide backoff to the failed combos' own
+    assert sleeps[5] == RETRY_POLICY["stale"]["delay"]
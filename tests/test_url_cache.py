@@ -0,0 +1,50 @@
+# Third-party libraries
+import pytest
+
+# Local imports
+from utils.http_client import HttpSession
+from utils.local_server import LocalHandler, LocalServer
+from utils.url_cache import UrlCache, url_alive
+
+LIVE = "/my/get-quote/live"
+EXPIRED = "/my/get-quote/expired"   # Redirects back to the quote form, like an expired quote
+GONE = "/my/get-quote/gone"
+BLOCKED = "/my/get-quote/blocked"
+QUOTE_FORM = "/life-insurance/life-insurance-quote"
+
+
+class QuoteSite(LocalServer):
+    """Stand-in for the Drewberry quote pages, whose expired get-quote URLs redirect to the quote form."""
+
+    def _handler(self):
+        class Handler(LocalHandler):
+            def do_GET(self):
+                if self.path in (LIVE, QUOTE_FORM):
+                    self._send(200, "text/html", b"<html></html>")
+                elif self.path == EXPIRED:
+                    self._send(302, "text/html", b"", {"Location": QUOTE_FORM})
+                elif self.path == BLOCKED:
+                    self._send(429, "text/plain", b"Too many requests")
+                else:
+                    self._send(404, "text/plain", b"Not found")
+
+        return Handler
+
+
+@pytest.fixture
+def site():
+    with QuoteSite() as site:
+        yield site
+
+
+@pytest.mark.parametrize("path, alive", [(LIVE, True), (EXPIRED, False), (GONE, False), (BLOCKED, True)])
+def test_url_alive(site, path, alive):
+    assert url_alive(HttpSession(), site.url + path) is alive
+
+
+def test_stale_rechecks_redirected_urls(site, tmp_path):
+    cache = UrlCache(tmp_path / "drewberry_urls.csv")
+    cache.update([(30, "Male", "Smoker", site.url + LIVE), (31, "Male", "Smoker", site.url + EXPIRED)])
+    profiles = [(30, "Male", "Smoker"), (31, "Male", "Smoker"), (32, "Male", "Smoker")]
+    assert cache.stale(profiles) == [(32, "Male", "Smoker"), (31, "Male", "Smoker")]
+    assert cache.stale(profiles, check=False) == [(32, "Male", "Smoker")]
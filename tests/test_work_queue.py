@@ -0,0 +1,118 @@
+# Third-party libraries
+import pytest
+
+# Local imports
+from utils import retry, work_queue
+from utils.checkpoint import Checkpoint, combo_key
+from utils.retry import RETRY_POLICY, SKIPPED
+from utils.work_queue import WorkQueue
+
+LEASE = 60
+URL_A, URL_B = "https://example.com/my/get-quote/a", "https://example.com/my/get-quote/b"
+TASKS = [
+    (URL_A, [(coverage, 20, 40, "Male", "Smoker") for coverage in (100000, 200000, 300000)]),
+    (URL_B, [(coverage, 20, 41, "Male", "Smoker") for coverage in (100000, 200000, 300000)]),
+]
+
+
+class Clock:
+    """Stand-in for time.time, moved forward by the tests."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue.time, "time", clock)
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: high)
+    return clock
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    with Checkpoint(tmp_path / "UK_quotes.checkpoint.db") as checkpoint:
+        yield checkpoint
+
+
+@pytest.fixture
+def queues(checkpoint):
+    # Two workers' connections to the same queue file, as two processes would have
+    with WorkQueue(checkpoint.path, lease_seconds=LEASE) as first, WorkQueue(checkpoint.path, lease_seconds=LEASE) as second:
+        first.seed(TASKS, checkpoint)
+        second.seed(TASKS, checkpoint)
+        yield first, second
+
+
+def test_seed_skips_queued_and_stored_combos(checkpoint, clock):
+    checkpoint.record(TASKS[0][1][0], [])
+    with WorkQueue(checkpoint.path) as queue:
+        assert queue.seed(TASKS, checkpoint) == 6
+        assert queue.seed(TASKS, checkpoint) == 0
+        assert queue.unfinished() == 5
+
+
+def test_claims_are_exclusive_and_from_one_group(queues, clock):
+    first, second = queues
+    assert first.claim("w1", size=2) == (URL_A, TASKS[0][1][:2])
+    assert second.claim("w2", size=10) == (URL_A, TASKS[0][1][2:])
+    assert first.claim("w1", size=10) == (URL_B, TASKS[1][1])
+    assert second.claim("w2", size=10) == (None, [])
+
+
+def test_expired_lease_is_reissued(queues, checkpoint, clock):
+    first, second = queues
+    _, combos = first.claim("w1", size=10)
+    clock.now += LEASE - 1
+    assert second.claim("w2", size=10)[0] == URL_B # w1's lease still holds
+
+    clock.now += 2
+    assert second.claim("w2", size=10) == (URL_A, combos)
+    # The first worker's late outcome no longer counts, the combos belong to w2
+    first.settle("w1", combos, [(combos[0], "timeout", "timed out")], checkpoint)
+    assert first.status()["depth"] == {"leased": 6}
+    second.settle("w2", combos, [], checkpoint)
+    assert first.status()["depth"] == {"leased": 3, "done": 3}
+
+
+def test_heartbeat_renews_the_lease(queues, clock):
+    first, second = queues
+    first.claim("w1", size=10)
+    second.claim("w2", size=10)
+    clock.now += LEASE - 1
+    first.heartbeat("w1")
+    clock.now += LEASE - 1
+    assert second.claim("w3", size=10) == (URL_B, TASKS[1][1]) # Only w2's lease (no heartbeat) has expired
+
+
+def test_failures_back_off_then_give_up(queues, checkpoint, clock):
+    first, _ = queues
+    kind = "no_results"
+    combo = TASKS[0][1][0]
+    for attempt in range(1, RETRY_POLICY[kind]["attempts"] + 1):
+        _, combos = first.claim("w1", size=1)
+        assert combos == [combo]
+        first.settle("w1", combos, [(combo, kind, "no quotes")], checkpoint)
+        if attempt < RETRY_POLICY[kind]["attempts"]:
+            # Backing off: the next claim moves on to another combo until the delay has passed
+            assert first.claim("w1", size=1)[1] != [combo]
+            first.settle("w1", [TASKS[0][1][1]], [(TASKS[0][1][1], SKIPPED, "")])
+            clock.now += retry.backoff_delay(kind, attempt)
+
+    assert first.status()["depth"]["failed"] == 1
+    assert checkpoint.failures() == {combo_key(combo): (kind, RETRY_POLICY[kind]["attempts"], "no quotes")}
+
+
+def test_skipped_combos_go_back_without_counting_as_attempts(queues, checkpoint, clock):
+    first, _ = queues
+    combo = TASKS[0][1][0]
+    for _ in range(10):
+        _, combos = first.claim("w1", size=1)
+        first.settle("w1", combos, [(combo, SKIPPED, "Skipped after block")], checkpoint)
+    # Immediately claimable again, and never given up
+    assert first.claim("w1", size=1)[1] == [combo]
+    assert checkpoint.failures() == {}